@@ -7,6 +7,7 @@ from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 
 from app.entrypoint.routes.common.errors import register_error_handlers
+from app.entrypoint.routes.common.serialization import FastJSONProvider
 from app.entrypoint.routes.customer import customer_blueprint
 from app.entrypoint.routes.material import material_blueprint
 from app.entrypoint.routes.vendor import vendor_blueprint
@@ -48,6 +49,7 @@ from app.entrypoint.routes.trip import trip_blueprint
 from app.entrypoint.routes.trip_stop import trip_stop_blueprint
 from app.entrypoint.routes.vehicle_inventory import vehicle_inventory_blueprint
 from app.entrypoint.routes.vehicle_inventory_event import vehicle_inventory_event_blueprint
+from app.entrypoint.routes.job import job_blueprint
 
 
 jwt = JWTManager()
@@ -252,6 +254,8 @@ def _emit_perms_version(response):
 
 def create_app(config_object=Config):
     app = Flask(__name__)
+    # orjson-backed jsonify; see app/entrypoint/routes/common/serialization.py
+    app.json = FastJSONProvider(app)
 
     # CORS(app, supports_credentials=True)
     # CORS FOR ANY ORIGIN
@@ -332,6 +336,7 @@ def create_app(config_object=Config):
     app.register_blueprint(trip_stop_blueprint, url_prefix='/trip-stop')
     app.register_blueprint(vehicle_inventory_blueprint, url_prefix='/vehicle-inventory')
     app.register_blueprint(vehicle_inventory_event_blueprint, url_prefix='/vehicle-inventory-event')
+    app.register_blueprint(job_blueprint, url_prefix='/job')
 
     register_error_handlers(app)
     return app
\ No newline at end of file
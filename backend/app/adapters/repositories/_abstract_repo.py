@@ -1,16 +1,46 @@
 from __future__ import annotations
 
-from typing import Any, Generic, Iterable, Optional, TypeVar, List
+from typing import TYPE_CHECKING, Any, Generic, Iterable, Optional, TypeVar, List
+import base64
+import json
 import math
-import pandas as pd
-from sqlalchemy import UniqueConstraint, text
+from datetime import date, datetime
+from sqlalchemy import String, UniqueConstraint, and_, any_, bindparam, func, or_, select, text, tuple_, union_all
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, scoped_session, Query
 from models.base import Base
 
+if TYPE_CHECKING:
+    # only the two DataFrame helpers below need pandas; importing it here
+    # would load it into every process that touches a repository
+    import pandas as pd
+
 BASE = TypeVar("BASE", bound=Base)
 
 
+# the currencies the balance_per_currency properties have always reported,
+# zero when untouched
+BALANCE_CURRENCIES = ("USD", "SYP")
+
+
+def not_deleted(column):
+    # `IS NOT true` rather than `is_(False)`: the model walks treat a NULL
+    # is_deleted as live (`not None`), and SQL written to replace them must agree
+    return column.isnot(True)
+
+
+def any_of(name: str, values: Iterable[str]):
+    """`column == any_of(...)`: one array parameter, however many values.
+
+    Reused across every term of a UNION it stays one bind, where `in_()`
+    would repeat a 10k-item list in each.
+    """
+    return any_(bindparam(name, list(values), type_=ARRAY(String)))
+
+
 class NotAllowedQueryNonIndexedFields(Exception):
     """Raise Exception when query without an index is not allowed."""
     pass
@@ -21,6 +51,12 @@ class CrossAccountWrite(Exception):
     pass
 
 
+class InvalidCursor(Exception):
+    """Raise when a keyset cursor token cannot be decoded or was minted for a
+    different ordering."""
+    pass
+
+
 class Pagination(Generic[BASE]):
     """
     Simple pagination result.
@@ -33,6 +69,74 @@ class Pagination(Generic[BASE]):
         self.pages = math.ceil(total / per_page) if per_page else 0
 
 
+class KeysetPage(Generic[BASE]):
+    """
+    One page of a keyset (cursor) walk. `next_cursor` is None on the last page.
+
+    `page`/`pages` have no meaning without an offset and are None; `total` is
+    None unless the caller asked for an exact or estimated count.
+    """
+    def __init__(
+            self,
+            items: List[BASE],
+            per_page: int,
+            next_cursor: Optional[str],
+            total: Optional[int] = None,
+    ) -> None:
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.total = total
+        self.page = None
+        self.pages = None
+
+
+# keyset totals: an exact count is what made deep offset pages expensive, so
+# it is opt-in; "estimate" reads the planner's row estimate instead
+KEYSET_TOTALS = ("none", "estimate", "exact")
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _cursor_load(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(keys: list[str], values: list[Any]) -> str:
+    """Opaque token for "the page after the row with these key values".
+
+    The key names ride along so a token minted under one ordering is refused
+    under another instead of silently skipping or repeating rows.
+    """
+    raw = json.dumps({"k": keys, "v": [_cursor_value(v) for v in values]},
+                     separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, keys: list[str]) -> list[Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = [_cursor_load(v) for v in payload["v"]]
+        minted_for = payload["k"]
+    except Exception:
+        raise InvalidCursor("Malformed cursor")
+    if minted_for != keys or len(values) != len(keys):
+        raise InvalidCursor("Cursor does not match this listing's ordering")
+    return values
+
+
 class AbstractRepository(Generic[BASE]):
     """Abstract repository that implements common methods, including pagination."""
 
@@ -202,6 +306,148 @@ class AbstractRepository(Generic[BASE]):
         items = query.offset(offset).limit(per_page).all()
         return Pagination(items, total, page, per_page)
 
+    def _keyset_keys(self, ordering: Optional[list[Any]]) -> list[tuple[Any, bool]]:
+        """(column, descending) pairs for a keyset walk, uuid-terminated.
+
+        Accepts the same ordering list as the offset paginator (`col.desc()`,
+        `col.asc()` or a bare column). The primary key is appended as the
+        final tie-breaker unless already there: without a unique last key, rows
+        sharing a created_at at a page boundary would be skipped.
+        """
+        if not ordering:
+            ordering = [self._type.created_at.desc()]
+        keys = []
+        for term in ordering:
+            if isinstance(term, UnaryExpression) and term.modifier in (
+                    operators.desc_op, operators.asc_op):
+                keys.append((term.element, term.modifier is operators.desc_op))
+            else:
+                keys.append((term, False))
+        if keys[-1][0].key != "uuid":
+            keys.append((self._type.uuid, keys[-1][1]))
+        return keys
+
+    @staticmethod
+    def _keyset_after(keys: list[tuple[Any, bool]], values: list[Any]):
+        """WHERE clause for "strictly after `values`" in `keys` order."""
+        directions = {desc for _, desc in keys}
+        if len(directions) == 1:
+            # one direction: a row-value comparison, which Postgres can answer
+            # straight off a matching composite index
+            lhs = tuple_(*[col for col, _ in keys])
+            rhs = tuple_(*values)
+            return lhs < rhs if directions.pop() else lhs > rhs
+        clauses = []
+        for i, (col, desc) in enumerate(keys):
+            ties = [keys[j][0] == values[j] for j in range(i)]
+            clauses.append(and_(*ties, col < values[i] if desc else col > values[i]))
+        return or_(*clauses)
+
+    def _estimated_count(self, query: Query) -> int:
+        """The planner's row estimate for `query` — no scan, so it is cheap on
+        any table size, and as good as the table's statistics are.
+
+        The SQL goes to the driver as text, so IN lists are expanded at compile
+        time (render_postcompile); otherwise their POSTCOMPILE placeholders
+        would reach Postgres, which rejects them."""
+        stmt = query.statement.compile(
+            dialect=self._session.get_bind().dialect,
+            compile_kwargs={"render_postcompile": True},
+        )
+        plan = self._session.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {stmt}", stmt.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def find_all_by_filters_keyset(
+            self,
+            filters: list[Any],
+            per_page: int,
+            cursor: Optional[str] = None,
+            ordering: Optional[list[Any]] = None,
+            total: str = "none",
+    ) -> KeysetPage[BASE]:
+        """
+        Keyset-paginate a complex filtered query.
+
+        Where find_all_by_filters_paginated pays `OFFSET (page-1)*per_page`
+        (every skipped row is still read) plus a full COUNT on every page, this
+        seeks straight past the last row of the previous page, so page 500
+        costs what page 1 does. `cursor` is the previous page's `next_cursor`
+        (None for the first page); `total` is one of KEYSET_TOTALS.
+
+        Ordering keys must be non-null: NULLs never compare, so a row with a
+        NULL key would fall out of the walk.
+        """
+        if total not in KEYSET_TOTALS:
+            raise ValueError(f"total must be one of {KEYSET_TOTALS}")
+        keys = self._keyset_keys(ordering)
+        key_names = [col.key for col, _ in keys]
+        query: Query = self._session.query(self._type)
+        filters = self._scope_filters(filters)
+        if filters:
+            query = query.filter(*filters)
+
+        count = None
+        if total == "exact":
+            count = query.count()
+        elif total == "estimate":
+            count = self._estimated_count(query)
+
+        if cursor:
+            query = query.filter(self._keyset_after(keys, decode_cursor(cursor, key_names)))
+        query = query.order_by(*[col.desc() if desc else col.asc() for col, desc in keys])
+        # one extra row answers "is there a next page" without a count
+        rows = query.limit(per_page + 1).all()
+        items = rows[:per_page]
+        next_cursor = None
+        if len(rows) > per_page:
+            last = items[-1]
+            next_cursor = encode_cursor(key_names, [getattr(last, name) for name in key_names])
+        return KeysetPage(items, per_page, next_cursor, count)
+
+    def stream_columns(
+            self,
+            columns: list[Any],
+            filters: Optional[list[Any]] = None,
+            ordering: Optional[list[Any]] = None,
+            batch_size: int = 1000,
+    ) -> Iterable[list]:
+        """
+        Yield batches of row mappings for `columns`, read through a server-side
+        cursor (`yield_per`) so memory stays flat however many rows match.
+
+        Columns, not entities: nothing lands in the identity map and no lazy
+        relationship can fire per row while the export is being written.
+        """
+        stmt = select(*columns).where(*self._scope_filters(filters))
+        if ordering:
+            stmt = stmt.order_by(*ordering)
+        result = self._session.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.mappings().partitions():
+            yield partition
+
+    def _sum_balance_terms(self, terms: list, owner_uuids: Iterable[str]) -> dict[str, dict[str, float]]:
+        """Run (owner_uuid, currency, amount) SELECTs as one UNION ALL.
+
+        Returns {owner_uuid: {currency: summed amount}} over BALANCE_CURRENCIES,
+        zero-filled for owners with nothing on record.
+        """
+        result = {uuid: {c: 0.0 for c in BALANCE_CURRENCIES} for uuid in owner_uuids}
+        if not result:
+            return result
+        parts = union_all(*terms).subquery()
+        rows = self._session.execute(
+            select(parts.c[0], parts.c[1], func.sum(parts.c[2]))
+            .where(parts.c[1].in_(BALANCE_CURRENCIES))
+            .group_by(parts.c[0], parts.c[1])
+        ).all()
+        for owner_uuid, currency, amount in rows:
+            result[owner_uuid][currency] = float(amount or 0)
+        return result
+
     def _find_all_by_filters(
             self,
             filters: list[Any] = None,
@@ -239,9 +485,13 @@ class AbstractRepository(Generic[BASE]):
         return self._session.query(self._type)
 
     def execute_sql_to_df(self, query_file_path: str) -> pd.DataFrame:
+        import pandas as pd
+
         with open(query_file_path, "r") as file:
             sql = text(file.read())
             return pd.read_sql_query(sql, self._session.bind)
 
     def execute_sql_query_to_df(self, query: str) -> pd.DataFrame:
+        import pandas as pd
+
         return pd.read_sql_query(query, self._session.bind)
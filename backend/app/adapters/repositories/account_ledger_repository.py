@@ -1,3 +1,7 @@
+from typing import List
+
+from sqlalchemy import func
+
 from app.adapters.repositories._abstract_repo import AbstractRepository
 
 from models.common import AccountLedgerEntry
@@ -7,3 +11,29 @@ class AccountLedgerRepository(AbstractRepository[AccountLedgerEntry]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._type = AccountLedgerEntry
+
+    def balances(self, account_uuids: List[str]) -> dict[str, dict[str, float]]:
+        """{account_uuid: {currency: signed sum}} for a page of accounts, in one query.
+
+        An account with no ledger rows gets `{}`, as it always has — the console
+        shows only the currencies an account was ever billed or paid in.
+        """
+        if not account_uuids:
+            return {}
+        rows = (
+            self._session.query(
+                AccountLedgerEntry.account_uuid,
+                AccountLedgerEntry.currency,
+                func.sum(AccountLedgerEntry.amount),
+            )
+            .filter(
+                AccountLedgerEntry.account_uuid.in_(account_uuids),
+                AccountLedgerEntry.is_deleted.is_(False),
+            )
+            .group_by(AccountLedgerEntry.account_uuid, AccountLedgerEntry.currency)
+            .all()
+        )
+        balances = {uuid: {} for uuid in account_uuids}
+        for account_uuid, currency, total in rows:
+            balances[account_uuid][currency] = round(total, 2)
+        return balances
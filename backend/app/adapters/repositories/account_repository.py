@@ -1,9 +1,27 @@
+from typing import List
+
+from sqlalchemy import func
+
 from app.adapters.repositories._abstract_repo import AbstractRepository
 
-from models.common import Account
+from models.common import Account, User
 
 
 class AccountRepository(AbstractRepository[Account]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._type = Account
+
+    def user_counts(self, account_uuids: List[str]) -> dict[str, int]:
+        """{account_uuid: live users} for a page of accounts, in one grouped query."""
+        if not account_uuids:
+            return {}
+        rows = (
+            self._session.query(User.account_uuid, func.count(User.uuid))
+            .filter(User.account_uuid.in_(account_uuids), User.is_deleted.is_(False))
+            .group_by(User.account_uuid)
+            .all()
+        )
+        counts = {uuid: 0 for uuid in account_uuids}
+        counts.update(rows)
+        return counts
@@ -1,7 +1,96 @@
-from models.common import CustomerOrder
-from app.adapters.repositories._abstract_repo import AbstractRepository
+from typing import List
+
+from sqlalchemy import select, update
+
+from models.common import (
+    CustomerOrder,
+    CustomerOrderItem,
+    InventoryEvent,
+    Invoice,
+    InvoiceItem,
+    Payment,
+    TripStop,
+    VehicleInventoryEvent,
+)
+from app.adapters.repositories._abstract_repo import AbstractRepository, not_deleted
+from app.adapters.repositories.financial_account_repository import drop_snapshots_since
 
 class CustomerOrderRepository(AbstractRepository[CustomerOrder]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._type = CustomerOrder
+
+    def live_uuids(self, customer_order_uuids: List[str]) -> List[str]:
+        """The uuids among `customer_order_uuids` of live orders in scope."""
+        if not customer_order_uuids:
+            return []
+        return list(self._session.execute(
+            select(CustomerOrder.uuid).where(*self._scope_filters([
+                CustomerOrder.uuid.in_(set(customer_order_uuids)),
+                not_deleted(CustomerOrder.is_deleted),
+            ]))
+        ).scalars())
+
+    def live_uuids_for_trip(self, trip_uuid: str) -> List[str]:
+        """The uuids of live orders taken at any stop of `trip_uuid`."""
+        return list(self._session.execute(
+            select(CustomerOrder.uuid)
+            .join(TripStop, TripStop.uuid == CustomerOrder.trip_stop_uuid)
+            .where(*self._scope_filters([
+                TripStop.trip_uuid == trip_uuid,
+                not_deleted(CustomerOrder.is_deleted),
+            ]))
+        ).scalars())
+
+    def void(self, customer_order_uuids: List[str]) -> None:
+        """Soft-delete orders and everything they caused, one UPDATE per table.
+
+        Items and invoices go first, keyed on the orders. Their RETURNING
+        uuids key the rest: the invoices' payments and invoice items, and the
+        warehouse and vehicle events of the items' fulfilment. Only rows that
+        were live are touched, and only the live items' and invoices'
+        dependants follow, as the walk over the relationships did. Nothing is
+        loaded, so voiding a whole trip costs the same handful of statements as
+        one order.
+
+        Payments feed financial account balances, and a bulk UPDATE skips the
+        before_flush hook that drops stale snapshots, so the payments' accounts
+        are handed to drop_snapshots_since here.
+        """
+        if not customer_order_uuids:
+            return
+        orders = list(set(customer_order_uuids))
+
+        def soft_delete(model, *where, returning=None):
+            where = [*where, not_deleted(model.is_deleted)]
+            if self._is_scoped():
+                where.append(model.account_uuid == self._account_uuid)
+            stmt = update(model).where(*where).values(is_deleted=True)
+            if returning is None:
+                self._session.execute(stmt)
+                return []
+            return self._session.execute(stmt.returning(*returning)).all()
+
+        item_uuids = [row.uuid for row in soft_delete(
+            CustomerOrderItem, CustomerOrderItem.customer_order_uuid.in_(orders),
+            returning=[CustomerOrderItem.uuid],
+        )]
+        invoice_uuids = [row.uuid for row in soft_delete(
+            Invoice, Invoice.customer_order_uuid.in_(orders), returning=[Invoice.uuid],
+        )]
+        if invoice_uuids:
+            payments = soft_delete(
+                Payment, Payment.invoice_uuid.in_(invoice_uuids),
+                returning=[Payment.financial_account_uuid, Payment.created_at],
+            )
+            marks = {}
+            for account_uuid, created_at in payments:
+                if account_uuid not in marks or created_at < marks[account_uuid]:
+                    marks[account_uuid] = created_at
+            drop_snapshots_since(self._session, marks)
+            soft_delete(InvoiceItem, InvoiceItem.invoice_uuid.in_(invoice_uuids))
+        if item_uuids:
+            # restores warehouse and vehicle stock: quantities sum live events
+            soft_delete(InventoryEvent, InventoryEvent.customer_order_item_uuid.in_(item_uuids))
+            soft_delete(VehicleInventoryEvent, VehicleInventoryEvent.customer_order_item_uuid.in_(item_uuids))
+        soft_delete(CustomerOrder, CustomerOrder.uuid.in_(orders))
@@ -1,18 +1,43 @@
 from datetime import datetime, timedelta, timezone
 from typing import Union, List, Optional
 
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, or_, select, tuple_
 
-from app.adapters.repositories._abstract_repo import AbstractRepository
+from app.adapters.repositories._abstract_repo import (
+    AbstractRepository,
+    KeysetPage,
+    any_of,
+    decode_cursor,
+    encode_cursor,
+    not_deleted,
+)
 from geoalchemy2.shape import from_shape
 from shapely.geometry import Polygon, MultiPolygon
 
 from models.common import (
+    CreditNoteItem,
     Customer,
+    CustomerOrder,
+    CustomerOrderItem,
+    DebitNoteItem,
+    Invoice,
+    InvoiceItem,
+    Payment,
+    Payout,
     TripStop,
 )
 
 
+# what /customer/search matches `q` against, each with a trigram index
+SEARCH_FIELDS = (
+    Customer.company_name,
+    Customer.full_name,
+    Customer.phone_number,
+    Customer.email_address,
+)
+_SEARCH_KEYS = ["score", "uuid"]
+
+
 class CustomerRepository(AbstractRepository[Customer]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -72,3 +97,178 @@ class CustomerRepository(AbstractRepository[Customer]):
         )
 
         return qry.all()
+
+    def find_live_by_uuids(self, customer_uuids: List[str]) -> dict[str, Customer]:
+        """{uuid: Customer} for the live customers among `customer_uuids`, in one
+        SELECT. Unknown, deleted and other tenants' uuids are simply absent, so
+        the caller decides what a missing one means."""
+        if not customer_uuids:
+            return {}
+        rows = self._find_all_by_filters(filters=[
+            Customer.uuid.in_(set(customer_uuids)),
+            Customer.is_deleted == False,
+        ])
+        return {row.uuid: row for row in rows}
+
+    def balances_per_currency(self, customer_uuids: List[str]) -> dict[str, dict[str, float]]:
+        """{customer_uuid: {currency: balance}} for many customers, in ONE query.
+
+        The set-based form of Customer.balance_per_currency: what the customer
+        owes on live invoices of live orders (Invoice.net_amount_due), plus
+        their own debit notes' amount_due, minus their credit notes'. Each term
+        is a grouped SELECT over the rows that make it up and the terms are
+        UNION ALL'd and summed per (customer, currency) — no per-customer or
+        per-invoice round trip, however long the histories are. Invoice terms
+        follow the Invoice hybrid *expressions*, which is how the invoice list
+        already computes net_amount_due in SQL.
+        """
+        if not customer_uuids:
+            return {}
+        page = any_of("customer_uuids", customer_uuids)
+
+        def invoice_term(amount, *joins_and_filters):
+            # customer/currency come from the order and invoice, as the walk has it
+            q = (
+                select(
+                    CustomerOrder.customer_uuid.label("customer_uuid"),
+                    Invoice.currency.label("currency"),
+                    func.sum(amount).label("amount"),
+                )
+                .select_from(Invoice)
+                .join(CustomerOrder, CustomerOrder.uuid == Invoice.customer_order_uuid)
+                .where(
+                    CustomerOrder.customer_uuid == page,
+                    not_deleted(CustomerOrder.is_deleted),
+                    not_deleted(Invoice.is_deleted),
+                )
+            )
+            for step in joins_and_filters:
+                q = step(q)
+            return q.group_by(CustomerOrder.customer_uuid, Invoice.currency)
+
+        def items(q):
+            return q.join(InvoiceItem, InvoiceItem.invoice_uuid == Invoice.uuid).where(
+                not_deleted(InvoiceItem.is_deleted)
+            )
+
+        def item_debits(q):
+            return q.join(DebitNoteItem, DebitNoteItem.invoice_item_uuid == InvoiceItem.uuid).where(
+                not_deleted(DebitNoteItem.is_deleted)
+            )
+
+        def item_credits(q):
+            return q.join(CreditNoteItem, CreditNoteItem.invoice_item_uuid == InvoiceItem.uuid).where(
+                not_deleted(CreditNoteItem.is_deleted)
+            )
+
+        def live(model):
+            return lambda q: q.where(not_deleted(model.is_deleted))
+
+        terms = [
+            # total_amount: price x ordered quantity per live item
+            invoice_term(
+                InvoiceItem.price_per_unit * CustomerOrderItem.quantity,
+                items,
+                lambda q: q.join(
+                    CustomerOrderItem,
+                    CustomerOrderItem.uuid == InvoiceItem.customer_order_item_uuid,
+                ),
+            ),
+            # + debit notes, - credit notes raised against the invoice's items
+            invoice_term(DebitNoteItem.amount, items, item_debits),
+            invoice_term(-CreditNoteItem.amount, items, item_credits),
+            # - payments straight onto the invoice
+            invoice_term(
+                -Payment.amount,
+                lambda q: q.join(Payment, Payment.invoice_uuid == Invoice.uuid),
+                live(Payment),
+            ),
+            # + payouts refunding those credit notes, - payments of those debits
+            invoice_term(
+                Payout.amount, items, item_credits,
+                lambda q: q.join(Payout, Payout.credit_note_item_uuid == CreditNoteItem.uuid),
+                live(Payout),
+            ),
+            invoice_term(
+                -Payment.amount, items, item_debits,
+                lambda q: q.join(Payment, Payment.debit_note_item_uuid == DebitNoteItem.uuid),
+                live(Payment),
+            ),
+        ]
+
+        # the customer's own notes, at amount_due (amount less what settled it)
+        debit_paid = (
+            select(func.coalesce(func.sum(Payment.amount), 0))
+            .where(Payment.debit_note_item_uuid == DebitNoteItem.uuid, not_deleted(Payment.is_deleted))
+            .correlate(DebitNoteItem)
+            .scalar_subquery()
+        )
+        credit_paid = (
+            select(func.coalesce(func.sum(Payout.amount), 0))
+            .where(Payout.credit_note_item_uuid == CreditNoteItem.uuid, not_deleted(Payout.is_deleted))
+            .correlate(CreditNoteItem)
+            .scalar_subquery()
+        )
+        terms.append(
+            select(
+                DebitNoteItem.customer_uuid, DebitNoteItem.currency,
+                func.sum(DebitNoteItem.amount - debit_paid),
+            )
+            .where(DebitNoteItem.customer_uuid == page, not_deleted(DebitNoteItem.is_deleted))
+            .group_by(DebitNoteItem.customer_uuid, DebitNoteItem.currency)
+        )
+        terms.append(
+            select(
+                CreditNoteItem.customer_uuid, CreditNoteItem.currency,
+                -func.sum(CreditNoteItem.amount - credit_paid),
+            )
+            .where(CreditNoteItem.customer_uuid == page, not_deleted(CreditNoteItem.is_deleted))
+            .group_by(CreditNoteItem.customer_uuid, CreditNoteItem.currency)
+        )
+
+        return self._sum_balance_terms(terms, customer_uuids)
+
+    def prime_balances(self, customers: List[Customer]) -> None:
+        """Compute balance_per_currency for a page of customers up front.
+
+        CustomerRead reads `balance_per_currency` off each row; once primed it
+        is a dict lookup instead of a walk over the customer's whole order
+        graph, so a page costs one extra query in total.
+        """
+        balances = self.balances_per_currency([c.uuid for c in customers])
+        for customer in customers:
+            customer.prime_balance_per_currency(balances[customer.uuid])
+
+    def search(
+            self,
+            q: str,
+            filters: list,
+            per_page: int,
+            cursor: Optional[str] = None,
+    ) -> KeysetPage[Customer]:
+        """Customers matching `q` on any SEARCH_FIELDS, best match first.
+
+        A row matches when a field contains `q` (case-insensitive) or is
+        trigram-similar to it (pg_trgm's `%`, for typos and transliterations).
+        Both are answered by the ix_customer_*_trgm GIN indexes. Rows are ranked
+        by their best field similarity and keyset-paged on (score, uuid). The
+        score is computed again for each page, so a cursor belongs to the `q`
+        that minted it.
+        """
+        score = func.greatest(*[func.similarity(col, q) for col in SEARCH_FIELDS])
+        match = or_(
+            *[col.icontains(q, autoescape=True) for col in SEARCH_FIELDS],
+            *[col.op("%")(q) for col in SEARCH_FIELDS],
+        )
+        query = self._session.query(Customer, score).filter(*self._scope_filters([*filters, match]))
+        if cursor:
+            query = query.filter(
+                tuple_(score, Customer.uuid) < tuple_(*decode_cursor(cursor, _SEARCH_KEYS))
+            )
+        rows = query.order_by(score.desc(), Customer.uuid.desc()).limit(per_page + 1).all()
+        items = [customer for customer, _ in rows[:per_page]]
+        next_cursor = None
+        if len(rows) > per_page:
+            last, last_score = rows[per_page - 1]
+            next_cursor = encode_cursor(_SEARCH_KEYS, [last_score, last.uuid])
+        return KeysetPage(items, per_page, next_cursor)
@@ -1,8 +1,213 @@
-from app.adapters.repositories._abstract_repo import AbstractRepository
-from models.common import FinancialAccount
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, event, func, inspect, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.adapters.repositories._abstract_repo import AbstractRepository, any_of, not_deleted
+from models.common import FinancialAccount, FinancialAccountSnapshot, Payment, Payout, Transaction
+
+
+# (financial account column, amount column, sign) for every way money moves
+# in or out of an account — the same four sums FinancialAccount.balance walks
+_LEGS = (
+    (Transaction.to_account_uuid, Transaction.to_amount, 1),
+    (Transaction.from_account_uuid, Transaction.from_amount, -1),
+    (Payment.financial_account_uuid, Payment.amount, 1),
+    (Payout.financial_account_uuid, Payout.amount, -1),
+)
 
 
 class FinancialAccountRepository(AbstractRepository[FinancialAccount]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._type = FinancialAccount
+
+    def balances(
+            self,
+            financial_account_uuids: List[str],
+            as_of: Optional[datetime] = None,
+    ) -> dict[str, float]:
+        """{financial_account_uuid: balance} for many accounts, in ONE query.
+
+        Each account's latest snapshot (at or before `as_of`) plus the grouped
+        sum of its live movements created from that snapshot's cutoff on —
+        or of all of them, for an account with no snapshot yet. With `as_of`,
+        the balance as it stood then: only movements created before it count.
+        """
+        if not financial_account_uuids:
+            return {}
+        page = any_of("financial_account_uuids", financial_account_uuids)
+
+        latest = (
+            select(
+                FinancialAccountSnapshot.financial_account_uuid,
+                FinancialAccountSnapshot.cutoff,
+                FinancialAccountSnapshot.balance,
+            )
+            .where(FinancialAccountSnapshot.financial_account_uuid == page)
+            .distinct(FinancialAccountSnapshot.financial_account_uuid)
+            .order_by(
+                FinancialAccountSnapshot.financial_account_uuid,
+                FinancialAccountSnapshot.cutoff.desc(),
+            )
+        )
+        if as_of is not None:
+            latest = latest.where(FinancialAccountSnapshot.cutoff <= as_of)
+        snap = latest.cte("snap")
+
+        terms = [select(snap.c.financial_account_uuid, snap.c.balance)]
+        for account_col, amount_col, sign in _LEGS:
+            model = account_col.class_
+            term = (
+                select(account_col, sign * func.sum(amount_col))
+                .select_from(model)
+                .outerjoin(snap, snap.c.financial_account_uuid == account_col)
+                .where(
+                    account_col == page,
+                    not_deleted(model.is_deleted),
+                    or_(snap.c.cutoff.is_(None), model.created_at >= snap.c.cutoff),
+                )
+                .group_by(account_col)
+            )
+            if as_of is not None:
+                term = term.where(model.created_at < as_of)
+            terms.append(term)
+
+        parts = union_all(*terms).subquery()
+        rows = self._session.execute(
+            select(parts.c[0], func.sum(parts.c[1])).group_by(parts.c[0])
+        ).all()
+        result = {uuid: 0.0 for uuid in financial_account_uuids}
+        for uuid, amount in rows:
+            result[uuid] = float(amount or 0)
+        return result
+
+    def prime_balances(self, accounts: List[FinancialAccount]) -> None:
+        """Compute `balance` for a page of accounts up front, in one query."""
+        balances = self.balances([a.uuid for a in accounts])
+        for account in accounts:
+            account.prime_balance(balances[account.uuid])
+
+    def write_snapshots(self, cutoff: datetime) -> int:
+        """Checkpoint every account in scope at `cutoff`. Returns rows written.
+
+        Built from the previous checkpoint plus what moved up to `cutoff`, so a
+        nightly run reads one day of movements, not the whole history. An
+        account already checkpointed at this cutoff is left alone, which makes
+        a second run the same night a no-op. The caller commits.
+        """
+        accounts = self._session.execute(
+            select(FinancialAccount.uuid, FinancialAccount.account_uuid)
+            .where(*self._scope_filters([]))
+            .where(~select(FinancialAccountSnapshot.uuid).where(
+                FinancialAccountSnapshot.financial_account_uuid == FinancialAccount.uuid,
+                FinancialAccountSnapshot.cutoff == cutoff,
+            ).exists())
+        ).all()
+        if not accounts:
+            return 0
+        balances = self.balances([uuid for uuid, _ in accounts], as_of=cutoff)
+        self._session.add_all([
+            FinancialAccountSnapshot(
+                account_uuid=account_uuid,
+                financial_account_uuid=uuid,
+                cutoff=cutoff,
+                balance=balances[uuid],
+            )
+            for uuid, account_uuid in accounts
+        ])
+        self._session.flush()
+        return len(accounts)
+
+    def drop_snapshots(self) -> int:
+        """Delete every snapshot in scope. Returns rows deleted; the caller commits."""
+        filters = []
+        if self._is_scoped():
+            filters.append(FinancialAccountSnapshot.account_uuid == self._account_uuid)
+        return self._session.execute(
+            delete(FinancialAccountSnapshot).where(*filters)
+        ).rowcount
+
+
+# --------------------------------------------------------------------------
+# keeping snapshots honest
+# --------------------------------------------------------------------------
+
+# what a movement's contribution to a balance depends on
+_MOVEMENT_FIELDS = {
+    Payment: (("financial_account_uuid",), ("amount", "is_deleted", "created_at")),
+    Payout: (("financial_account_uuid",), ("amount", "is_deleted", "created_at")),
+    Transaction: (
+        ("from_account_uuid", "to_account_uuid"),
+        ("from_amount", "to_amount", "is_deleted", "created_at"),
+    ),
+}
+
+
+def stale_snapshot_marks(new: Iterable, dirty: Iterable, deleted: Iterable) -> dict[str, datetime]:
+    """{financial_account_uuid: earliest created_at} a flush is about to change.
+
+    Every snapshot of that account with a cutoff after that moment has the old
+    figure baked in. A brand new movement is stamped `now`, after every cutoff,
+    and touches nothing; one inserted with an explicit older created_at does.
+    A soft-delete, an amount edit or a move to another account counts against
+    both the old and the new account, at the earlier of the old and new times.
+    """
+    marks: dict[str, datetime] = {}
+
+    def mark(account_uuid, when):
+        if account_uuid is None or when is None:
+            return
+        if account_uuid not in marks or when < marks[account_uuid]:
+            marks[account_uuid] = when
+
+    for obj in new:
+        fields = _MOVEMENT_FIELDS.get(type(obj))
+        if fields:
+            for name in fields[0]:
+                mark(getattr(obj, name), obj.created_at)
+
+    for obj, removed in [(o, False) for o in dirty] + [(o, True) for o in deleted]:
+        fields = _MOVEMENT_FIELDS.get(type(obj))
+        if not fields:
+            continue
+        attrs = inspect(obj).attrs
+        if not removed and not any(
+            attrs[name].history.has_changes() for name in fields[0] + fields[1]
+        ):
+            continue
+        times = [obj.created_at, *attrs["created_at"].history.deleted]
+        when = min((t for t in times if t is not None), default=None)
+        for name in fields[0]:
+            history = attrs[name].history
+            for account_uuid in [getattr(obj, name), *history.deleted]:
+                mark(account_uuid, when)
+    return marks
+
+
+@event.listens_for(Session, "before_flush")
+def _drop_stale_snapshots(session, _flush_context, _instances):
+    """Drop the snapshots a flush's movement changes would make wrong.
+
+    Hooked on the flush rather than on the domains so no path that deletes a
+    payment, voids an order or cancels a transaction can forget it. Bulk
+    UPDATE statements do not pass through here; code issuing them against
+    movements calls `drop_snapshots_since` itself.
+    """
+    marks = stale_snapshot_marks(session.new, session.dirty, session.deleted)
+    if marks:
+        drop_snapshots_since(session, marks)
+
+
+def drop_snapshots_since(session: Session, marks: dict[str, datetime]) -> None:
+    # on the connection, not session.execute: that would autoflush, from
+    # inside the flush that got us here
+    connection = session.connection()
+    for account_uuid, when in marks.items():
+        connection.execute(
+            delete(FinancialAccountSnapshot.__table__).where(
+                FinancialAccountSnapshot.financial_account_uuid == account_uuid,
+                FinancialAccountSnapshot.cutoff > when,
+            )
+        )
@@ -1,6 +1,8 @@
+from typing import Iterable
+
 from app.adapters.repositories._abstract_repo import AbstractRepository
 from models.common import Inventory
-from sqlalchemy import asc
+from sqlalchemy import asc, func, or_, select
 
 from app.entrypoint.routes.common.errors import BadRequestError
 
@@ -55,4 +57,47 @@ class InventoryRepository(AbstractRepository[Inventory]):
         #         f"Insufficient inventory for material {material_uuid}: "
         #         f"requested {quantity}, available {quantity - remaining}"
         #     )
-        return result
\ No newline at end of file
+        return result
+
+    def lots_for_allocation(
+            self,
+            material_uuids: Iterable[str],
+            lot_uuids: Iterable[str] = (),
+    ) -> list:
+        """Rows of (uuid, material_uuid, current_quantity), oldest first, for
+        allocating sales of many materials at once.
+
+        Per material: every lot with stock, plus its newest lot whatever its
+        balance (where an overdraft goes once nothing is left). Also any lot in
+        `lot_uuids`, the ones a caller named explicitly. One statement with
+        current_quantity selected as a column, so allocating a whole basket
+        neither runs a query per material nor loads any lot's event history.
+        """
+        material_uuids, lot_uuids = list(set(material_uuids)), list(set(lot_uuids))
+        if not material_uuids and not lot_uuids:
+            return []
+        lots = (
+            select(
+                Inventory.uuid,
+                Inventory.material_uuid,
+                Inventory.created_at,
+                Inventory.current_quantity.label("current_quantity"),
+                func.row_number().over(
+                    partition_by=Inventory.material_uuid,
+                    order_by=Inventory.created_at.desc(),
+                ).label("newest"),
+            )
+            .where(*self._scope_filters([
+                Inventory.is_deleted == False,
+                or_(Inventory.material_uuid.in_(material_uuids), Inventory.uuid.in_(lot_uuids)),
+            ]))
+            .subquery()
+        )
+        return self._session.execute(
+            select(lots.c.uuid, lots.c.material_uuid, lots.c.current_quantity)
+            .where(or_(
+                lots.c.uuid.in_(lot_uuids),
+                lots.c.material_uuid.in_(material_uuids) & ((lots.c.current_quantity > 0) | (lots.c.newest == 1)),
+            ))
+            .order_by(lots.c.created_at.asc(), lots.c.uuid)
+        ).all()
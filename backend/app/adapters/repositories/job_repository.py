@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, func, or_, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.adapters.repositories._abstract_repo import AbstractRepository
+from app.dto.job import JobStatus
+from models.common import Job
+
+LIVE_STATUSES = (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+
+
+class JobRepository(AbstractRepository[Job]):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._type = Job
+
+    def claim_next(
+            self,
+            worker_id: str,
+            lease: timedelta,
+            exclude_kinds: Iterable[str] = (),
+    ) -> Optional[Job]:
+        """Lock and mark running the oldest runnable job, or None.
+
+        FOR UPDATE SKIP LOCKED is what makes several workers safe against one
+        table: a row another worker is claiming right now is skipped rather than
+        waited on, so no two workers ever hold the same job and none of them
+        blocks behind another's claim. A `running` row whose lease has expired
+        belonged to a worker that died mid-job and is taken over, unless that
+        was its last attempt (see fail_exhausted): a job that keeps killing its
+        worker must not be retried forever.
+
+        The caller commits; the row lock only lives until then, and from then on
+        `status`/`locked_at` are what keep other workers off it.
+        """
+        now = datetime.utcnow()
+        query = (
+            self._session.query(Job)
+            .filter(*self._scope_filters([]))
+            .filter(or_(
+                and_(Job.status == JobStatus.QUEUED.value, Job.run_after <= now),
+                and_(
+                    Job.status == JobStatus.RUNNING.value,
+                    Job.locked_at < now - lease,
+                    Job.attempts < Job.max_attempts,
+                ),
+            ))
+        )
+        exclude_kinds = list(exclude_kinds)
+        if exclude_kinds:
+            query = query.filter(Job.kind.notin_(exclude_kinds))
+        job = (
+            query.order_by(Job.run_after, Job.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = JobStatus.RUNNING.value
+        job.attempts = (job.attempts or 0) + 1
+        job.locked_at = now
+        job.locked_by = worker_id
+        job.started_at = job.started_at or now
+        self._session.flush()
+        return job
+
+    def running_counts(self, lease: timedelta) -> dict[str, int]:
+        """{kind: jobs currently running with a live lease}."""
+        now = datetime.utcnow()
+        rows = (
+            self._session.query(Job.kind, func.count())
+            .filter(*self._scope_filters([]))
+            .filter(Job.status == JobStatus.RUNNING.value, Job.locked_at >= now - lease)
+            .group_by(Job.kind)
+            .all()
+        )
+        return {kind: count for kind, count in rows}
+
+    def fail_exhausted(self, lease: timedelta, error: str) -> int:
+        """Fail the running jobs whose lease expired on their last attempt.
+
+        claim_next no longer takes these over. Left alone they would read
+        `running` forever, and hold their dedupe key so the same work could
+        never be queued again. Returns how many were failed."""
+        now = datetime.utcnow()
+        return self._session.execute(
+            update(Job)
+            .where(*self._scope_filters([
+                Job.status == JobStatus.RUNNING.value,
+                Job.locked_at < now - lease,
+                Job.attempts >= Job.max_attempts,
+            ]))
+            .values(status=JobStatus.FAILED.value, error=error, finished_at=now,
+                    locked_at=None, locked_by=None)
+        ).rowcount
+
+    def insert_unless_live(self, job: Job) -> Job:
+        """Insert `job`, or return the live job that already holds its
+        dedupe_key.
+
+        A plain INSERT loses a race between two requests that both missed the
+        lookup in JobDomain.enqueue, and the partial unique index turns the
+        loser's flush into an IntegrityError (a 500). ON CONFLICT DO NOTHING
+        waits for the winner's transaction instead and then inserts nothing,
+        so the existing job is read back and returned. If that job finished in
+        between, its key is free and the insert is tried again.
+        """
+        self._stamp_account(job)
+        values = {
+            column.key: getattr(job, column.key)
+            for column in Job.__table__.columns
+            if getattr(job, column.key) is not None
+        }
+        while True:
+            inserted = self._session.execute(
+                pg_insert(Job)
+                .values(**values)
+                .on_conflict_do_nothing(
+                    index_elements=[Job.dedupe_key],
+                    # the predicate of uq_job_active_dedupe, verbatim
+                    index_where=text("status IN ('queued', 'running')"),
+                )
+                .returning(Job.uuid)
+            ).scalar()
+            if inserted:
+                return self._session.get(Job, inserted)
+            existing = self._find_first_by_filters(filters=[
+                Job.dedupe_key == job.dedupe_key,
+                Job.status.in_(LIVE_STATUSES),
+            ])
+            if existing:
+                return existing
@@ -1,8 +1,136 @@
-from app.adapters.repositories._abstract_repo import AbstractRepository
+import threading
+import time
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.adapters.repositories._abstract_repo import AbstractRepository, not_deleted
 from models.common import Material
 
 
+class MaterialRef(NamedTuple):
+    """The columns the order, inventory and process paths read off a material
+    they only look up: enough to check it exists, stamp its unit or print
+    its name. Plain values, so one can outlive the session that read it."""
+    uuid: str
+    account_uuid: str
+    name: str
+    measure_unit: Optional[str]
+    sku: str
+    type: str
+
+
+_REF_COLUMNS = [getattr(Material, name) for name in MaterialRef._fields]
+
+# Materials are read on almost every order line and change a few times a
+# year, so live ones are kept per process for a short while, keyed by
+# (tenant scope, uuid). A write flushed in this process drops its entry at
+# once (see _forget_written_materials). The TTL bounds how long another
+# gunicorn worker can serve a material renamed or given a new unit, the same
+# trade role_overrides() makes.
+_MATERIAL_TTL_SECONDS = 60
+_material_cache: dict = {}
+_material_cache_lock = threading.Lock()
+
+
+def invalidate_materials(material_uuids: Optional[Iterable[str]] = None) -> None:
+    """Drop cached materials, every tenant's entry for each uuid (all when None)."""
+    with _material_cache_lock:
+        if material_uuids is None:
+            _material_cache.clear()
+            return
+        gone = set(material_uuids)
+        for key in [key for key in _material_cache if key[1] in gone]:
+            del _material_cache[key]
+
+
 class MaterialRepository(AbstractRepository[Material]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._type = Material
+
+    def _unit_of_work_refs(self) -> dict:
+        """This unit of work's lookups, {(scope, uuid): MaterialRef or None
+        once known missing}. Kept on the session, where the flush hook below
+        can drop what a write makes stale."""
+        return self._session.info.setdefault("material_refs", {})
+
+    def get_many(self, material_uuids: Iterable[str]) -> dict[str, MaterialRef]:
+        """{uuid: MaterialRef} for the live materials among `material_uuids`.
+        Unknown, deleted and other tenants' uuids are absent.
+
+        Each uuid is answered by this unit of work's earlier lookups, then by
+        the process cache, and whatever is left is read in one SELECT. A loop
+        over order lines costs at most one query, and usually none.
+        """
+        material_uuids = set(material_uuids)
+        refs = self._unit_of_work_refs()
+        wanted = {u for u in material_uuids if (self._account_uuid, u) not in refs}
+        if wanted:
+            now = time.monotonic()
+            with _material_cache_lock:
+                for material_uuid in list(wanted):
+                    cached = _material_cache.get((self._account_uuid, material_uuid))
+                    if cached and now - cached[1] < _MATERIAL_TTL_SECONDS:
+                        refs[(self._account_uuid, material_uuid)] = cached[0]
+                        wanted.discard(material_uuid)
+        if wanted:
+            rows = self._session.execute(
+                select(*_REF_COLUMNS).where(*self._scope_filters([
+                    Material.uuid.in_(wanted),
+                    not_deleted(Material.is_deleted),
+                ]))
+            ).all()
+            found = {row.uuid: MaterialRef(*row) for row in rows}
+            # a unit of work that wrote materials may read its own uncommitted
+            # rows; those must not reach the other units of work
+            if "written_materials" not in self._session.info:
+                loaded_at = time.monotonic()
+                with _material_cache_lock:
+                    for ref in found.values():
+                        _material_cache[(self._account_uuid, ref.uuid)] = (ref, loaded_at)
+            for material_uuid in wanted:
+                refs[(self._account_uuid, material_uuid)] = found.get(material_uuid)
+        return {
+            material_uuid: refs[(self._account_uuid, material_uuid)]
+            for material_uuid in material_uuids if refs[(self._account_uuid, material_uuid)] is not None
+        }
+
+    def get(self, material_uuid: str) -> Optional[MaterialRef]:
+        """get_many for one uuid: its MaterialRef, or None."""
+        return self.get_many([material_uuid]).get(material_uuid)
+
+
+@event.listens_for(Session, "after_flush")
+def _forget_written_materials(session, _flush_context):
+    """Drop every cached copy of the materials this flush created, changed or
+    deleted: this unit of work's and the process's. They are dropped from the
+    process cache again at commit, because another unit of work may re-read
+    the old row in between, and at rollback, because this one may have
+    cached a row that will never exist."""
+    written = {
+        obj.uuid for obj in [*session.new, *session.dirty, *session.deleted]
+        if isinstance(obj, Material)
+    }
+    if written:
+        refs = session.info.get("material_refs", {})
+        for key in [key for key in refs if key[1] in written]:
+            del refs[key]
+        invalidate_materials(written)
+        session.info.setdefault("written_materials", set()).update(written)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_committed_materials(session):
+    written = session.info.pop("written_materials", None)
+    if written:
+        invalidate_materials(written)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_materials(session):
+    session.info.pop("material_refs", None)
+    written = session.info.pop("written_materials", None)
+    if written:
+        invalidate_materials(written)
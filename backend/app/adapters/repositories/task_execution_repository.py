@@ -1,7 +1,83 @@
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import func, select, update
+
 from app.adapters.repositories._abstract_repo import AbstractRepository
-from models.common import TaskExecution
+from app.adapters.repositories.workflow_execution_repository import TERMINAL_STATUSES
+from app.dto.workflow_execution import WorkflowStatus
+from models.common import Task, TaskExecution
+
 
 class TaskExecutionRepository(AbstractRepository[TaskExecution]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._type = TaskExecution
+
+    def find_waiting_on(self, workflow_execution_uuid: str, name: str, status: str) -> list[TaskExecution]:
+        """Executions in `status` whose depends_on names `name`: the direct
+        dependants of that task. Only those rows are loaded.
+
+        ix_task_execution_workflow_status narrows the search to this workflow's
+        executions in `status`; the depends_on containment is then checked row
+        by row among those. There is no reverse-dependency index: a GIN index
+        on depends_on alone would not pay, since the same task names recur in
+        every workflow."""
+        return self._find_all_by_filters(filters=[
+            TaskExecution.workflow_execution_uuid == workflow_execution_uuid,
+            TaskExecution.status == status,
+            TaskExecution.depends_on.contains([name]),
+        ])
+
+    def names_in_status(self, workflow_execution_uuid: str, names: Iterable[str], status: str) -> set[str]:
+        """Which of `names` are in `status` in this workflow execution.
+
+        Only the named executions are read. A name counts once every
+        execution carrying it is in `status`.
+        """
+        names = list(set(names))
+        if not names:
+            return set()
+        rows = self._session.execute(
+            select(Task.name)
+            .join(TaskExecution, TaskExecution.task_uuid == Task.uuid)
+            .where(*self._scope_filters([
+                TaskExecution.workflow_execution_uuid == workflow_execution_uuid,
+                Task.name.in_(names),
+            ]))
+            .group_by(Task.name)
+            .having(func.bool_and(TaskExecution.status == status))
+        ).scalars()
+        return set(rows)
+
+    def all_in_status(self, workflow_execution_uuid: str, status: str) -> bool:
+        """True when every execution of the workflow is in `status`. This is one
+        index probe that stops at the first execution that is not."""
+        return not self._session.execute(
+            select(
+                select(TaskExecution.uuid)
+                .where(*self._scope_filters([
+                    TaskExecution.workflow_execution_uuid == workflow_execution_uuid,
+                    TaskExecution.status != status,
+                ]))
+                .exists()
+            )
+        ).scalar()
+
+    def cancel_for_workflows(self, workflow_execution_uuids: list[str], ended_at: datetime, error_message: str) -> int:
+        """Cancel every execution of the workflow executions that is not yet
+        completed, cancelled or failed, in one UPDATE off
+        ix_task_execution_workflow_status. Child executions carry their
+        parent's workflow_execution_uuid, so they are covered without walking
+        child_task_executions. Returns the number of executions cancelled."""
+        if not workflow_execution_uuids:
+            return 0
+        result = self._session.execute(
+            update(TaskExecution)
+            .where(*self._scope_filters([
+                TaskExecution.workflow_execution_uuid.in_(set(workflow_execution_uuids)),
+                TaskExecution.status.notin_(TERMINAL_STATUSES),
+            ]))
+            .values(status=WorkflowStatus.CANCELLED.value, end_time=ended_at, error_message=error_message)
+        )
+        return result.rowcount
@@ -1,7 +1,148 @@
-from app.adapters.repositories._abstract_repo import AbstractRepository
-from models.common import Trip
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import func, select, update
+
+from app.adapters.repositories._abstract_repo import AbstractRepository, any_of, not_deleted
+from app.dto.trip import TripStatus
+from app.dto.trip_stop import TripStopStatus
+from models.common import (
+    CustomerOrder,
+    CustomerOrderItem,
+    Expense,
+    Invoice,
+    Payment,
+    Payout,
+    Trip,
+    TripStop,
+    VehicleInventoryEvent,
+)
 
 class TripRepository(AbstractRepository[Trip]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._type = Trip
+
+    def cancel_for_workflows(self, workflow_execution_uuids: List[str], ended_at: datetime) -> List[str]:
+        """TripDomain.cancel_trip for every open trip of the workflow executions:
+        one UPDATE for the trips and one for their stops that are not yet
+        completed or cancelled. Trips already completed or cancelled are left
+        as they are. Returns the uuids of the trips cancelled."""
+        if not workflow_execution_uuids:
+            return []
+        trip_uuids = list(self._session.execute(
+            update(Trip)
+            .where(*self._scope_filters([
+                Trip.workflow_execution_uuid.in_(set(workflow_execution_uuids)),
+                Trip.status.notin_((TripStatus.COMPLETED.value, TripStatus.CANCELLED.value)),
+            ]))
+            .values(status=TripStatus.CANCELLED.value, end_time=ended_at)
+            .returning(Trip.uuid)
+        ).scalars())
+        if trip_uuids:
+            # the trips are in scope already, and a stop shares its trip's account
+            self._session.execute(
+                update(TripStop)
+                .where(
+                    TripStop.trip_uuid.in_(trip_uuids),
+                    TripStop.status.notin_((TripStopStatus.COMPLETED.value, TripStopStatus.CANCELLED.value)),
+                )
+                .values(status=TripStopStatus.CANCELLED.value)
+            )
+        return trip_uuids
+
+    def summary_figures(self, trip_uuids: List[str]) -> dict[str, dict]:
+        """The money and stock figures of Trip's summary properties, for many
+        trips in three grouped SELECTs.
+
+        {trip_uuid: {"collected", "expenses", "expenses_paid",
+        "expenses_unpaid": {currency: amount}, "sold": {material_uuid: qty}}}.
+        Each query keeps what the property it stands in for keeps:
+          - collected (Trip.expected_cash): live payments taken at the trip's
+            stops, less those of deleted invoices or orders;
+          - expenses (Trip.trip_expenses*): the trip's live expenses, at face
+            value and at their live payouts;
+          - sold (Trip.sold_inventory_map): live vehicle 'sale' events tagged
+            to the stops, less those of deleted items or orders.
+        The caller passes trips it has already read in scope, and every row
+        below belongs to one of them, so no account filter is repeated here.
+        """
+        figures = {
+            trip_uuid: {"collected": {}, "expenses": {}, "expenses_paid": {},
+                        "expenses_unpaid": {}, "sold": {}}
+            for trip_uuid in trip_uuids
+        }
+        if not figures:
+            return figures
+        trips = any_of("trip_uuids", figures)
+
+        collected = self._session.execute(
+            select(TripStop.trip_uuid, Payment.currency, func.sum(Payment.amount))
+            .select_from(Payment)
+            .join(TripStop, TripStop.uuid == Payment.trip_stop_uuid)
+            .outerjoin(Invoice, Invoice.uuid == Payment.invoice_uuid)
+            .outerjoin(CustomerOrder, CustomerOrder.uuid == Invoice.customer_order_uuid)
+            .where(
+                TripStop.trip_uuid == trips,
+                not_deleted(Payment.is_deleted),
+                # the outer joins leave NULLs where there is no invoice or order
+                not_deleted(Invoice.is_deleted),
+                not_deleted(CustomerOrder.is_deleted),
+            )
+            .group_by(TripStop.trip_uuid, Payment.currency)
+        )
+        for trip_uuid, currency, amount in collected:
+            figures[trip_uuid]["collected"][currency] = amount
+
+        # Expense.amount_paid, but NULL is_deleted counts as live, as in the walk
+        paid = (
+            select(func.coalesce(func.sum(Payout.amount), 0))
+            .where(Payout.expense_uuid == Expense.uuid, not_deleted(Payout.is_deleted))
+            .correlate(Expense)
+            .scalar_subquery()
+        )
+        expenses = self._session.execute(
+            select(
+                Expense.trip_uuid, Expense.currency,
+                func.sum(Expense.amount), func.sum(paid),
+            )
+            .where(Expense.trip_uuid == trips, not_deleted(Expense.is_deleted))
+            .group_by(Expense.trip_uuid, Expense.currency)
+        )
+        for trip_uuid, currency, booked, paid in expenses:
+            figures[trip_uuid]["expenses"][currency] = booked
+            figures[trip_uuid]["expenses_paid"][currency] = paid
+            figures[trip_uuid]["expenses_unpaid"][currency] = round(booked - paid, 2)
+
+        sold = self._session.execute(
+            select(TripStop.trip_uuid, VehicleInventoryEvent.material_uuid,
+                   -func.sum(VehicleInventoryEvent.quantity))
+            .select_from(VehicleInventoryEvent)
+            .join(TripStop, TripStop.uuid == VehicleInventoryEvent.trip_stop_uuid)
+            .outerjoin(CustomerOrderItem,
+                       CustomerOrderItem.uuid == VehicleInventoryEvent.customer_order_item_uuid)
+            .outerjoin(CustomerOrder, CustomerOrder.uuid == CustomerOrderItem.customer_order_uuid)
+            .where(
+                TripStop.trip_uuid == trips,
+                VehicleInventoryEvent.event_type == "sale",
+                not_deleted(VehicleInventoryEvent.is_deleted),
+                not_deleted(CustomerOrderItem.is_deleted),
+                not_deleted(CustomerOrder.is_deleted),
+            )
+            .group_by(TripStop.trip_uuid, VehicleInventoryEvent.material_uuid)
+        )
+        for trip_uuid, material_uuid, quantity in sold:
+            figures[trip_uuid]["sold"][material_uuid] = quantity
+        return figures
+
+    def prime_summaries(self, trips: List[Trip]) -> None:
+        """Compute the summary properties for many trips up front.
+
+        TripDomain.summarize reads expected_cash, the trip_expenses family and
+        inventory_reconciliation off each trip; once primed those are dict
+        lookups instead of walks over every stop's payments and sale events,
+        so a week of trips costs three extra queries in total.
+        """
+        figures = self.summary_figures([t.uuid for t in trips])
+        for trip in trips:
+            trip.prime_summary(figures[trip.uuid])
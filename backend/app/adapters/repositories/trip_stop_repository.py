@@ -1,7 +1,66 @@
+from typing import List
+
+from sqlalchemy.orm import selectinload
+
 from app.adapters.repositories._abstract_repo import AbstractRepository
-from models.common import TripStop
+from models.common import (
+    CreditNoteItem,
+    CustomerOrder,
+    CustomerOrderItem,
+    DebitNoteItem,
+    Invoice,
+    InvoiceItem,
+    Payment,
+    TripStop,
+    VehicleInventoryEvent,
+)
 
 class TripStopRepository(AbstractRepository[TripStop]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._type = TripStop
+
+    def find_for_activity(self, trip_uuid: str) -> List[TripStop]:
+        """A trip's stops with everything the activity view reads, preloaded.
+
+        One SELECT per relationship level, each `WHERE fk IN (<the whole level>)`,
+        so the statement count is fixed however many stops, orders or payments
+        the trip has — the lazy walk it replaces issued several per stop. The
+        order branch loads what CustomerOrder's totals and paid state walk in
+        Python: invoices, their items with the notes on them, and what settled
+        those notes.
+        """
+        invoice_totals = (
+            selectinload(CustomerOrder.invoices).options(
+                selectinload(Invoice.payments),
+                selectinload(Invoice.invoice_items).options(
+                    selectinload(InvoiceItem.customer_order_item),
+                    selectinload(InvoiceItem.debit_note_items).selectinload(DebitNoteItem.payments),
+                    selectinload(InvoiceItem.credit_note_items).selectinload(CreditNoteItem.payouts),
+                ),
+            )
+        )
+        return (
+            self._session.query(TripStop)
+            .filter(*self._scope_filters([TripStop.trip_uuid == trip_uuid]))
+            .options(
+                selectinload(TripStop.customer),
+                selectinload(TripStop.customer_orders).options(
+                    selectinload(CustomerOrder.customer),
+                    selectinload(CustomerOrder.customer_order_items)
+                    .selectinload(CustomerOrderItem.invoice_item),
+                    invoice_totals,
+                ),
+                # the sale events and payments recorded at the stop, each back
+                # to the order (and customer) it belongs to
+                selectinload(TripStop.vehicle_inventory_events)
+                .selectinload(VehicleInventoryEvent.customer_order_item)
+                .selectinload(CustomerOrderItem.customer_order)
+                .selectinload(CustomerOrder.customer),
+                selectinload(TripStop.payments)
+                .selectinload(Payment.invoice)
+                .selectinload(Invoice.customer_order)
+                .selectinload(CustomerOrder.customer),
+            )
+            .all()
+        )
@@ -1,8 +1,87 @@
-from app.adapters.repositories._abstract_repo import AbstractRepository
-from models.common import VehicleInventory
+from typing import Iterable, List
+
+from sqlalchemy import func, select, tuple_
+
+from app.adapters.repositories._abstract_repo import AbstractRepository, any_of, not_deleted
+from models.common import Material, VehicleInventory, VehicleInventoryEvent
 
 
 class VehicleInventoryRepository(AbstractRepository[VehicleInventory]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._type = VehicleInventory
+
+    def current_quantities(self, vehicle_inventory_uuids: List[str]) -> dict[str, float]:
+        """{vehicle_inventory_uuid: current_quantity} for many rows, in ONE query.
+
+        The grouped form of VehicleInventory.current_quantity: the sum of each
+        row's live events, read off ix_vehicle_inventory_event_inventory_uuid.
+        A row without events is 0.
+        """
+        if not vehicle_inventory_uuids:
+            return {}
+        rows = self._session.execute(
+            select(VehicleInventoryEvent.vehicle_inventory_uuid, func.sum(VehicleInventoryEvent.quantity))
+            .where(
+                VehicleInventoryEvent.vehicle_inventory_uuid
+                == any_of("vehicle_inventory_uuids", vehicle_inventory_uuids),
+                not_deleted(VehicleInventoryEvent.is_deleted),
+            )
+            .group_by(VehicleInventoryEvent.vehicle_inventory_uuid)
+        ).all()
+        result = {uuid: 0.0 for uuid in vehicle_inventory_uuids}
+        for uuid, quantity in rows:
+            result[uuid] = float(quantity or 0)
+        return result
+
+    def prime_quantities(self, inventories: List[VehicleInventory]) -> None:
+        """Compute current_quantity and load material for a page of rows up front.
+
+        VehicleInventoryRead reads `current_quantity` and `material_name` off
+        each row. Primed, the quantity is a dict lookup instead of loading every
+        event the row ever recorded, and the materials come back in one SELECT.
+        The many-to-one `material` then resolves from the identity map.
+        """
+        if not inventories:
+            return
+        quantities = self.current_quantities([i.uuid for i in inventories])
+        for inventory in inventories:
+            inventory.prime_current_quantity(quantities[inventory.uuid])
+        material_uuids = list({i.material_uuid for i in inventories})
+        self._session.query(Material).filter(
+            Material.uuid == any_of("material_uuids", material_uuids)
+        ).all()
+
+    def quantities_for_vehicle(self, vehicle_uuid: str) -> dict[str, float]:
+        """{material_uuid: current_quantity} over a vehicle's live stock rows.
+
+        One statement with current_quantity selected as a column. This is the
+        snapshot a trip takes at start and finish.
+        """
+        rows = self._session.execute(
+            select(VehicleInventory.material_uuid, VehicleInventory.current_quantity)
+            .where(*self._scope_filters([
+                VehicleInventory.vehicle_uuid == vehicle_uuid,
+                VehicleInventory.is_deleted == False,
+            ]))
+        ).all()
+        return {material_uuid: float(quantity or 0) for material_uuid, quantity in rows}
+
+    def find_for_pairs(self, pairs: Iterable[tuple[str, str]]) -> dict[tuple[str, str], VehicleInventory]:
+        """{(vehicle_uuid, material_uuid): live stock row} for many pairs, in
+        one SELECT. Pairs without a row are absent; where a pair has several,
+        the oldest wins."""
+        pairs = list(set(pairs))
+        if not pairs:
+            return {}
+        rows = self._find_all_by_filters(
+            filters=[
+                tuple_(VehicleInventory.vehicle_uuid, VehicleInventory.material_uuid).in_(pairs),
+                VehicleInventory.is_deleted == False,
+            ],
+            ordering=[VehicleInventory.created_at.asc()],
+        )
+        result = {}
+        for row in rows:
+            result.setdefault((row.vehicle_uuid, row.material_uuid), row)
+        return result
@@ -1,8 +1,120 @@
-from app.adapters.repositories._abstract_repo import AbstractRepository
-from models.common import Vendor
+from typing import List
+
+from sqlalchemy import func, select
+
+from app.adapters.repositories._abstract_repo import AbstractRepository, any_of, not_deleted
+from models.common import (
+    CreditNoteItem,
+    DebitNoteItem,
+    Payment,
+    Payout,
+    PurchaseOrder,
+    PurchaseOrderItem,
+    Vendor,
+)
 
 
 class VendorRepository(AbstractRepository[Vendor]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._type = Vendor
+
+    def balances_per_currency(self, vendor_uuids: List[str]) -> dict[str, dict[str, float]]:
+        """{vendor_uuid: {currency: balance}} for many vendors, in ONE query.
+
+        The set-based form of Vendor.balance_per_currency: the vendor's credit
+        notes' amount_due, less what we still owe on their live purchase orders
+        (PurchaseOrder.net_amount_due) and their debit notes' amount_due. Same
+        shape as CustomerRepository.balances_per_currency — one grouped SELECT
+        per term, UNION ALL'd and summed per (vendor, currency).
+        """
+        if not vendor_uuids:
+            return {}
+        page = any_of("vendor_uuids", vendor_uuids)
+
+        def po_term(amount, *joins_and_filters):
+            # vendor/currency come from the purchase order, as the walk has it
+            q = (
+                select(
+                    PurchaseOrder.vendor_uuid.label("vendor_uuid"),
+                    PurchaseOrder.currency.label("currency"),
+                    func.sum(amount).label("amount"),
+                )
+                .select_from(PurchaseOrder)
+                .where(PurchaseOrder.vendor_uuid == page, not_deleted(PurchaseOrder.is_deleted))
+            )
+            for step in joins_and_filters:
+                q = step(q)
+            return q.group_by(PurchaseOrder.vendor_uuid, PurchaseOrder.currency)
+
+        def items(q):
+            return q.join(
+                PurchaseOrderItem, PurchaseOrderItem.purchase_order_uuid == PurchaseOrder.uuid
+            ).where(not_deleted(PurchaseOrderItem.is_deleted))
+
+        def item_debits(q):
+            return q.join(
+                DebitNoteItem, DebitNoteItem.purchase_order_item_uuid == PurchaseOrderItem.uuid
+            ).where(not_deleted(DebitNoteItem.is_deleted))
+
+        def item_credits(q):
+            return q.join(
+                CreditNoteItem, CreditNoteItem.purchase_order_item_uuid == PurchaseOrderItem.uuid
+            ).where(not_deleted(CreditNoteItem.is_deleted))
+
+        # net_amount_due of each live PO counts AGAINST the vendor balance
+        terms = [
+            # - total_price per live item
+            po_term(-(PurchaseOrderItem.quantity * PurchaseOrderItem.price_per_unit), items),
+            # - debit notes, + credit notes raised against the PO's items
+            po_term(-DebitNoteItem.amount, items, item_debits),
+            po_term(CreditNoteItem.amount, items, item_credits),
+            # + payouts already made on the PO
+            po_term(
+                Payout.amount,
+                lambda q: q.join(Payout, Payout.purchase_order_uuid == PurchaseOrder.uuid),
+                lambda q: q.where(not_deleted(Payout.is_deleted)),
+            ),
+        ]
+
+        # the vendor's own notes, at amount_due (amount less what settled it)
+        debit_paid = (
+            select(func.coalesce(func.sum(Payment.amount), 0))
+            .where(Payment.debit_note_item_uuid == DebitNoteItem.uuid, not_deleted(Payment.is_deleted))
+            .correlate(DebitNoteItem)
+            .scalar_subquery()
+        )
+        credit_paid = (
+            select(func.coalesce(func.sum(Payout.amount), 0))
+            .where(Payout.credit_note_item_uuid == CreditNoteItem.uuid, not_deleted(Payout.is_deleted))
+            .correlate(CreditNoteItem)
+            .scalar_subquery()
+        )
+        terms.append(
+            select(
+                DebitNoteItem.vendor_uuid, DebitNoteItem.currency,
+                -func.sum(DebitNoteItem.amount - debit_paid),
+            )
+            .where(DebitNoteItem.vendor_uuid == page, not_deleted(DebitNoteItem.is_deleted))
+            .group_by(DebitNoteItem.vendor_uuid, DebitNoteItem.currency)
+        )
+        terms.append(
+            select(
+                CreditNoteItem.vendor_uuid, CreditNoteItem.currency,
+                func.sum(CreditNoteItem.amount - credit_paid),
+            )
+            .where(CreditNoteItem.vendor_uuid == page, not_deleted(CreditNoteItem.is_deleted))
+            .group_by(CreditNoteItem.vendor_uuid, CreditNoteItem.currency)
+        )
+
+        return self._sum_balance_terms(terms, vendor_uuids)
+
+    def prime_balances(self, vendors: List[Vendor]) -> None:
+        """Compute balance_per_currency for a page of vendors up front.
+
+        VendorRead reads `balance_per_currency` off each row; primed, it is a
+        dict lookup instead of a walk over every purchase order and note.
+        """
+        balances = self.balances_per_currency([v.uuid for v in vendors])
+        for vendor in vendors:
+            vendor.prime_balance_per_currency(balances[vendor.uuid])
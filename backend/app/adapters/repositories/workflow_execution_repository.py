@@ -1,7 +1,57 @@
-from app.adapters.repositories._abstract_repo import AbstractRepository
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select, update
+
+from app.adapters.repositories._abstract_repo import AbstractRepository, not_deleted
+from app.dto.workflow_execution import WorkflowStatus
 from models.common import WorkflowExecution
 
+# statuses a workflow or task execution never leaves
+TERMINAL_STATUSES = (
+    WorkflowStatus.COMPLETED.value, WorkflowStatus.CANCELLED.value, WorkflowStatus.FAILED.value,
+)
+
+
 class WorkflowExecutionRepository(AbstractRepository[WorkflowExecution]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._type = WorkflowExecution
+
+    def live_uuids(
+            self,
+            workflow_execution_uuids: Optional[List[str]] = None,
+            started_before: Optional[datetime] = None,
+    ) -> List[str]:
+        """The uuids of live executions in scope, among `workflow_execution_uuids`
+        or, for stale ones, every execution still running that started before
+        `started_before`."""
+        filters = [not_deleted(WorkflowExecution.is_deleted)]
+        if workflow_execution_uuids is not None:
+            if not workflow_execution_uuids:
+                return []
+            filters.append(WorkflowExecution.uuid.in_(set(workflow_execution_uuids)))
+        if started_before is not None:
+            filters.append(WorkflowExecution.status.notin_(TERMINAL_STATUSES))
+            filters.append(WorkflowExecution.start_time < started_before)
+        return list(self._session.execute(
+            select(WorkflowExecution.uuid).where(*self._scope_filters(filters))
+        ).scalars())
+
+    def cancel(self, workflow_execution_uuids: List[str], ended_at: datetime, error_message: str) -> List[str]:
+        """Move the listed executions that are not yet terminal to cancelled in
+        one UPDATE, and return the uuids it moved. Their trips and task
+        executions are left to TripRepository.cancel_for_workflows and
+        TaskExecutionRepository.cancel_for_workflows."""
+        if not workflow_execution_uuids:
+            return []
+        rows = self._session.execute(
+            update(WorkflowExecution)
+            .where(*self._scope_filters([
+                WorkflowExecution.uuid.in_(set(workflow_execution_uuids)),
+                WorkflowExecution.status.notin_(TERMINAL_STATUSES),
+            ]))
+            .values(status=WorkflowStatus.CANCELLED.value, end_time=ended_at, error_message=error_message)
+            .returning(WorkflowExecution.uuid)
+        ).scalars()
+        return list(rows)
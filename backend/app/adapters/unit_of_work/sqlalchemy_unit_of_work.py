@@ -16,6 +16,7 @@ from app.adapters.repositories.purchase_order_repository import PurchaseOrderRep
 from app.adapters.repositories.purchase_order_item_repository import PurchaseOrderItemRepository
 from app.adapters.repositories.financial_account_repository import FinancialAccountRepository
 from app.adapters.repositories.exchange_rate_repository import ExchangeRateRepository
+from app.adapters.repositories.job_repository import JobRepository
 from app.adapters.repositories.warehouse_repository import WarehouseRepository
 from app.adapters.repositories.transaction_repository import TransactionRepository
 from app.adapters.repositories.customer_order_repository import CustomerOrderRepository
@@ -115,6 +116,7 @@ class SqlAlchemyUnitOfWork(AbstractUnitOfWork):
         self.trip_stop_repository = TripStopRepository(session=self.session, account_uuid=self.account_uuid)
         self.vehicle_inventory_repository = VehicleInventoryRepository(session=self.session, account_uuid=self.account_uuid)
         self.vehicle_inventory_event_repository = VehicleInventoryEventRepository(session=self.session, account_uuid=self.account_uuid)
+        self.job_repository = JobRepository(session=self.session, account_uuid=self.account_uuid)
 
         return self
 
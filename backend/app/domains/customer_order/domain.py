@@ -1,7 +1,12 @@
 from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy.orm.attributes import set_committed_value
+
 from app.dto.customer_order import CustomerOrderCreate,CustomerOrderRead,CustomerOrderUpdate
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 from models.common import CustomerOrder as CustomerOrderModel
+from models.common import CustomerOrderItem as CustomerOrderItemModel, Invoice as InvoiceModel, InvoiceItem as InvoiceItemModel
 from app.entrypoint.routes.common.errors import NotFoundError
 from app.dto.customer_order import CustomerOrderWithItemsAndInvoiceCreate
 from app.domains.customer_order_item.domain import CustomerOrderItemDomain
@@ -17,6 +22,7 @@ from app.dto.customer_order_item import CustomerOrderItemBulkDelete
 from app.dto.invoice_item import InvoiceItemBulkDelete
 from app.entrypoint.routes.common.errors import BadRequestError
 from app.dto.customer_order import CustomerOrderCheckoutCreate
+from app.dto.customer_order import CustomerOrderBulkVoid, CustomerOrderBulkVoidRead
 
 
 class CustomerOrderDomain:
@@ -24,31 +30,35 @@ class CustomerOrderDomain:
     @staticmethod
     def create_order_checkout(uow: SqlAlchemyUnitOfWork, payload: CustomerOrderCheckoutCreate) -> CustomerOrderWithItemsAndInvoiceRead:
         """Create order + items + invoice, then optionally fulfill all items and
-        record a full payment against the invoice — all in one transaction."""
+        record a full payment against the invoice — all in one transaction.
+
+        The driver app's checkout, so the hottest write path there is. The
+        order graph is built in memory (_create_order_graph) and stays the
+        session's answer for the rest of the request: the amount due and the
+        response are computed off it instead of re-reading the invoice and the
+        order after every step."""
         from app.dto.customer_order_item import CustomerOrderItemBulkFulfill, FulfillItem
         from app.domains.payment.domain import PaymentDomain
         from app.dto.payment import PaymentCreate
+        from models.common import Payment as PaymentModel
 
-        full = CustomerOrderDomain.create_customer_order_with_items_and_invoice(
-            uow=uow, payload=payload.to_base_create()
-        )
-        invoice = full.invoices[0]
+        order = CustomerOrderDomain._create_order_graph(uow=uow, payload=payload.to_base_create())
+        invoice = order.invoices[0]
 
         if payload.fulfill:
             CustomerOrderItemDomain.fulfill_items(
                 uow=uow,
                 payload=CustomerOrderItemBulkFulfill(
                     items=[FulfillItem(customer_order_item_uuid=item.uuid)
-                           for item in full.customer_order.customer_order_items],
+                           for item in order.customer_order_items],
                     trip_stop_uuid=payload.trip_stop_uuid,
                 ),
             )
 
         if payload.pay:
-            inv = uow.invoice_repository.find_one(uuid=invoice.uuid, is_deleted=False)
-            amount = inv.net_amount_due if inv else 0
+            amount = invoice.net_amount_due
             if amount and amount > 0:
-                PaymentDomain.create_payment(
+                payment = PaymentDomain.create_payment(
                     uow=uow,
                     payload=PaymentCreate(
                         created_by_uuid=payload.created_by_uuid,
@@ -60,63 +70,68 @@ class CustomerOrderDomain:
                         trip_stop_uuid=payload.trip_stop_uuid,
                     ),
                 )
+                # the only payment a new invoice can have; the identity map
+                # already holds it
+                set_committed_value(invoice, "payments", [uow.session.get(PaymentModel, payment.uuid)])
 
-        order = uow.customer_order_repository.find_one(uuid=full.customer_order.uuid, is_deleted=False)
         return CustomerOrderWithItemsAndInvoiceRead.from_customer_order_model(order)
 
     @staticmethod
     def create_customer_order_with_items_and_invoice(uow: SqlAlchemyUnitOfWork,payload:CustomerOrderWithItemsAndInvoiceCreate) -> CustomerOrderRead:
+        order = CustomerOrderDomain._create_order_graph(uow=uow, payload=payload)
+        return CustomerOrderWithItemsAndInvoiceRead.from_customer_order_model(order)
 
-        # Create the customer order
-
-        customer_order_create = payload.to_customer_order_create()
-        customer_order_read = CustomerOrderDomain.create_customer_order(uow=uow, payload=customer_order_create)
-
-        customer_order_items_bulk_create = payload.to_customer_order_item_bulk_create(
-            customer_order_uuid=customer_order_read.uuid
-        )
-        customer_order_items_read = CustomerOrderItemDomain.create_items(
-            uow=uow,
-            payload=customer_order_items_bulk_create
-        )
-        customer_order_read.customer_order_items = customer_order_items_read.items
-
-        # Create the invoice
-        invoice_create = payload.to_invoice_create(
-            customer_order_uuid=customer_order_read.uuid,
-        )
-        invoice_read = InvoiceDomain.create_invoice(uow=uow,payload=invoice_create)
-        invoice_item_create_list = []
-        for coi, payload_item in zip(customer_order_items_read.items,payload.items):
-            assert coi.material_uuid == payload_item.material_uuid
-            invoice_item_create = InvoiceItemCreate(
+    @staticmethod
+    def _create_order_graph(uow: SqlAlchemyUnitOfWork, payload: CustomerOrderWithItemsAndInvoiceCreate) -> CustomerOrderModel:
+        """Insert an order with its items, invoice and invoice items, and hand
+        back the order with that whole graph loaded.
+
+        The materials resolve through the material cache (at most one SELECT)
+        and each table gets one INSERT.
+        The new rows' relationships are then set as already loaded: a fresh
+        order has exactly these items and this invoice, and the invoice has
+        these invoice items and no payments or notes. Its totals and the read
+        DTOs are then worked out in memory, where they used to lazy-load every
+        collection and re-fetch the invoice and the order to get them.
+        """
+        materials = uow.material_repository.get_many(item.material_uuid for item in payload.items)
+        for item in payload.items:
+            if item.material_uuid not in materials:
+                raise NotFoundError("Material not found")
+
+        order = CustomerOrderModel(uuid=str(uuid4()), **payload.to_customer_order_create().model_dump(mode="json"))
+        items = []
+        for item_create in payload.to_customer_order_item_bulk_create(customer_order_uuid=order.uuid).items:
+            item = CustomerOrderItemModel(uuid=str(uuid4()), **item_create.model_dump(mode="json"))
+            item.unit = materials[item.material_uuid].measure_unit
+            items.append(item)
+
+        invoice = InvoiceModel(uuid=str(uuid4()), **payload.to_invoice_create(customer_order_uuid=order.uuid).model_dump())
+        invoice.currency = payload.currency.value
+        invoice_items = [
+            InvoiceItemModel(
                 created_by_uuid=payload.created_by_uuid,
-                invoice_uuid=invoice_read.uuid,
-                customer_order_item_uuid=coi.uuid,
+                invoice_uuid=invoice.uuid,
+                customer_order_item_uuid=item.uuid,
                 price_per_unit=payload_item.price_per_unit,
+                unit=item.unit,
             )
-            invoice_item_create_list.append(invoice_item_create)
-        invoice_items_create = InvoiceItemBulkCreate(items=invoice_item_create_list)
-        invoice_items_read = InvoiceItemDomain.create_items(
-            uow=uow,
-            payload=invoice_items_create
-        )
-        invoice_read.invoice_items = invoice_items_read.items
-
-        # refresh invoice read:
-        invoice = uow.invoice_repository.find_one(uuid=invoice_read.uuid,is_deleted=False)
-        if not invoice:
-            raise NotFoundError("Invoice not found")
-        invoice_read = InvoiceRead.from_orm(invoice)
-
-        # refresh customer order read:
-        customer_order = uow.customer_order_repository.find_one(uuid=customer_order_read.uuid,is_deleted=False)
-        customer_order_read = CustomerOrderRead.from_orm(customer_order)
-        result = CustomerOrderWithItemsAndInvoiceRead(
-            customer_order=customer_order_read,
-            invoices=[invoice_read],
-        )
-        return result
+            for item, payload_item in zip(items, payload.items)
+        ]
+
+        uow.customer_order_repository.save(model=order, commit=False)
+        uow.customer_order_item_repository.batch_save(models=items, commit=False)
+        uow.invoice_repository.save(model=invoice, commit=False)
+        uow.invoice_item_repository.batch_save(models=invoice_items, commit=False)
+
+        set_committed_value(order, "customer_order_items", items)
+        set_committed_value(order, "invoices", [invoice])
+        set_committed_value(invoice, "invoice_items", invoice_items)
+        set_committed_value(invoice, "payments", [])
+        for invoice_item in invoice_items:
+            set_committed_value(invoice_item, "debit_note_items", [])
+            set_committed_value(invoice_item, "credit_note_items", [])
+        return order
 
     @staticmethod
     def delete_customer_order_with_items_and_invoice(uuid:str, uow: SqlAlchemyUnitOfWork) -> CustomerOrderRead:
@@ -187,58 +202,31 @@ class CustomerOrderDomain:
         quantities are computed from non-deleted events). Unlike the
         validated delete, this intentionally works on paid/fulfilled orders:
         it exists to undo mistakes (e.g. an erroneous trip-stop checkout)."""
-        from models.common import (
-            InventoryEvent as InventoryEventModel,
-            VehicleInventoryEvent as VehicleInventoryEventModel,
-        )
-
         order = uow.customer_order_repository.find_one(uuid=uuid, is_deleted=False)
         if not order:
             raise NotFoundError("CustomerOrder not found")
 
-        item_uuids = []
-        for item in order.customer_order_items:
-            if item.is_deleted:
-                continue
-            item.is_deleted = True
-            item_uuids.append(item.uuid)
-            uow.customer_order_item_repository.save(model=item, commit=False)
-
-        for invoice in order.invoices:
-            if invoice.is_deleted:
-                continue
-            for payment in invoice.payments:
-                if not payment.is_deleted:
-                    payment.is_deleted = True
-                    uow.payment_repository.save(model=payment, commit=False)
-            for inv_item in invoice.invoice_items:
-                if not inv_item.is_deleted:
-                    inv_item.is_deleted = True
-                    uow.invoice_item_repository.save(model=inv_item, commit=False)
-            invoice.is_deleted = True
-            uow.invoice_repository.save(model=invoice, commit=False)
-
-        if item_uuids:
-            # warehouse-side deductions
-            for ev in uow.session.query(InventoryEventModel).filter(
-                InventoryEventModel.customer_order_item_uuid.in_(item_uuids),
-                InventoryEventModel.account_uuid == uow.account_uuid,
-                InventoryEventModel.is_deleted.is_(False),
-            ):
-                ev.is_deleted = True
-            # vehicle-side sale events (trip checkouts)
-            for ev in uow.session.query(VehicleInventoryEventModel).filter(
-                VehicleInventoryEventModel.customer_order_item_uuid.in_(item_uuids),
-                VehicleInventoryEventModel.account_uuid == uow.account_uuid,
-                VehicleInventoryEventModel.is_deleted.is_(False),
-            ):
-                ev.is_deleted = True
-
-        order.is_deleted = True
-        uow.customer_order_repository.save(model=order, commit=False)
+        uow.customer_order_repository.void([order.uuid])
         result = CustomerOrderRead.from_orm(order)
         return result
 
+    @staticmethod
+    def void_customer_orders(uow: SqlAlchemyUnitOfWork, payload: CustomerOrderBulkVoid) -> CustomerOrderBulkVoidRead:
+        """delete_customer_order for many orders at once: the listed ones, or
+        every live order taken at a stop of `trip_uuid` (undoing a whole
+        mistaken trip). The cascade is the same set-based UPDATEs whatever the
+        count, so nothing is loaded beyond the orders' uuids."""
+        if payload.trip_uuid:
+            uuids = uow.customer_order_repository.live_uuids_for_trip(payload.trip_uuid)
+        else:
+            uuids = uow.customer_order_repository.live_uuids(payload.uuids)
+            missing = set(payload.uuids) - set(uuids)
+            if missing:
+                raise NotFoundError(f"CustomerOrder not found: {', '.join(sorted(missing))}")
+
+        uow.customer_order_repository.void(uuids)
+        return CustomerOrderBulkVoidRead(uuids=sorted(uuids))
+
     @staticmethod
     def validate_delete_customer_order(
             customer_order: CustomerOrderModel
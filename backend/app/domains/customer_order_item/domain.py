@@ -4,6 +4,7 @@ from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWo
 from app.dto.customer_order_item import CustomerOrderItemBulkCreate, CustomerOrderItemBulkRead, \
     CustomerOrderItemRead
 from models.common import CustomerOrderItem as CustomerOrderItemModel
+from models.common import InventoryEvent as InventoryEventModel
 
 from app.entrypoint.routes.common.errors import NotFoundError
 
@@ -31,10 +32,11 @@ class CustomerOrderItemDomain:
         payload: CustomerOrderItemBulkCreate
     ) -> CustomerOrderItemBulkRead:
         items = []
+        materials = uow.material_repository.get_many(item_pl.material_uuid for item_pl in payload.items)
         for item_pl in payload.items:
             data = item_pl.model_dump(mode='json')
             m = CustomerOrderItemModel(**data)
-            material = uow.material_repository.find_one(uuid=data['material_uuid'],is_deleted=False)
+            material = materials.get(data['material_uuid'])
             if not material:
                 raise NotFoundError("Material not found")
             m.unit = material.measure_unit
@@ -48,7 +50,14 @@ class CustomerOrderItemDomain:
         uow: SqlAlchemyUnitOfWork,
         payload: CustomerOrderItemBulkFulfill
     ) -> CustomerOrderItemBulkRead:
-        items = []
+        """Fulfil a basket of items in a fixed number of statements.
+
+        The items (with their material, order, stop and trip) load in one
+        SELECT, FIFO allocation for every material is one more
+        (InventoryDomain.allocate_sales), and the warehouse and vehicle sale
+        events are written as batched INSERTs. The basket's size only changes
+        how many rows those statements carry.
+        """
         # current stop where fulfillment happens (e.g. a previously-created order
         # handed off during this trip); overrides the order's own stop for vehicle
         # attribution so the sale lands on the trip actually delivering it.
@@ -57,64 +66,62 @@ class CustomerOrderItemDomain:
             override_stop = uow.trip_stop_repository.find_one(uuid=payload.trip_stop_uuid)
             if not override_stop:
                 raise NotFoundError("TripStop not found")
+
+        found = uow.customer_order_item_repository.find_for_fulfillment(
+            [item.customer_order_item_uuid for item in payload.items]
+        )
+        items, fulfilled_at = [], datetime.now()
         for item in payload.items:
-            customer_order_item = uow.customer_order_item_repository.find_one(uuid=item.customer_order_item_uuid, is_deleted=False)
+            customer_order_item = found.get(item.customer_order_item_uuid)
             if not customer_order_item:
                 raise NotFoundError("CustomerOrderItem not found")
+            # also catches the same item listed twice in one basket
             if customer_order_item.is_fulfilled:
                 raise BadRequestError("CustomerOrderItem already fulfilled")
             customer_order_item.is_fulfilled = True
-            customer_order_item.fulfilled_at = datetime.now()
-            # create inventory event
-
-            if item.inventory_uuid:
-                inventories = [InventoryFIFOOutput(
-                    inventory_uuid=item.inventory_uuid,
-                    quantity=abs(customer_order_item.quantity),
-                    material_uuid=customer_order_item.material_uuid
-                )]
-            else:
-                inventories: list[InventoryFIFOOutput] = InventoryDomain.get_fifo_inventories_for_material(
-                    uow=uow,
-                    material_uuid=customer_order_item.material_uuid,
-                    quantity=abs(customer_order_item.quantity),
-                    # A sale may overdraw. The goods left the van whether or not
-                    # the books had caught up, and refusing the fulfilment would
-                    # lose the record of something that already happened — the
-                    # negative balance is the signal to go and reconcile.
-                    # Naming an explicit lot (the branch above) has never
-                    # checked availability either, so this makes the automatic
-                    # path behave like the manual one.
-                    allow_negative=True,
-                )
+            customer_order_item.fulfilled_at = fulfilled_at
+            items.append(customer_order_item)
 
+        # A sale may overdraw. The goods left the van whether or not the books
+        # had caught up, and refusing the fulfilment would lose the record of
+        # something that already happened — the negative balance is the signal
+        # to go and reconcile. Naming an explicit lot has never checked
+        # availability either.
+        allocations = InventoryDomain.allocate_sales(
+            uow=uow,
+            requests=[
+                (customer_order_item.material_uuid, abs(customer_order_item.quantity), item.inventory_uuid)
+                for item, customer_order_item in zip(payload.items, items)
+            ],
+        )
+        events, vehicle_sales = [], []
+        for customer_order_item, inventories in zip(items, allocations):
             for inv in inventories:
-                InventoryEventDomain.create_inventory_event(
-                    uow=uow,
-                    payload=InventoryEventCreate(
-                        quantity=-(abs(inv.quantity)),
-                        event_type=InventoryEventType.SALE,
-                        inventory_uuid=inv.inventory_uuid,
-                        customer_order_item_uuid=customer_order_item.uuid,
-                        affect_original=False
-                    )
-                )
+                events.append(InventoryEventModel(
+                    quantity=-(abs(inv.quantity)),
+                    event_type=InventoryEventType.SALE.value,
+                    inventory_uuid=inv.inventory_uuid,
+                    material_uuid=inv.material_uuid,
+                    customer_order_item_uuid=customer_order_item.uuid,
+                    affect_original=False,
+                ))
 
             # If this order is being delivered on a trip, also decrement the
             # vehicle's inventory (independent ledger; may go negative).
             order = customer_order_item.customer_order
             trip_stop = override_stop or (order.trip_stop if order else None)
             if trip_stop is not None and trip_stop.trip is not None:
-                VehicleInventoryDomain.record_trip_sale(
-                    uow=uow,
+                vehicle_sales.append(dict(
                     vehicle_uuid=trip_stop.trip.vehicle_uuid,
                     material_uuid=customer_order_item.material_uuid,
                     quantity=abs(customer_order_item.quantity),
                     customer_order_item_uuid=customer_order_item.uuid,
                     created_by_uuid=customer_order_item.created_by_uuid,
                     trip_stop_uuid=trip_stop.uuid,
-                )
-            items.append(customer_order_item)
+                ))
+
+        uow.inventory_event_repository.batch_save(models=events, commit=False)
+        VehicleInventoryDomain.record_trip_sales(uow=uow, sales=vehicle_sales)
         uow.customer_order_item_repository.batch_save(models=items, commit=False)
         bulk_read = CustomerOrderItemBulkRead(items=[CustomerOrderItemRead.from_orm(m) for m in items])
         return bulk_read
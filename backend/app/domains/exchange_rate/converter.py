@@ -10,9 +10,10 @@ the rule that math must obey is the same one costing already follows:
     day, so an exact-day lookup would miss constantly. `ExchangeRateDomain.closest`
     already answers exactly this.
   - a genuine hole (no rate within a week, and the day young enough that the
-    source could still reach it) triggers ONE backfill per converter instance,
-    always the full year, so a single pull fixes every gap this request and every
-    later one will hit.
+    source could still reach it) queues ONE backfill job per converter instance,
+    deduped across requests and always the full year, so a single pull fixes
+    every gap later requests would hit. The scrape runs in the jobs worker, never
+    on the request thread: this request answers with the rate it already has.
   - when there is no usable rate at all, or the currency is one this system does
     not convert, the answer is None — "unknown", never a fabricated number and
     never silently zero. The caller decides what to do with an unknown; it must
@@ -38,7 +39,7 @@ from typing import Optional
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 from app.domains.exchange_rate.domain import ExchangeRateDomain
 from app.dto.common_enums import Currency
-from app.dto.exchange_rate import BackfillRange
+from app.dto.exchange_rate import BackfillRange, ExchangeRatePullParams
 
 
 class CurrencyConverter:
@@ -46,7 +47,7 @@ class CurrencyConverter:
 
     One instance per request: the rate cache and the backfill-once latch both
     live on it, so a dashboard that converts thousands of orders across a window
-    does at most one rate lookup per distinct day and at most one backfill pull.
+    does at most one rate lookup per distinct day and queues at most one backfill.
     """
 
     # A rate within this many days of the amount is "the rate in effect"; the
@@ -62,14 +63,16 @@ class CurrencyConverter:
         self.target = target
         self._rates: dict = {}          # day -> USD->SYP rate, or None
         self._backfill_attempted = False
-        # observability for the caller: did we have to pull, and did any amount
-        # come back unconvertible
-        self.rates_ingested = False
+        # a backfill job was queued for a rate gap: the caller commits so the
+        # job row outlives the request. Nothing was ingested yet, so the amounts
+        # that missed a rate still come back None.
+        self.backfill_queued = False
 
     def _usd_syp_rate_for_day(self, day: date_type) -> Optional[float]:
-        """USD→SYP rate for one market day, cached, with a single backfill on a gap.
+        """USD→SYP rate for one market day, cached; a gap queues one backfill.
 
-        Never raises: a dashboard tile must not 500 because sp-today is down.
+        Never waits on sp-today: a dashboard tile must not stall (or 500)
+        because the source is slow or down.
         """
         if day in self._rates:
             return self._rates[day]
@@ -84,21 +87,10 @@ class CurrencyConverter:
         source_can_reach = (date_type.today() - day).days <= self.RATE_SOURCE_REACH_DAYS
         if not gap_is_fine and source_can_reach and not self._backfill_attempted:
             self._backfill_attempted = True
-            try:
-                ExchangeRateDomain.backfill(uow=self.uow, backfill_range=BackfillRange.ONE_YEAR)
-                self.rates_ingested = True
-                row = (
-                    ExchangeRateDomain.closest(
-                        uow=self.uow,
-                        from_currency=Currency.USD,
-                        to_currency=Currency.SYP,
-                        on=day,
-                    )
-                    or row
-                )
-            except Exception:
-                # unreachable source is a missing rate, not a crash
-                pass
+            ExchangeRateDomain.enqueue_backfill(
+                self.uow, ExchangeRatePullParams(range=BackfillRange.ONE_YEAR)
+            )
+            self.backfill_queued = True
 
         rate = row.rate if row else None
         self._rates[day] = rate
@@ -3,16 +3,19 @@ from typing import Optional, Tuple
 
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 from app.domains.exchange_rate import sp_today
+from app.domains.job.domain import JobDomain
 from app.dto.common_enums import Currency
 from app.dto.exchange_rate import (
     BackfillRange,
     ExchangeRateCreate,
+    ExchangeRatePullParams,
     ExchangeRatePullResult,
     ExchangeRateRead,
     ExchangeRateSource,
 )
+from app.dto.job import JobKind
 from app.entrypoint.routes.common.errors import BadRequestError
-from models.common import ExchangeRate as ExchangeRateModel
+from models.common import ExchangeRate as ExchangeRateModel, Job as JobModel
 
 # sp-today publishes the Syrian market rate for the dollar; that is the only
 # pair we can pull today. Everything else has to be entered by hand.
@@ -244,6 +247,32 @@ class ExchangeRateDomain:
             uow, quotes, created_by_uuid, range_used=backfill_range
         )
 
+    @staticmethod
+    def enqueue_backfill(
+        uow: SqlAlchemyUnitOfWork,
+        params: ExchangeRatePullParams,
+        created_by_uuid: Optional[str] = None,
+    ) -> JobModel:
+        """Queue `backfill` for the jobs worker instead of scraping inline.
+
+        Deduped on everything that shapes the pull: the same backfill asked
+        for again gets the live job back, while a different pair, range or
+        start/end window is queued on its own rather than folded into an
+        unrelated job whose parameters it never had. The caller commits.
+        """
+        dedupe_key = (
+            f"{JobKind.EXCHANGE_RATE_BACKFILL.value}:"
+            f"{params.from_currency.value}:{params.to_currency.value}:"
+            f"{params.range.value}:{params.start or ''}:{params.end or ''}"
+        )
+        return JobDomain.enqueue(
+            uow,
+            kind=JobKind.EXCHANGE_RATE_BACKFILL,
+            payload=params.model_dump(mode='json'),
+            dedupe_key=dedupe_key,
+            created_by_uuid=created_by_uuid,
+        )
+
     @staticmethod
     def delete(uow: SqlAlchemyUnitOfWork, uuid: str) -> ExchangeRateRead:
         row = uow.exchange_rate_repository.find_one(uuid=uuid, is_deleted=False)
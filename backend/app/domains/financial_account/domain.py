@@ -1,13 +1,32 @@
 
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
 from app.entrypoint.routes.common.errors import NotFoundError
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 
-from models.common import FinancialAccount
+from models.common import MONEY_TOLERANCE, FinancialAccount
 from app.entrypoint.routes.common.errors import BadRequestError
 
 from app.dto.financial_account import FinancialAccountUpdate, FinancialAccountRead
 
 
+# A snapshot is cut this far behind the clock. A movement is stamped when its
+# row is built but only visible once its request commits; cutting right at `now`
+# could miss one still in flight, and it would then fall before the cutoff for
+# good. No request holds a transaction open for anywhere near this long.
+SNAPSHOT_SETTLE = timedelta(hours=1)
+# accounts walked per batch by the parity check
+PARITY_BATCH = 200
+
+
+class BalanceMismatch(NamedTuple):
+    financial_account_uuid: str
+    account_name: str
+    ledger: float
+    walked: float
+
+
 class FinancialAccountDomain:
 
     UPDATE_SENSITIVE_FIELDS = [
@@ -71,6 +90,7 @@ class FinancialAccountDomain:
             setattr(acc, field, val)
 
         uow.financial_account_repository.save(model=acc, commit=False)
+        uow.financial_account_repository.prime_balances([acc])
         return FinancialAccountRead.from_orm(acc)
     @staticmethod
     def delete_financial_account(uow:SqlAlchemyUnitOfWork, uuid: str) -> FinancialAccountRead:
@@ -86,6 +106,7 @@ class FinancialAccountDomain:
 
         acc.is_deleted = True
         uow.financial_account_repository.save(model=acc, commit=False)
+        uow.financial_account_repository.prime_balances([acc])
         return FinancialAccountRead.from_orm(acc)
 
     @staticmethod
@@ -108,3 +129,41 @@ class FinancialAccountDomain:
             return False
 
         return True
+
+    @staticmethod
+    def take_snapshots(uow: SqlAlchemyUnitOfWork, now: Optional[datetime] = None) -> int:
+        """Checkpoint every account's balance, SNAPSHOT_SETTLE behind `now`.
+
+        The cutoff is floored to the hour so a re-run within the hour lands on
+        the same cutoff and writes nothing. The caller commits.
+        """
+        cutoff = ((now or datetime.utcnow()) - SNAPSHOT_SETTLE).replace(minute=0, second=0, microsecond=0)
+        return uow.financial_account_repository.write_snapshots(cutoff=cutoff)
+
+    @staticmethod
+    def rebuild_snapshots(uow: SqlAlchemyUnitOfWork, now: Optional[datetime] = None) -> int:
+        """Throw every snapshot away and recompute from the movements alone."""
+        uow.financial_account_repository.drop_snapshots()
+        return FinancialAccountDomain.take_snapshots(uow, now=now)
+
+    @staticmethod
+    def balance_mismatches(uow: SqlAlchemyUnitOfWork) -> list[BalanceMismatch]:
+        """Accounts whose snapshot-backed balance disagrees with the walk.
+
+        The walk (FinancialAccount._calculate_balance) is the definition; the
+        ledger only ever answers faster. Agreement is to within MONEY_TOLERANCE
+        — the two add the same floats in a different order.
+        """
+        repo = uow.financial_account_repository
+        mismatches = []
+        accounts = repo._find_all_by_filters(filters=[], ordering=[FinancialAccount.uuid])
+        for start in range(0, len(accounts), PARITY_BATCH):
+            batch = accounts[start:start + PARITY_BATCH]
+            ledger = repo.balances([a.uuid for a in batch])
+            for account in batch:
+                walked = account._calculate_balance()
+                if abs(ledger[account.uuid] - walked) > MONEY_TOLERANCE:
+                    mismatches.append(BalanceMismatch(
+                        account.uuid, account.account_name, ledger[account.uuid], walked,
+                    ))
+        return mismatches
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 
 from app.dto.common_enums import Currency
 from app.dto.inventory import InventoryRead
@@ -16,7 +17,7 @@ class InventoryDomain:
     @staticmethod
     def create_inventory(uow:SqlAlchemyUnitOfWork, payload: InventoryCreate) -> InventoryRead:
         inventory = InventoryModel(**payload.model_dump())
-        material = uow.material_repository.find_one(uuid=payload.material_uuid, is_deleted=False)
+        material = uow.material_repository.get(payload.material_uuid)
         if not material:
             raise NotFoundError('Material not found')
         inventory.unit = material.measure_unit
@@ -59,8 +60,8 @@ class InventoryDomain:
 
         `currency` is the currency every cost in this context is reported in;
         `rates` caches one USD→SYP rate per event day; `backfill_attempted`
-        limits the on-the-spot sp-today pull to one per request, and
-        `rates_ingested` tells the owning route it has new rate rows worth
+        limits the queued sp-today backfill to one per request, and
+        `backfill_queued` tells the owning route it has a job row worth
         committing.
         """
         return {
@@ -70,7 +71,7 @@ class InventoryDomain:
             "currency": Currency(currency),
             "rates": {},
             "backfill_attempted": False,
-            "rates_ingested": False,
+            "backfill_queued": False,
         }
 
     @staticmethod
@@ -251,16 +252,17 @@ class InventoryDomain:
         The nearest recorded day answers, and that is usually the right
         answer — the source publishes nothing on idle market days. Only a
         genuine GAP (no rate within RATE_GAP_TOLERANCE_DAYS, and the day young
-        enough for the source to reach) triggers an on-the-spot pull: one per
-        request, and always the full year, so one pull fixes every gap this
-        request — and every later one — will hit. None only when the table has
-        no usable rate at all, and the caller treats that cost as unknown
-        rather than invent a conversion. Never raises: a cost display must not
-        500 because sp-today is unreachable.
+        enough for the source to reach) queues a backfill for the jobs worker:
+        one per request, deduped across requests, and always the full year, so
+        one pull fixes every gap later requests would hit. The year-long scrape
+        never runs on the request thread; this request answers with the nearest
+        rate it already has. None only when the table has no usable rate at
+        all, and the caller treats that cost as unknown rather than invent a
+        conversion.
         """
         from datetime import date as date_type
         from app.domains.exchange_rate.domain import ExchangeRateDomain
-        from app.dto.exchange_rate import BackfillRange
+        from app.dto.exchange_rate import BackfillRange, ExchangeRatePullParams
 
         if day in ctx["rates"]:
             return ctx["rates"][day]
@@ -277,16 +279,10 @@ class InventoryDomain:
         )
         if not gap_is_fine and source_can_reach and not ctx["backfill_attempted"]:
             ctx["backfill_attempted"] = True
-            try:
-                ExchangeRateDomain.backfill(
-                    uow=uow, backfill_range=BackfillRange.ONE_YEAR
-                )
-                ctx["rates_ingested"] = True
-                row = ExchangeRateDomain.closest(
-                    uow=uow, from_currency=Currency.USD, to_currency=Currency.SYP, on=day
-                ) or row
-            except Exception:
-                pass
+            ExchangeRateDomain.enqueue_backfill(
+                uow, ExchangeRatePullParams(range=BackfillRange.ONE_YEAR)
+            )
+            ctx["backfill_queued"] = True
 
         rate = row.rate if row else None
         ctx["rates"][day] = rate
@@ -363,6 +359,83 @@ class InventoryDomain:
 
         return result
 
+    @staticmethod
+    def allocate_sales(
+        uow: SqlAlchemyUnitOfWork,
+        requests: list[tuple[str, float, Optional[str]]],
+    ) -> list[list[InventoryFIFOOutput]]:
+        """get_fifo_inventories_for_material(allow_negative=True) for a whole
+        basket at once.
+
+        `requests` are (material_uuid, quantity, inventory_uuid) in the order
+        they are fulfilled; an inventory_uuid names the lot explicitly and skips
+        FIFO, as fulfilment always has. The answer is one list per request,
+        each summing to its quantity.
+
+        The lots of every material come back in one statement
+        (lots_for_allocation) and are drawn down in memory, so a later request
+        for the same material sees what the earlier ones took, exactly as it
+        did when each request flushed its events before the next FIFO query.
+        Overdrafts follow _absorb_shortfall: onto the lot FIFO stopped on, else
+        the material's newest lot.
+        """
+        fifo_materials = [material for material, _, lot in requests if not lot]
+        named_lots = [lot for _, _, lot in requests if lot]
+        rows = uow.inventory_repository.lots_for_allocation(fifo_materials, named_lots)
+
+        available = {row.uuid: row.current_quantity for row in rows}
+        lot_material = {row.uuid: row.material_uuid for row in rows}
+        lots_by_material: dict[str, list[str]] = {}
+        for row in rows:
+            lots_by_material.setdefault(row.material_uuid, []).append(row.uuid)
+
+        allocations = []
+        for material_uuid, quantity, lot_uuid in requests:
+            if lot_uuid:
+                if lot_uuid not in lot_material:
+                    raise NotFoundError("Inventory not found")
+                available[lot_uuid] -= quantity
+                allocations.append([InventoryFIFOOutput(
+                    inventory_uuid=lot_uuid, material_uuid=lot_material[lot_uuid], quantity=quantity,
+                )])
+                continue
+
+            result, remaining, last_drawn = [], quantity, None
+            for uuid in lots_by_material.get(material_uuid, []):
+                if remaining <= 0:
+                    break
+                if available[uuid] <= 0:
+                    continue
+                drawn = min(available[uuid], remaining)
+                result.append(InventoryFIFOOutput(inventory_uuid=uuid, material_uuid=material_uuid, quantity=drawn))
+                available[uuid] -= drawn
+                remaining -= drawn
+                last_drawn = uuid
+
+            if remaining > 0:
+                lots = lots_by_material.get(material_uuid)
+                target = last_drawn or (lots[-1] if lots else None)
+                if target is None:
+                    raise InventoryDomain._no_lot_to_sell_from(material_uuid)
+                available[target] -= remaining
+                drawn = next((dto for dto in result if dto.inventory_uuid == target), None)
+                if drawn:
+                    drawn.quantity += remaining
+                else:
+                    result.append(InventoryFIFOOutput(
+                        inventory_uuid=target, material_uuid=material_uuid, quantity=remaining,
+                    ))
+            allocations.append(result)
+        return allocations
+
+    @staticmethod
+    def _no_lot_to_sell_from(material_uuid: str) -> BadRequestError:
+        return BadRequestError(
+            f"Cannot record a sale of material {material_uuid}: it has no "
+            f"inventory lot, so there is no warehouse to take the stock from. "
+            f"Add inventory for it first."
+        )
+
     @staticmethod
     def _absorb_shortfall(
         uow: SqlAlchemyUnitOfWork,
@@ -396,11 +469,7 @@ class InventoryDomain:
                 .first()
             )
         if target is None:
-            raise BadRequestError(
-                f"Cannot record a sale of material {material_uuid}: it has no "
-                f"inventory lot, so there is no warehouse to take the stock from. "
-                f"Add inventory for it first."
-            )
+            raise InventoryDomain._no_lot_to_sell_from(material_uuid)
 
         for dto in result:
             if dto.inventory_uuid == target.uuid:
@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+from app.dto.job import JobKind, JobRead, JobStatus
+from app.entrypoint.routes.common.errors import ApiError, NotFoundError
+from models.common import Job as JobModel
+
+# First retry after this long, doubling each attempt after that. sp-today being
+# down is the common failure, and hammering it every few seconds does not bring
+# it back any sooner.
+RETRY_BASE_SECONDS = 30
+DEFAULT_MAX_ATTEMPTS = 3
+# A running job whose worker has not finished it within this long is presumed
+# orphaned (the container was killed mid-job) and may be claimed again. Well
+# above the slowest real job, so a live one is never run twice in parallel.
+LEASE = timedelta(minutes=15)
+# error text kept on the row; a traceback's tail is what matters
+ERROR_MAX_CHARS = 4000
+
+
+class JobDomain:
+
+    @staticmethod
+    def enqueue(
+        uow: SqlAlchemyUnitOfWork,
+        kind: JobKind,
+        payload: Optional[dict] = None,
+        dedupe_key: Optional[str] = None,
+        created_by_uuid: Optional[str] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> JobModel:
+        """Queue `kind` to run in the worker; the caller commits.
+
+        Committing with the caller's own writes is the point: the job exists
+        exactly when the request's changes do, and a rolled-back request leaves
+        nothing behind for the worker to trip over.
+
+        With a `dedupe_key`, a job already queued or running under that key is
+        returned instead of a second one. When two requests race past the
+        lookup, the insert goes through ON CONFLICT DO NOTHING on the partial
+        unique index, so the loser gets the winner's job rather than an error
+        (JobRepository.insert_unless_live). The key is stored prefixed with the
+        account, so one tenant's key never collides with (or reveals) another's.
+        """
+        if dedupe_key:
+            dedupe_key = f"{uow.account_uuid or 'platform'}:{dedupe_key}"
+            existing = uow.job_repository._find_first_by_filters(filters=[
+                JobModel.dedupe_key == dedupe_key,
+                JobModel.status.in_([JobStatus.QUEUED.value, JobStatus.RUNNING.value]),
+            ])
+            if existing:
+                return existing
+
+        job = JobModel(
+            kind=JobKind(kind).value,
+            payload=payload or {},
+            dedupe_key=dedupe_key,
+            created_by_uuid=created_by_uuid,
+            status=JobStatus.QUEUED.value,
+            attempts=0,
+            max_attempts=max_attempts,
+            run_after=datetime.utcnow(),
+        )
+        if dedupe_key:
+            return uow.job_repository.insert_unless_live(job)
+        uow.job_repository.save(model=job, commit=False)
+        return job
+
+    @staticmethod
+    def get(uow: SqlAlchemyUnitOfWork, uuid: str, created_by_uuid: Optional[str] = None) -> JobRead:
+        """A job in the caller's account; with `created_by_uuid`, only their own."""
+        filters = dict(uuid=uuid)
+        if created_by_uuid is not None:
+            filters["created_by_uuid"] = created_by_uuid
+        job = uow.job_repository.find_one(**filters)
+        if not job:
+            raise NotFoundError(f"Job with uuid {uuid} not found")
+        return JobRead.from_orm(job)
+
+    @staticmethod
+    def claim(
+        uow: SqlAlchemyUnitOfWork,
+        worker_id: str,
+        kind_limits: Optional[dict] = None,
+    ) -> Optional[JobModel]:
+        """Claim the next runnable job, honouring per-kind concurrency limits.
+
+        `kind_limits` caps how many jobs of a kind may run at once across ALL
+        workers — routing is CPU-heavy and sp-today rate-limits, so neither
+        should be fanned out just because several workers happen to be idle.
+        The cap is soft: two workers claiming in the same instant may both see
+        room for one more. The caller commits.
+
+        Jobs whose worker died on their last attempt are failed first: they
+        are not taken over again.
+        """
+        uow.job_repository.fail_exhausted(
+            lease=LEASE, error="Lease expired on the last attempt: the worker died mid-job",
+        )
+        saturated = []
+        if kind_limits:
+            running = uow.job_repository.running_counts(lease=LEASE)
+            saturated = [
+                kind for kind, limit in kind_limits.items()
+                if running.get(kind, 0) >= limit
+            ]
+        return uow.job_repository.claim_next(
+            worker_id=worker_id, lease=LEASE, exclude_kinds=saturated
+        )
+
+    @staticmethod
+    def succeed(uow: SqlAlchemyUnitOfWork, job: JobModel, result: Optional[dict]) -> None:
+        job.status = JobStatus.SUCCEEDED.value
+        job.result = result
+        job.error = None
+        job.finished_at = datetime.utcnow()
+        job.locked_at = None
+        job.locked_by = None
+        uow.job_repository.save(model=job, commit=False)
+
+    @staticmethod
+    def fail(uow: SqlAlchemyUnitOfWork, job: JobModel, exc: BaseException) -> bool:
+        """Record a failed attempt. Returns True when the job will be retried.
+
+        An ApiError is the domain saying no — the task was already completed,
+        the range had no rates — and will say no again, so it fails the job
+        outright. Anything else (a timeout, the source being down, a deadlock)
+        is retried with exponential backoff until max_attempts is used up.
+        """
+        message = exc.message if isinstance(exc, ApiError) else f"{type(exc).__name__}: {exc}"
+        job.error = message[-ERROR_MAX_CHARS:]
+        job.locked_at = None
+        job.locked_by = None
+        retry = not isinstance(exc, ApiError) and job.attempts < job.max_attempts
+        if retry:
+            job.status = JobStatus.QUEUED.value
+            job.run_after = datetime.utcnow() + timedelta(
+                seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+            )
+        else:
+            job.status = JobStatus.FAILED.value
+            job.finished_at = datetime.utcnow()
+        uow.job_repository.save(model=job, commit=False)
+        return retry
@@ -172,9 +172,9 @@ class ProcessDomain:
     @staticmethod
     def _calculate_cost_per_unit(uow, process: ProcessModel) -> ProcessModel:
         """Stamp current input/output costs into process.data (write paths)."""
+        materials = uow.material_repository.get_many(output["material_uuid"] for output in process.data["outputs"])
         for output in process.data["outputs"]:
-            output_material = uow.material_repository.find_one(uuid=output["material_uuid"],is_deleted=False)
-            if not output_material:
+            if output["material_uuid"] not in materials:
                 raise NotFoundError(f"Material with uuid {output['material_uuid']} not found")
 
         # reassignment (not in-place mutation) so the attribute is marked dirty
@@ -239,7 +239,6 @@ class ProcessDomain:
         """Create an inventory entry for the process."""
         for output in process.data["outputs"]:
             if not output.get("inventory_uuid"):
-                material = uow.material_repository.find_one(uuid=output["material_uuid"], is_deleted=False)
                 payload = InventoryCreate(
                     material_uuid=output["material_uuid"],
                     warehouse_uuid= process.data.get("output_warehouse_uuid"),
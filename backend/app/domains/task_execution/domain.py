@@ -66,33 +66,15 @@ class TaskExecutionDomain:
 
     @staticmethod
     def cancel_task_executions(
-        uow: SqlAlchemyUnitOfWork, workflow_execution_uuid: str
-    ) -> TaskExecutionRead:
-        workflow_execution = uow.workflow_execution_repository.find_one(
-            uuid=workflow_execution_uuid
-        )
-        if not workflow_execution:
-            raise NotFoundError(f"WorkflowExecution not found with uuid: {workflow_execution_uuid}")
-
-        task_executions = uow.task_execution_repository.find_all(
-            workflow_execution_uuid=workflow_execution_uuid
+        uow: SqlAlchemyUnitOfWork, workflow_execution_uuids: list[str], ended_at: datetime
+    ) -> int:
+        """Cancel every unfinished task execution of the workflow executions,
+        child executions included, in one UPDATE. Returns how many were
+        cancelled."""
+        return uow.task_execution_repository.cancel_for_workflows(
+            workflow_execution_uuids, ended_at=ended_at,
+            error_message="Task execution was cancelled by user",
         )
-        if not task_executions:
-            raise NotFoundError(f"No task executions found for workflow execution uuid: {workflow_execution_uuid}")
-        for task_execution in task_executions:
-            if task_execution.status in [WorkflowStatus.COMPLETED.value, WorkflowStatus.CANCELLED.value, WorkflowStatus.FAILED.value]:
-                continue
-
-            for child in task_execution.child_task_executions:
-                if child.status not in [WorkflowStatus.COMPLETED.value, WorkflowStatus.CANCELLED.value, WorkflowStatus.FAILED.value]:
-                    child.status = WorkflowStatus.CANCELLED.value
-                    child.end_time = datetime.now()
-                    child.error_message = "Task execution was cancelled by user"
-                    uow.task_execution_repository.save(model=child, commit=False)
-            task_execution.status = WorkflowStatus.CANCELLED.value
-            task_execution.end_time = datetime.now()
-            task_execution.error_message = "Task execution was cancelled by user"
-            uow.task_execution_repository.save(model=task_execution, commit=False)
 
     @staticmethod
     def complete_task_execution(uow: SqlAlchemyUnitOfWork,
@@ -115,6 +97,7 @@ class TaskExecutionDomain:
             payload=payload,
             operator_type=task_exe.task.operator,
             parameters=task_exe.workflow_execution.parameters,
+            task_execution=task_exe,
         )
         uow.task_execution_repository.save(model=task_exe, commit=False)
         for fn_name in task_exe.callback_fns:
@@ -127,11 +110,10 @@ class TaskExecutionDomain:
         )
 
         # if all tasks are completed, mark workflow execution as completed
-        all_tasks = uow.task_execution_repository.find_all(
+        if uow.task_execution_repository.all_in_status(
             workflow_execution_uuid=task_exe.workflow_execution_uuid,
-            status=WorkflowStatus.COMPLETED.value
-        )
-        if len(all_tasks) == len(task_exe.workflow_execution.task_executions):
+            status=WorkflowStatus.COMPLETED.value,
+        ):
             workflow_execution = task_exe.workflow_execution
             workflow_execution.status = WorkflowStatus.COMPLETED.value
             workflow_execution.end_time = datetime.now()
@@ -149,13 +131,25 @@ class TaskExecutionDomain:
         if task_execution.status != WorkflowStatus.COMPLETED.value:
             raise BadRequestError(f"TaskExecution with uuid {task_execution.uuid} is not completed.")
 
-        # Find all dependent task executions
-        workflow_exe_tasks = task_execution.workflow_execution.task_executions
-        name_status_mapper = {task.name: task.status for task in workflow_exe_tasks}
-
-        # now loop through the tasks and mark in progress if dependent names are completed
-        for task in workflow_exe_tasks:
-            if task.status in [WorkflowStatus.NOT_STARTED.value]  and task.depends_on and all(name_status_mapper[dep] == WorkflowStatus.COMPLETED.value for dep in task.depends_on):
+        # Only this task's direct dependants are read, and then only the other
+        # names they wait on. A trip's hundreds of stop executions are not
+        # rescanned on every completion.
+        repo = uow.task_execution_repository
+        workflow_execution_uuid = task_execution.workflow_execution_uuid
+        dependants = repo.find_waiting_on(
+            workflow_execution_uuid=workflow_execution_uuid,
+            name=task_execution.name,
+            status=WorkflowStatus.NOT_STARTED.value,
+        )
+        if not dependants:
+            return
+        completed = repo.names_in_status(
+            workflow_execution_uuid=workflow_execution_uuid,
+            names=[dep for task in dependants for dep in task.depends_on],
+            status=WorkflowStatus.COMPLETED.value,
+        )
+        for task in dependants:
+            if all(dep in completed for dep in task.depends_on):
                 TaskExecutionDomain.mark_dependent_task_in_progress(uow=uow, dependent_task=task)
 
     @staticmethod
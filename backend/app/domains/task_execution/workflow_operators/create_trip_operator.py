@@ -1,6 +1,7 @@
 
 
 from datetime import datetime, timedelta
+from uuid import uuid4
 from enum import Enum
 from typing import Optional
 
@@ -17,13 +18,12 @@ from app.dto.task_execution import OperatorType
 from app.dto.trip import TripCreate, TripStatus
 
 from app.domains.task.domain import TaskDomain
-from app.domains.trip_stop.domain import TripStopDomain
-from app.dto.task import TaskCreate, TaskInput
-from app.dto.task_execution import TaskExecutionCreate
+from app.dto.task import TaskCreate, TaskInput, TaskRead
+from app.dto.task_execution import TaskExecutionCreate, TaskExecutionRead
 from app.dto.trip import TripData, InventoryInput
-from app.dto.trip_stop import TripStopCreate, TripStopStatus
-from app.utils.geom_utils import wkt_or_wkb_to_lat_lon
-from app.dto.customer import CustomerRead
+from app.dto.trip_stop import TripStopStatus
+from app.dto.customer import CustomerSnapshot
+from models.common import Task as TaskModel, TaskExecution as TaskExecutionModel, TripStop as TripStopModel
 
 from app.dto.task import FieldType
 
@@ -65,36 +65,10 @@ class CreateTripOperatorSchema(BaseModel):
     pass
 
 
-def create_trip_stop_with_task(
-    uow: SqlAlchemyUnitOfWork,
-    workflow_execution,
-    customer,
-    created_by_uuid: Optional[str],
-    index: int,
-    depends_on: list,
-    parent_task_execution_uuid: Optional[str],
-):
-    """Create a trip stop for a customer plus its trip_stop_operator task and
-    task execution, and link them together. Used both for routed stops
-    (pre-created by CreateTripOperator) and ad-hoc manual stops added mid-trip."""
-    from app.domains.task_execution.domain import TaskExecutionDomain
-
-    trip = workflow_execution.trips[0]
-    trip_stop = TripStopDomain.create_trip_stop(
-        uow=uow,
-        payload=TripStopCreate(
-            created_by_uuid=created_by_uuid,
-            trip_uuid=trip.uuid,
-            coordinates=wkt_or_wkb_to_lat_lon(customer.coordinates),
-            customer_uuid=customer.uuid,
-            status=TripStopStatus.IN_PROGRESS.value,
-            index=index,
-        )
-    )
-
-    task_input = TaskInput(
-        data={"trip_stop_uuid": trip_stop.uuid,
-              "customer": CustomerRead.from_orm(customer).model_dump(mode='json')
+def _trip_stop_task_input(trip_stop_uuid: str, customer_snapshot: dict) -> TaskInput:
+    return TaskInput(
+        data={"trip_stop_uuid": trip_stop_uuid,
+              "customer": customer_snapshot,
               },
         fields=[
             TaskInputField(
@@ -113,9 +87,44 @@ def create_trip_stop_with_task(
         ]
     )
 
-    task_create = TaskDomain.create_task(
-        uow=uow,
-        payload=TaskCreate(
+
+def create_trip_stops_with_tasks(
+    uow: SqlAlchemyUnitOfWork,
+    workflow_execution,
+    customers: list,
+    created_by_uuid: Optional[str],
+    depends_on: list,
+    parent_task_execution_uuid: Optional[str],
+    start_index: int = 0,
+) -> list[tuple[TaskModel, TaskExecutionModel]]:
+    """Materialize a chain of trip stops, one per customer in visiting order,
+    each with its trip_stop_operator task and task execution.
+
+    The first stop waits on `depends_on`; every later one waits on the stop
+    before it. Everything is built in memory with its uuids up front and
+    written as one batched INSERT per table, and the customers' balances for
+    the task inputs' CustomerSnapshot come from one grouped query
+    (prime_balances). Going
+    through TripStopDomain/TaskDomain per stop re-read the trip, the customer
+    and the workflow, flushed four times, and walked each customer's whole
+    order/invoice graph for balance_per_currency: hundreds of round trips for
+    a 150-stop route. The checks those domains made still hold: every
+    customer has coordinates, and the names are unique by their index suffix.
+    """
+    trip = workflow_execution.trips[0]
+    for customer in customers:
+        if customer.coordinates is None:
+            raise BadRequestError(f"Customer {customer.uuid} has no coordinates")
+    uow.customer_repository.prime_balances(list({c.uuid: c for c in customers}.values()))
+
+    now = datetime.now()
+    created, trip_stops = [], []
+    for offset, customer in enumerate(customers):
+        index = start_index + offset
+        waits_on = depends_on if not created else [created[-1][0].name]
+        trip_stop_uuid, task_execution_uuid = str(uuid4()), str(uuid4())
+        task = TaskModel(
+            uuid=str(uuid4()),
             # index suffix keeps names unique even when the same customer is
             # visited twice in one trip (dependency chains reference names)
             name=f"trip_stop_{customer.company_name}:{customer.uuid}:{index}",
@@ -123,28 +132,64 @@ def create_trip_stop_with_task(
             workflow_uuid=None,
             parent_task_uuid=None,
             operator=OperatorType.TRIP_STOP_OPERATOR.value,
-            task_inputs=task_input,
+            task_inputs=_trip_stop_task_input(
+                trip_stop_uuid, CustomerSnapshot.model_validate(customer).model_dump(mode='json'),
+            ).model_dump(mode='json'),
             depends_on=[],
             callback_fns=[],
         )
-    )
-
-    task_execution = TaskExecutionDomain.create_task_execution(
-        uow=uow,
-        payload=TaskExecutionCreate(
-            status=WorkflowStatus.NOT_STARTED.value if depends_on else WorkflowStatus.IN_PROGRESS.value,
-            depends_on=depends_on,
-            start_time=datetime.now() if not depends_on else None,
-            task_uuid=task_create.uuid,
+        task_execution = TaskExecutionModel(
+            uuid=task_execution_uuid,
+            status=WorkflowStatus.NOT_STARTED.value if waits_on else WorkflowStatus.IN_PROGRESS.value,
+            depends_on=waits_on,
+            start_time=now if not waits_on else None,
+            task=task,
             workflow_execution_uuid=workflow_execution.uuid,
             created_by_uuid=created_by_uuid,
             parent_task_execution_uuid=parent_task_execution_uuid,
+            result={},
+        )
+        trip_stops.append(TripStopModel(
+            uuid=trip_stop_uuid,
+            created_by_uuid=created_by_uuid,
+            trip_uuid=trip.uuid,
+            coordinates=customer.coordinates,
+            customer_uuid=customer.uuid,
+            status=TripStopStatus.IN_PROGRESS.value,
+            index=index,
+            task_execution_uuid=task_execution_uuid,
         ))
+        created.append((task, task_execution))
 
-    trip_stop_model = uow.trip_stop_repository.find_one(uuid=trip_stop.uuid)
-    trip_stop_model.task_execution_uuid = task_execution.uuid
-    uow.trip_stop_repository.save(trip_stop_model, commit=False)
-    return task_create, task_execution
+    # parents before children: trip_stop points at task_execution, which points at task
+    uow.task_repository.batch_save([task for task, _ in created], commit=False)
+    uow.task_execution_repository.batch_save([execution for _, execution in created], commit=False)
+    uow.trip_stop_repository.batch_save(trip_stops, commit=False)
+    return created
+
+
+def create_trip_stop_with_task(
+    uow: SqlAlchemyUnitOfWork,
+    workflow_execution,
+    customer,
+    created_by_uuid: Optional[str],
+    index: int,
+    depends_on: list,
+    parent_task_execution_uuid: Optional[str],
+):
+    """Create a trip stop for a customer plus its trip_stop_operator task and
+    task execution, and link them together. Used for ad-hoc manual stops added
+    mid-trip; routed stops are created in bulk by create_trip_stops_with_tasks."""
+    [(task, task_execution)] = create_trip_stops_with_tasks(
+        uow=uow,
+        workflow_execution=workflow_execution,
+        customers=[customer],
+        created_by_uuid=created_by_uuid,
+        depends_on=depends_on,
+        parent_task_execution_uuid=parent_task_execution_uuid,
+        start_index=index,
+    )
+    return TaskRead.from_orm(task), TaskExecutionRead.from_orm(task_execution)
 
 
 def create_finish_trip_task(
@@ -207,9 +252,7 @@ class CreateTripOperator(OperatorInterface):
         # load the operator schema
         operator_schema = CreateTripOperatorSchema()
 
-        task_exe = uow.task_execution_repository.find_one(uuid=payload.uuid)
-        if not task_exe:
-            raise BadRequestError(f"TaskExecution not found with uuid: {payload.uuid}")
+        task_exe = self.load_task_execution(uow, payload, kwargs.get("task_execution"))
         self.task_exe = task_exe
         self.all_tasks_executions = task_exe.workflow_execution.task_executions
 
@@ -255,26 +298,20 @@ class CreateTripOperator(OperatorInterface):
         uow.trip_repository.save(model=trip, commit=False)
 
         # create trip stops (routed mode; manual mode has no pre-computed customers)
-        created_task_names = []
-        for i,customer_uuid in enumerate(self.get_customer_uuids()):
-            customer = uow.customer_repository.find_one(
-                uuid=customer_uuid,
-                is_deleted=False
-            )
-            if not customer:
+        customer_uuids = self.get_customer_uuids() or []
+        customers = uow.customer_repository.find_live_by_uuids(customer_uuids)
+        for customer_uuid in customer_uuids:
+            if customer_uuid not in customers:
                 raise BadRequestError(f"Customer not found with uuid: {customer_uuid}")
-
-            depends_on = [self.get_trip_operator_task_execution_name()] if not created_task_names else [created_task_names[-1]]
-            task_create, _ = create_trip_stop_with_task(
-                uow=uow,
-                workflow_execution=task_exe.workflow_execution,
-                customer=customer,
-                created_by_uuid=payload.completed_by_uuid,
-                index=i,
-                depends_on=depends_on,
-                parent_task_execution_uuid=self.get_trip_operator_task_execution_uuid(),
-            )
-            created_task_names.append(task_create.name)
+        created = create_trip_stops_with_tasks(
+            uow=uow,
+            workflow_execution=task_exe.workflow_execution,
+            customers=[customers[customer_uuid] for customer_uuid in customer_uuids],
+            created_by_uuid=payload.completed_by_uuid,
+            depends_on=[self.get_trip_operator_task_execution_name()],
+            parent_task_execution_uuid=self.get_trip_operator_task_execution_uuid(),
+        )
+        created_task_names = [task.name for task, _ in created]
 
         # explicit finish-trip step: snapshots end inventory + completes the trip.
         # It unblocks after the last routed stop (or right after the trip task in
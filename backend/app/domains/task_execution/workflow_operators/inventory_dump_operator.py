@@ -5,7 +5,6 @@ from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWo
 from app.domains.task_execution.workflow_operators.operator_interface import OperatorInterface
 from app.dto.task_execution import TaskExecutionComplete
 from pydantic import ConfigDict, BaseModel
-from app.entrypoint.routes.common.errors import BadRequestError
 from app.dto.workflow_execution import WorkflowStatus
 from app.domains.inventory_event.domain import InventoryEventDomain
 from app.dto.inventory_event import InventoryEventCreate, InventoryEventType
@@ -29,9 +28,7 @@ class InventoryDumpOperator(OperatorInterface):
                 **kwargs):
 
         operator_schema = InventoryDumpOperatorSchema(**payload.result)
-        task_exe = uow.task_execution_repository.find_one(uuid=payload.uuid)
-        if not task_exe:
-            raise BadRequestError(f"TaskExecution not found with uuid: {payload.uuid}")
+        task_exe = self.load_task_execution(uow, payload, kwargs.get("task_execution"))
 
         # dump
         self.dump_inventory(
@@ -28,9 +28,7 @@ class MaterialRefillOperator(OperatorInterface):
 
         # load the operator schema
         operator_schema = MaterialRefillOperatorSchema(**payload.result)
-        task_exe = uow.task_execution_repository.find_one(uuid=payload.uuid)
-        if not task_exe:
-            raise BadRequestError(f"TaskExecution not found with uuid: {payload.uuid}")
+        task_exe = self.load_task_execution(uow, payload, kwargs.get("task_execution"))
 
 
         # Modify process inputs based on the operator schema
@@ -3,11 +3,11 @@ from typing import Optional
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 from app.dto.task_execution import TaskExecutionComplete
 from pydantic import BaseModel
-from app.entrypoint.routes.common.errors import BadRequestError
 from app.dto.workflow_execution import WorkflowStatus
+from app.domains.task_execution.workflow_operators.operator_interface import OperatorInterface
 
 
-class NoopOperator:
+class NoopOperator(OperatorInterface):
 
     def execute(self,
                 uow:SqlAlchemyUnitOfWork,
@@ -24,9 +24,7 @@ class NoopOperator:
         :return: The result of the quality control operation.
         """
         # load the operator schema
-        task_exe = uow.task_execution_repository.find_one(uuid=payload.uuid)
-        if not task_exe:
-            raise BadRequestError(f"TaskExecution not found with uuid: {payload.uuid}")
+        task_exe = self.load_task_execution(uow, payload, kwargs.get("task_execution"))
 
         task_exe.result = payload.result
         task_exe.status = WorkflowStatus.COMPLETED.value
@@ -1,43 +1,154 @@
+import importlib
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
 from app.dto.task_execution import OperatorType
-from app.domains.task_execution.workflow_operators.io_process_operator import IOProcessOperator
 from app.dto.task_execution import TaskExecutionComplete
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 
 from app.entrypoint.routes.common.errors import BadRequestError
-from app.domains.task_execution.workflow_operators.material_refill_operator import MaterialRefillOperator
-from app.domains.task_execution.workflow_operators.qc_operator import QualityControlOperator
-from app.domains.task_execution.workflow_operators.inventory_dump_operator import InventoryDumpOperator
-from app.domains.task_execution.workflow_operators.noop_operator import NoopOperator
-from app.domains.task_execution.workflow_operators.start_trip_operator import StartTripOperator
-from app.domains.task_execution.workflow_operators.trip_route_operator import TripRouteOperator
-from app.domains.task_execution.workflow_operators.create_trip_operator import CreateTripOperator
-from app.domains.task_execution.workflow_operators.trip_operator import TripOperator
-from app.domains.task_execution.workflow_operators.trip_stop_operator import TripStopOperator
-from app.domains.task_execution.workflow_operators.trip_finish_operator import TripFinishOperator
 
+_PACKAGE = "app.domains.task_execution.workflow_operators"
 
-class OperatorEntryPoint:
+# OperatorType -> (module under _PACKAGE, class). Registered by name and
+# imported on first use: importing every operator up front dragged the trip
+# route planner (osmnx, networkx, scikit-learn) into every process that
+# touches a task execution, the web workers included.
+OPERATORS = {
+    OperatorType.IO_PROCESS_OPERATOR: ("io_process_operator", "IOProcessOperator"),
+    OperatorType.MATERIAL_REFILL_OPERATOR: ("material_refill_operator", "MaterialRefillOperator"),
+    OperatorType.QC_OPERATOR: ("qc_operator", "QualityControlOperator"),
+    OperatorType.INVENTORY_DUMP_OPERATOR: ("inventory_dump_operator", "InventoryDumpOperator"),
+    OperatorType.NOOP_OPERATOR: ("noop_operator", "NoopOperator"),
+    OperatorType.START_TRIP_OPERATOR: ("start_trip_operator", "StartTripOperator"),
+    OperatorType.TRIP_ROUTE_OPERATOR: ("trip_route_operator", "TripRouteOperator"),
+    OperatorType.TRIP_CREATE_OPERATOR: ("create_trip_operator", "CreateTripOperator"),
+    OperatorType.TRIP_OPERATOR: ("trip_operator", "TripOperator"),
+    OperatorType.TRIP_STOP_OPERATOR: ("trip_stop_operator", "TripStopOperator"),
+    OperatorType.TRIP_FINISH_OPERATOR: ("trip_finish_operator", "TripFinishOperator"),
+}
+
+
+class OperatorMetrics:
+    """Calls, errors, wall time and SQL statements per operator, since the
+    process started.
+
+    The statement count comes from one Engine-wide before_cursor_execute
+    listener that only counts on a thread while that thread is inside an
+    operator, so concurrent job threads don't count each other's queries.
+    The numbers are per process: each gunicorn worker and the job worker keep
+    their own.
+    """
 
     def __init__(self):
-            """
-            Initializes the OperatorEntryPoint with the given operator.
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._active = threading.local()
+        self._listening = False
 
-            :param operator: The operator instance to be used.
-            """
-            self.mapper = {
-                OperatorType.IO_PROCESS_OPERATOR: IOProcessOperator(),
-                OperatorType.MATERIAL_REFILL_OPERATOR: MaterialRefillOperator(),  # Assuming MaterialRefillOperator is similar to IOProcessOperator
-                OperatorType.QC_OPERATOR: QualityControlOperator(),
-                OperatorType.INVENTORY_DUMP_OPERATOR: InventoryDumpOperator(),
-                OperatorType.NOOP_OPERATOR: NoopOperator(),
-                OperatorType.START_TRIP_OPERATOR: StartTripOperator(),
-                OperatorType.TRIP_ROUTE_OPERATOR: TripRouteOperator(),
-                OperatorType.TRIP_CREATE_OPERATOR: CreateTripOperator(),
-                OperatorType.TRIP_OPERATOR: TripOperator(),  # Assuming TripOperator is similar to CreateTripOperator
-                OperatorType.TRIP_STOP_OPERATOR: TripStopOperator(),
-                OperatorType.TRIP_FINISH_OPERATOR: TripFinishOperator()
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if getattr(self._active, "statements", None) is not None:
+            self._active.statements += 1
+
+    def _listen(self):
+        with self._lock:
+            if not self._listening:
+                event.listen(Engine, "before_cursor_execute", self._on_execute)
+                self._listening = True
+
+    def measure(self, operator_type: OperatorType, fn):
+        """Run fn() and record it against `operator_type`."""
+        self._listen()
+        outer = getattr(self._active, "statements", None)
+        self._active.statements = 0
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = fn()
+            failed = False
+            return result
+        finally:
+            seconds = time.perf_counter() - started
+            statements = self._active.statements
+            # an operator run inside another's execute counts toward both
+            self._active.statements = None if outer is None else outer + statements
+            self._record(operator_type, seconds, statements, failed)
+
+    def _record(self, operator_type: OperatorType, seconds: float, statements: int, failed: bool):
+        with self._lock:
+            stats = self._stats.setdefault(OperatorType(operator_type).value, {
+                "calls": 0, "errors": 0, "seconds_total": 0.0, "seconds_max": 0.0, "statements_total": 0,
+            })
+            stats["calls"] += 1
+            stats["errors"] += failed
+            stats["seconds_total"] += seconds
+            stats["seconds_max"] = max(stats["seconds_max"], seconds)
+            stats["statements_total"] += statements
+
+    def snapshot(self) -> dict:
+        """{operator type: {calls, errors, seconds_total, seconds_max,
+        seconds_mean, statements_total, statements_mean}}"""
+        with self._lock:
+            return {
+                name: {
+                    **stats,
+                    "seconds_mean": stats["seconds_total"] / stats["calls"],
+                    "statements_mean": stats["statements_total"] / stats["calls"],
+                }
+                for name, stats in self._stats.items()
             }
 
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class OperatorRegistry:
+    """One instance of each operator per process, created on first use.
+
+    Operators keep no state between calls (per-call attributes are
+    thread-local, see OperatorInterface), so sharing them saves importing and
+    constructing an operator on every task completion.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._instances = {}
+        self.metrics = OperatorMetrics()
+
+    def get(self, operator_type: OperatorType):
+        """The operator instance for `operator_type`, importing its module on first use."""
+        instance = self._instances.get(operator_type)
+        if instance is not None:
+            return instance
+        if operator_type not in OPERATORS:
+            raise BadRequestError(f"Operator type {operator_type} is not supported.")
+        with self._lock:
+            if operator_type not in self._instances:
+                module, name = OPERATORS[operator_type]
+                operator_class = getattr(importlib.import_module(f"{_PACKAGE}.{module}"), name)
+                self._instances[operator_type] = operator_class()
+            return self._instances[operator_type]
+
+
+REGISTRY = OperatorRegistry()
+
+
+class OperatorEntryPoint:
+
+    def __init__(self, registry: OperatorRegistry = REGISTRY):
+            """
+            Initializes the OperatorEntryPoint. Operators come from `registry`,
+            which instantiates each once per process.
+            """
+            self.registry = registry
+
+    def operator(self, operator_type: OperatorType):
+        """The operator instance for `operator_type`, importing its module on first use."""
+        return self.registry.get(operator_type)
 
     def execute(self,uow:SqlAlchemyUnitOfWork,
                 payload: TaskExecutionComplete,
@@ -46,15 +157,18 @@ class OperatorEntryPoint:
                 **kwargs):
 
         """
-        Executes the operator based on its type.
+        Executes the operator based on its type, timing it and counting its
+        statements in the registry's metrics.
 
         :param operator_type: The type of the operator to execute.
+        :param task_execution: (keyword) the TaskExecution being completed, if
+            the caller already loaded it, so the operator doesn't read it again.
         :return: The result of the operator execution.
         """
-        if operator_type not in self.mapper:
-            raise BadRequestError(f"Operator type {operator_type} is not supported.")
-
-        return self.mapper[operator_type].execute(uow, payload, *args, **kwargs)
-
-
-
+        operator = self.operator(operator_type)
+        try:
+            return self.registry.metrics.measure(
+                operator_type, lambda: operator.execute(uow, payload, *args, **kwargs),
+            )
+        finally:
+            operator.release()
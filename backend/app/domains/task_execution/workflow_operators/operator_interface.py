@@ -1,6 +1,56 @@
+import threading
+
+from app.entrypoint.routes.common.errors import BadRequestError
+
+
+class _PerCall:
+    """An operator attribute that holds one value per thread.
+
+    Operators are instantiated once per process (OperatorRegistry) and the
+    job worker completes tasks on several threads at once, so the state an
+    execute() keeps on `self` for its helper methods must not be shared
+    between calls.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    @staticmethod
+    def calls(operator) -> threading.local:
+        # created on first use, so subclasses need not call super().__init__;
+        # dict.setdefault is atomic, so two threads get the same one
+        return operator.__dict__.setdefault("_calls", threading.local())
+
+    def __get__(self, operator, owner=None):
+        if operator is None:
+            return self
+        try:
+            return getattr(self.calls(operator), self.name)
+        except AttributeError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, operator, value):
+        setattr(self.calls(operator), self.name, value)
 
 
 class OperatorInterface:
+    task_exe = _PerCall()
+    all_tasks_executions = _PerCall()
+
+    def release(self):
+        """Forget this thread's per-call state once execute() returns."""
+        _PerCall.calls(self).__dict__.clear()
+
+    @staticmethod
+    def load_task_execution(uow, payload, task_execution=None):
+        """The task execution being completed. complete_task_execution passes
+        the one it already loaded; other callers get it read by uuid."""
+        if task_execution is None:
+            task_execution = uow.task_execution_repository.find_one(uuid=payload.uuid)
+        if not task_execution:
+            raise BadRequestError(f"TaskExecution not found with uuid: {payload.uuid}")
+        return task_execution
+
     def execute(self, *args, **kwargs):
         raise NotImplementedError("Subclasses must implement the execute method.")
 
@@ -8,4 +58,4 @@ class OperatorInterface:
         raise NotImplementedError("Subclasses must implement the validate method.")
     @property
     def name(self):
-        raise NotImplementedError("Subclasses must implement the name property.")
\ No newline at end of file
+        raise NotImplementedError("Subclasses must implement the name property.")
@@ -3,8 +3,8 @@ from typing import Optional
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 from app.dto.task_execution import TaskExecutionComplete
 from pydantic import BaseModel
-from app.entrypoint.routes.common.errors import BadRequestError
 from app.dto.workflow_execution import WorkflowStatus
+from app.domains.task_execution.workflow_operators.operator_interface import OperatorInterface
 
 
 class ChecklistItem(BaseModel):
@@ -15,7 +15,7 @@ class QCOperatorSchema(BaseModel):
 
 
 
-class QualityControlOperator:
+class QualityControlOperator(OperatorInterface):
 
     def execute(self,
                 uow:SqlAlchemyUnitOfWork,
@@ -33,9 +33,7 @@ class QualityControlOperator:
         """
         # load the operator schema
         operator_schema = QCOperatorSchema(**payload.result)
-        task_exe = uow.task_execution_repository.find_one(uuid=payload.uuid)
-        if not task_exe:
-            raise BadRequestError(f"TaskExecution not found with uuid: {payload.uuid}")
+        task_exe = self.load_task_execution(uow, payload, kwargs.get("task_execution"))
 
         task_exe.result = operator_schema.model_dump(mode="json")
         task_exe.status = WorkflowStatus.COMPLETED.value
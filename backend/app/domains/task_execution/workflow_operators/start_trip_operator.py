@@ -71,9 +71,7 @@ class StartTripOperator(OperatorInterface):
         # load the operator schema
         operator_schema = StartTripOperatorSchema(**payload.result)
 
-        task_exe = uow.task_execution_repository.find_one(uuid=payload.uuid)
-        if not task_exe:
-            raise BadRequestError(f"TaskExecution not found with uuid: {payload.uuid}")
+        task_exe = self.load_task_execution(uow, payload, kwargs.get("task_execution"))
 
         # A user may be assigned to at most one in-progress trip at a time. Block
         # starting this trip if the assignee already has another in-progress trip
@@ -32,9 +32,7 @@ class TripFinishOperator(OperatorInterface):
 
         # load the operator schema
         operator_schema = TripFinishOperatorSchema(**(payload.result or {}))
-        task_exe = uow.task_execution_repository.find_one(uuid=payload.uuid)
-        if not task_exe:
-            raise BadRequestError(f"TaskExecution not found with uuid: {payload.uuid}")
+        task_exe = self.load_task_execution(uow, payload, kwargs.get("task_execution"))
 
         self.task_exe = task_exe
 
@@ -6,7 +6,6 @@ from typing import Optional
 from app.domains.task_execution.workflow_operators.operator_interface import OperatorInterface
 from app.dto.task_execution import TaskExecutionComplete
 from pydantic import BaseModel, ConfigDict, model_validator
-from app.entrypoint.routes.common.errors import BadRequestError
 from app.dto.workflow_execution import (
     WorkflowStatus
 )
@@ -31,9 +30,7 @@ class TripOperator(OperatorInterface):
         # check if all children are either skipped or complete, otherwise raise
 
 
-        task_exe = uow.task_execution_repository.find_one(uuid=payload.uuid)
-        if not task_exe:
-            raise BadRequestError(f"TaskExecution not found with uuid: {payload.uuid}")
+        task_exe = self.load_task_execution(uow, payload, kwargs.get("task_execution"))
 
 
 
@@ -48,9 +48,7 @@ class TripStopOperator(OperatorInterface):
         # load the operator schema
         operator_schema = TripStopOperatorSchema(**payload.result)
 
-        task_exe = uow.task_execution_repository.find_one(uuid=payload.uuid)
-        if not task_exe:
-            raise BadRequestError(f"TaskExecution not found with uuid: {payload.uuid}")
+        task_exe = self.load_task_execution(uow, payload, kwargs.get("task_execution"))
         self.task_exe = task_exe
 
         trip_stop = self.get_trip_stop(uow=uow)
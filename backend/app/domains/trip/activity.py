@@ -0,0 +1,145 @@
+"""What happened at a trip's stops: the /trip/<uuid>/activity document.
+
+Loaded in a fixed number of statements — the stops with their orders, sale
+events and payments preloaded (TripStopRepository.find_for_activity), then one
+query each for the stops' task executions and the materials named (none when
+the material cache has them) — and assembled in memory. Nothing below may
+touch a relationship the loader did not preload, or the per-stop queries come
+back.
+"""
+from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+from app.utils.geom_utils import wkt_or_wkb_to_lat_lon
+from models.common import Material, TaskExecution, Trip
+
+
+def _customer_name(customer):
+    if not customer:
+        return None
+    return customer.company_name or customer.full_name
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _newest_first(rows):
+    return sorted(rows, key=lambda r: r["created_at"] or "", reverse=True)
+
+
+def trip_activity(uow: SqlAlchemyUnitOfWork, trip: Trip) -> dict:
+    """Stops, orders, fulfillments (vehicle sales) and payments at this trip's stops."""
+    stops = uow.trip_stop_repository.find_for_activity(trip.uuid)
+
+    task_uuids = {s.task_execution_uuid for s in stops if s.task_execution_uuid}
+    task_executions = {
+        t.uuid: t for t in uow.task_execution_repository._find_all_by_filters(
+            filters=[TaskExecution.uuid.in_(task_uuids)]
+        )
+    } if task_uuids else {}
+
+    material_uuids = set()
+    for stop in stops:
+        for order in stop.customer_orders:
+            material_uuids.update(i.material_uuid for i in order.customer_order_items)
+        material_uuids.update(ev.material_uuid for ev in stop.vehicle_inventory_events)
+    material_names = {
+        m.uuid: m.name for m in uow.material_repository.get_many(material_uuids).values()
+    }
+    # a material deleted since still names what was sold on the trip
+    deleted = material_uuids - set(material_names)
+    if deleted:
+        material_names.update(
+            (m.uuid, m.name) for m in uow.material_repository._find_all_by_filters(
+                filters=[Material.uuid.in_(deleted)]
+            )
+        )
+
+    def material_name(material_uuid):
+        return material_names.get(material_uuid, material_uuid)
+
+    stop_rows = []
+    for stop in stops:
+        task_exe = task_executions.get(stop.task_execution_uuid)
+        try:
+            latlon = wkt_or_wkb_to_lat_lon(stop.coordinates)
+        except Exception:
+            latlon = None
+        stop_rows.append({
+            "uuid": stop.uuid,
+            "index": stop.index,
+            "customer_uuid": stop.customer_uuid,
+            "customer_name": _customer_name(stop.customer),
+            "status": task_exe.status if task_exe else stop.status,
+            "outcome": stop.outcome,
+            "notes": stop.notes,
+            "coordinates": latlon,  # "lat,lon"
+            "created_at": _iso(stop.created_at),
+            "completed_at": _iso(task_exe.end_time) if task_exe else None,
+        })
+    stop_rows.sort(key=lambda s: (s["index"] is None, s["index"], s["created_at"] or ""))
+
+    orders, fulfillments, payments = [], [], []
+    for stop in stops:
+        for o in stop.customer_orders:
+            if o.is_deleted:
+                continue
+            items = []
+            for item in o.customer_order_items:
+                if item.is_deleted:
+                    continue
+                price = item.invoice_item.price_per_unit if item.invoice_item else None
+                items.append({
+                    "material_name": material_name(item.material_uuid),
+                    "quantity": item.quantity,
+                    "price_per_unit": price,
+                    "amount": (item.quantity or 0) * price if price is not None else None,
+                })
+            orders.append({
+                "uuid": o.uuid,
+                "created_at": _iso(o.created_at),
+                "customer_name": _customer_name(o.customer),
+                "total": o.total_adjusted_amount,
+                "amount_due": o.net_amount_due,
+                "amount_paid": o.net_amount_paid,
+                "currency": o.currency,
+                "is_paid": o.is_paid,
+                "is_fulfilled": o.is_fulfilled,
+                "items": items,
+            })
+        for ev in stop.vehicle_inventory_events:
+            if ev.is_deleted or ev.event_type != "sale":
+                continue
+            item = ev.customer_order_item
+            order = item.customer_order if item else None
+            # legacy voids: the order was deleted without cascading — its
+            # leftover sale events must not count as trip activity
+            if (item and item.is_deleted) or (order and order.is_deleted):
+                continue
+            fulfillments.append({
+                "created_at": _iso(ev.created_at),
+                "material_name": material_name(ev.material_uuid),
+                "quantity": -ev.quantity,  # stored as negative delta; report as positive
+                "customer_name": _customer_name(order.customer) if order else None,
+                "customer_order_uuid": order.uuid if order else None,
+            })
+        for p in stop.payments:
+            if p.is_deleted:
+                continue
+            inv = p.invoice
+            order = inv.customer_order if inv else None
+            if (inv and inv.is_deleted) or (order and order.is_deleted):
+                continue
+            payments.append({
+                "created_at": _iso(p.created_at),
+                "amount": p.amount,
+                "currency": p.currency,
+                "customer_name": _customer_name(order.customer) if order else None,
+                "customer_order_uuid": order.uuid if order else None,
+            })
+
+    return {
+        "stops": stop_rows,
+        "orders": _newest_first(orders),
+        "fulfillments": _newest_first(fulfillments),
+        "payments": _newest_first(payments),
+    }
@@ -7,26 +7,25 @@ from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWo
 from app.entrypoint.routes.common.errors import BadRequestError
 from models.common import Customer
 from typing import List, Tuple, Optional
-import osmnx as ox
-import networkx as nx
 from shapely.geometry import Point, MultiPoint
 from geoalchemy2.shape import to_shape
 
 from models.common import Customer
 from typing import List, Tuple
-import numpy as np
 import math
 from itertools import combinations
 
-from sklearn.cluster import KMeans
-from pyproj import Transformer
 from geoalchemy2.shape import to_shape
 
 from models.common import Customer
-from osmnx import truncate
 
 from app.domains.trip.saleman_router import SalesmanRouterMixin
 
+# osmnx, networkx, scikit-learn and pyproj are imported inside the methods
+# that use them: this module is reachable from the app factory, and at module
+# level they cost every gunicorn worker seconds of startup and ~200 MB of
+# RSS for a route plan it may never make (tests/entrypoint/test_startup.py)
+
 
 class DistributionAlgorithm:
 
@@ -115,6 +114,10 @@ class DistributionAlgorithm:
         if not (1 <= cluster_size <= N):
             raise BadRequestError(f"cluster_size must be between 1 and N. cluster_size={cluster_size}, N={N}")
 
+        import numpy as np
+        from pyproj import Transformer
+        from sklearn.cluster import KMeans
+
         # 1) Extract lat/lon and project to Web Mercator (meters)
         transformer = Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
         pts = []
@@ -174,6 +177,7 @@ class DistributionAlgorithm:
         """
         import networkx as nx
         import osmnx as ox
+        from osmnx import truncate
         from shapely.geometry import MultiPoint
         from shapely.ops import unary_union
 
@@ -247,6 +251,11 @@ class DistributionAlgorithm:
             end_pt: Point,  # in lon/lat WGS84
             buffer_deg: float = 0.05
     ) -> tuple[list[Customer], list[tuple[float, float]], list[tuple[float,float]]]:
+        import networkx as nx
+        import osmnx as ox
+        from osmnx import truncate
+        from pyproj import Transformer
+
         # 1) Build WGS84 graph
         visit_pts = [to_shape(c.coordinates) for c in customers]
         area_ll = MultiPoint([start_pt, end_pt, *visit_pts]).convex_hull.buffer(buffer_deg)
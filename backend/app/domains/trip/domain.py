@@ -71,13 +71,15 @@ class TripDomain:
     def summarize(uow: SqlAlchemyUnitOfWork, trip_uuids: list[str]) -> TripSummary:
         """Roll several trips up into one cash-and-stock picture.
 
-        Deliberately built on the Trip model's own properties (`expected_cash`,
-        the `trip_expenses*` family, `inventory_reconciliation`) rather than
-        fresh SQL. Those encode which money and which stock movements count —
-        deleted payments, voided invoices, orders soft-deleted before the
-        cascade existed, sale events left behind by legacy voids, expenses
-        booked but never paid. A second implementation in SQL would drift from
-        the per-trip page it is meant to agree with.
+        Read off the Trip model's own properties (`expected_cash`, the
+        `trip_expenses*` family, `inventory_reconciliation`), which encode which
+        money and which stock movements count — deleted payments, voided
+        invoices, orders soft-deleted before the cascade existed, sale events
+        left behind by legacy voids, expenses booked but never paid. Walking
+        them would lazy-load every stop's payments and sale events, so the
+        trips are primed first (TripRepository.prime_summaries): three grouped
+        SELECTs answer all of them, and tests/perf/test_trip_summary.py holds
+        the SQL to the walk it replaces.
 
         Two things are reported rather than swallowed, because both make the
         totals mean less than they appear to:
@@ -95,6 +97,7 @@ class TripDomain:
             per_page=MAX_SUMMARY_TRIPS,
         )
         trips = page.items
+        uow.trip_repository.prime_summaries(trips)
         found = {t.uuid for t in trips}
         # keep the caller's order so the response lines up with their selection
         missing = [u for u in trip_uuids if u not in found]
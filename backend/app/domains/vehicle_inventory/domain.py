@@ -12,7 +12,7 @@ class VehicleInventoryDomain:
         if not vehicle:
             raise NotFoundError("Vehicle not found")
 
-        material = uow.material_repository.find_one(uuid=payload.material_uuid, is_deleted=False)
+        material = uow.material_repository.get(payload.material_uuid)
         if not material:
             raise NotFoundError("Material not found")
 
@@ -45,7 +45,7 @@ class VehicleInventoryDomain:
         )
         if inv:
             return inv
-        material = uow.material_repository.find_one(uuid=material_uuid, is_deleted=False)
+        material = uow.material_repository.get(material_uuid)
         inv = VehicleInventoryModel(
             vehicle_uuid=vehicle_uuid,
             material_uuid=material_uuid,
@@ -59,8 +59,7 @@ class VehicleInventoryDomain:
     @staticmethod
     def balances_for_vehicle(uow: SqlAlchemyUnitOfWork, vehicle_uuid: str) -> dict:
         """Snapshot of the vehicle's current per-material balances ({material_uuid: qty})."""
-        rows = uow.vehicle_inventory_repository.find_all(vehicle_uuid=vehicle_uuid, is_deleted=False)
-        return {r.material_uuid: r.current_quantity for r in rows}
+        return uow.vehicle_inventory_repository.quantities_for_vehicle(vehicle_uuid)
 
     @staticmethod
     def record_trip_sale(
@@ -93,6 +92,56 @@ class VehicleInventoryDomain:
             allow_negative=True,
         )
 
+    @staticmethod
+    def record_trip_sales(uow: SqlAlchemyUnitOfWork, sales: list[dict]) -> None:
+        """record_trip_sale for many items at once.
+
+        Each sale is a dict of record_trip_sale's arguments. The stock rows of
+        every (vehicle, material) come back in one SELECT, the missing ones are
+        created together, and the sale events go in as one batched INSERT. Like
+        the single form it may overdraw, so no balance is read at all.
+        """
+        from app.dto.vehicle_inventory_event import VehicleInventoryEventType
+        from app.domains.vehicle_inventory_event.domain import VehicleInventoryEventDomain
+        from models.common import Material as MaterialModel, VehicleInventoryEvent as VehicleInventoryEventModel
+
+        if not sales:
+            return
+        rows = uow.vehicle_inventory_repository.find_for_pairs(
+            (sale["vehicle_uuid"], sale["material_uuid"]) for sale in sales
+        )
+        created = []
+        for sale in sales:
+            pair = (sale["vehicle_uuid"], sale["material_uuid"])
+            if pair in rows:
+                continue
+            # fulfilment has loaded the item's material, so this is no query
+            material = uow.session.get(MaterialModel, sale["material_uuid"])
+            rows[pair] = VehicleInventoryModel(
+                vehicle_uuid=sale["vehicle_uuid"],
+                material_uuid=sale["material_uuid"],
+                created_by_uuid=sale.get("created_by_uuid"),
+                unit=material.measure_unit if material and not material.is_deleted else None,
+                is_active=True,
+            )
+            created.append(rows[pair])
+        if created:
+            uow.vehicle_inventory_repository.batch_save(created, commit=False)
+
+        events = [
+            VehicleInventoryEventModel(
+                vehicle_inventory_uuid=rows[(sale["vehicle_uuid"], sale["material_uuid"])].uuid,
+                material_uuid=sale["material_uuid"],
+                event_type=VehicleInventoryEventType.SALE.value,
+                quantity=VehicleInventoryEventDomain._signed_delta(VehicleInventoryEventType.SALE, sale["quantity"]),
+                customer_order_item_uuid=sale["customer_order_item_uuid"],
+                created_by_uuid=sale.get("created_by_uuid"),
+                trip_stop_uuid=sale.get("trip_stop_uuid"),
+            )
+            for sale in sales
+        ]
+        uow.vehicle_inventory_event_repository.batch_save(events, commit=False)
+
     @staticmethod
     def delete_vehicle_inventory(uow: SqlAlchemyUnitOfWork, uuid: str) -> VehicleInventoryRead:
         inventory = uow.vehicle_inventory_repository.find_one(uuid=uuid, is_deleted=False)
@@ -4,6 +4,8 @@ from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWo
 from app.entrypoint.routes.common.errors import NotFoundError,BadRequestError
 
 from app.dto.workflow_execution import (
+    WorkflowExecutionBulkCancel,
+    WorkflowExecutionBulkCancelRead,
     WorkflowExecutionCreate,
     WorkflowExecutionRead,
     WorkflowStatus
@@ -55,18 +57,41 @@ class WorkflowExecutionDomain:
         if workflow_execution.status in [WorkflowStatus.COMPLETED.value, WorkflowStatus.CANCELLED.value, WorkflowStatus.FAILED.value]:
             raise BadRequestError("Cannot cancel a completed or already cancelled workflow execution")
 
-        workflow_execution.status = WorkflowStatus.CANCELLED.value
-        workflow_execution.end_time = datetime.now()
-        workflow_execution.error_message = "Workflow execution was cancelled by user"
-        uow.workflow_execution_repository.save(model=workflow_execution, commit=False)
+        WorkflowExecutionDomain._cancel(uow=uow, workflow_execution_uuids=[workflow_execution.uuid])
+        return WorkflowExecutionRead.from_orm(workflow_execution)
 
-        for trip in workflow_execution.trips:
-            # Cancel the trip if it exists
-            from app.domains.trip.domain import TripDomain
-            TripDomain.cancel_trip(uow=uow, uuid=trip.uuid)
+    @staticmethod
+    def cancel_workflow_executions(
+        uow: SqlAlchemyUnitOfWork, payload: WorkflowExecutionBulkCancel
+    ) -> WorkflowExecutionBulkCancelRead:
+        """cancel_workflow_execution for many executions at once: the listed
+        ones, or every stale one still running that started before
+        `started_before`. Listed executions that already finished are skipped
+        rather than failing the batch; the response lists the ones cancelled."""
+        if payload.started_before:
+            uuids = uow.workflow_execution_repository.live_uuids(started_before=payload.started_before)
+        else:
+            uuids = uow.workflow_execution_repository.live_uuids(payload.uuids)
+            missing = set(payload.uuids) - set(uuids)
+            if missing:
+                raise NotFoundError(f"WorkflowExecution not found: {', '.join(sorted(missing))}")
 
-        TaskExecutionDomain.cancel_task_executions(workflow_execution_uuid=workflow_execution.uuid, uow=uow)
+        cancelled = WorkflowExecutionDomain._cancel(uow=uow, workflow_execution_uuids=uuids)
+        return WorkflowExecutionBulkCancelRead(uuids=sorted(cancelled))
 
-        # refresh
-        # uow.session.refresh(workflow_execution)
-        return WorkflowExecutionRead.from_orm(workflow_execution)
+    @staticmethod
+    def _cancel(uow: SqlAlchemyUnitOfWork, workflow_execution_uuids: list[str]) -> list[str]:
+        """Cancel the executions with their open trips, trip stops and task
+        executions (children included) as one UPDATE per table, whatever the
+        number of executions or the length of their trips. Nothing is loaded;
+        rows already in the session are synchronized by the UPDATEs. Trips
+        that already finished are left alone instead of failing the whole
+        cancellation the way TripDomain.cancel_trip would."""
+        now = datetime.now()
+        cancelled = uow.workflow_execution_repository.cancel(
+            workflow_execution_uuids, ended_at=now,
+            error_message="Workflow execution was cancelled by user",
+        )
+        uow.trip_repository.cancel_for_workflows(cancelled, ended_at=now)
+        TaskExecutionDomain.cancel_task_executions(uow=uow, workflow_execution_uuids=cancelled, ended_at=now)
+        return cancelled
@@ -12,3 +12,10 @@ class Currency(str, Enum):
     USD = "USD"
     SYP = "SYP"
 
+
+class PageTotal(str, Enum):
+    """How a keyset (cursor) listing reports its total: skipped, the planner's
+    estimate, or an exact COUNT."""
+    NONE = "none"
+    ESTIMATE = "estimate"
+    EXACT = "exact"
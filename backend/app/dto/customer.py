@@ -3,7 +3,7 @@ from enum import Enum
 from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator
 from typing import Optional, List
 from datetime import datetime
-from app.dto.common_enums import Currency
+from app.dto.common_enums import Currency, PageTotal
 
 from app.utils.geom_utils import lat_lon_to_wkt
 from app.utils.geom_utils import wkt_or_wkb_to_lat_lon
@@ -101,6 +101,37 @@ class CustomerRead(CustomerBase):
 
 
 
+# Bump when CustomerSnapshot's fields change, and migrate stored snapshots
+# (see migration 6d2b9e4f1a37 for the move from a CustomerRead dump to v1).
+CUSTOMER_SNAPSHOT_VERSION = 1
+
+
+class CustomerSnapshot(BaseModel):
+    """The customer as a trip stop's task input carries it.
+
+    Just what the stop screens read: who and where, and the balance hint.
+    A full CustomerRead dump used to be stored, and it went back to the
+    app with every task read. Anything else about the customer is one
+    GET /customer/<uuid> away. `v` tells the clients and later migrations
+    which shape they hold.
+    """
+    model_config = ConfigDict(extra="forbid", from_attributes=True)
+
+    v: int = CUSTOMER_SNAPSHOT_VERSION
+    uuid: str
+    company_name: str
+    full_name: str
+    phone_number: str
+    coordinates: Optional[str] = None  # "lat,lon"
+    balance_per_currency: dict[Currency, float]
+
+    @field_validator("coordinates", mode="before")
+    def _wkb_or_wkt_to_latlon(cls, v):
+        if v is None:
+            return v
+        return wkt_or_wkb_to_lat_lon(v)
+
+
 class CustomerReadList(BaseModel):
     """What we return to clients."""
     model_config = ConfigDict(extra="forbid")
@@ -127,6 +158,29 @@ class CustomerListParams(BaseModel):
 
     page: int = Field(1, gt=0, description="Page number, starting from 1")
     per_page: int = Field(20, gt=0, le=1000, description="Items per page, max 100")
+    # keyset pagination instead of page: "" for the first page, then each
+    # response's next_cursor (see routes/common/pagination.py)
+    cursor: Optional[str] = None
+    total: Optional[PageTotal] = None
+
+
+class CustomerSearchParams(BaseModel):
+    """Query args for /customer/search."""
+    model_config = ConfigDict(extra="forbid")
+    # matched against company name, full name, phone number and email
+    q: str = Field(..., min_length=1)
+    category: Optional[CustomerCategory] = None
+    per_page: int = Field(20, gt=0, le=100)
+    # "" or absent for the first page, then each response's next_cursor
+    cursor: Optional[str] = None
+
+    @field_validator("q")
+    def strip_query(cls, v: str) -> str:
+        # a blank q would ILIKE '%%' — every customer, in arbitrary order
+        v = v.strip()
+        if not v:
+            raise ValueError("q must not be blank")
+        return v
 
 
 class CustomerPage(BaseModel):
@@ -134,10 +188,12 @@ class CustomerPage(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     customers: List[CustomerRead] = Field(..., description="List of customers on this page")
-    total_count: int = Field(..., description="Total number of customers")
-    page: int = Field(..., description="Current page number")
+    total_count: Optional[int] = Field(None, description="Total number of customers")
+    page: Optional[int] = Field(None, description="Current page number")
     per_page: int = Field(..., description="Number of items per page")
-    pages: int = Field(..., description="Total number of pages")
+    pages: Optional[int] = Field(None, description="Total number of pages")
+    # keyset mode only; None on the last page
+    next_cursor: Optional[str] = None
 
 # --------------------------- MAP CLUSTERS ---------------------------
 #
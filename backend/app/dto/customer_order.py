@@ -82,6 +82,23 @@ class CustomerOrderPage(BaseModel):
     pages: int
 
 
+class CustomerOrderBulkVoid(BaseModel):
+    """Orders to void: listed by uuid, or every order taken on one trip."""
+    model_config = ConfigDict(extra="forbid")
+    uuids: List[str] = Field(default_factory=list)
+    trip_uuid: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _one_selector(self):
+        if bool(self.uuids) == bool(self.trip_uuid):
+            raise BadRequestError("Set exactly one of `uuids` or `trip_uuid`.")
+        return self
+
+class CustomerOrderBulkVoidRead(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    uuids: List[str]
+
+
 # ----------------- CUSTOMER ORDER WITH ITEMS AND INVOICES -----------------
 
 class CustomerOrderAndInvoiceItemCreate(BaseModel):
@@ -0,0 +1,30 @@
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import Optional
+from datetime import datetime
+
+from app.entrypoint.routes.common.errors import BadRequestError
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExportParams(BaseModel):
+    """Query args shared by every `/<resource>/export` endpoint.
+
+    No page/per_page on purpose: an export is the whole filtered set, streamed.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    format: ExportFormat = ExportFormat.NDJSON
+    created_from: Optional[datetime] = Field(None, description="Inclusive lower bound on created_at")
+    created_to: Optional[datetime] = Field(None, description="Exclusive upper bound on created_at")
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.created_from and self.created_to and self.created_from >= self.created_to:
+            raise BadRequestError("created_from must be before created_to")
+        return self
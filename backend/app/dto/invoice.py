@@ -4,7 +4,7 @@ from enum import Enum
 from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
-from app.dto.common_enums import Currency
+from app.dto.common_enums import Currency, PageTotal
 
 from app.dto.invoice_item import InvoiceItemRead
 
@@ -61,11 +61,17 @@ class InvoiceListParams(BaseModel):
     status: Optional[InvoiceStatus] = None
     page: int = Field(1, gt=0)
     per_page: int = Field(20, gt=0, le=100)
+    # keyset pagination instead of page: "" for the first page, then each
+    # response's next_cursor (see routes/common/pagination.py)
+    cursor: Optional[str] = None
+    total: Optional[PageTotal] = None
 
 class InvoicePage(BaseModel):
     model_config = ConfigDict(extra="forbid")
     invoices: List[InvoiceRead]
-    total_count: int
-    page: int
+    total_count: Optional[int] = None
+    page: Optional[int] = None
     per_page: int
-    pages: int
\ No newline at end of file
+    pages: Optional[int] = None
+    # keyset mode only; None on the last page
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,38 @@
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobKind(str, Enum):
+    """Every kind the worker knows how to run; see jobs/handlers.py."""
+    EXCHANGE_RATE_BACKFILL = "exchange_rate_backfill"
+    TASK_EXECUTION_COMPLETE = "task_execution_complete"
+
+
+class JobRead(BaseModel):
+    """What GET /job/<uuid> returns, and what a route answers 202 with."""
+    model_config = ConfigDict(from_attributes=True, extra="forbid")
+
+    uuid: str
+    kind: JobKind
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    created_at: datetime
+    run_after: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # set once the job has succeeded: whatever the synchronous route would
+    # have returned in its 200 body
+    result: Optional[Dict[str, Any]] = None
+    # the last attempt's failure, kept while a retry is pending too
+    error: Optional[str] = None
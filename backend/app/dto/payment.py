@@ -3,7 +3,7 @@ from enum import Enum
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import Optional, List
 from datetime import datetime
-from app.dto.common_enums import Currency
+from app.dto.common_enums import Currency, PageTotal
 
 from app.entrypoint.routes.common.errors import BadRequestError
 
@@ -64,11 +64,17 @@ class PaymentListParams(BaseModel):
     debit_note_item_uuid: Optional[str] = None
     page: int = Field(1, gt=0)
     per_page: int = Field(20, gt=0, le=100)
+    # keyset pagination instead of page: "" for the first page, then each
+    # response's next_cursor (see routes/common/pagination.py)
+    cursor: Optional[str] = None
+    total: Optional[PageTotal] = None
 
 class PaymentPage(BaseModel):
     model_config = ConfigDict(extra="forbid")
     payments: List[PaymentRead]
-    total_count: int
-    page: int
+    total_count: Optional[int] = None
+    page: Optional[int] = None
     per_page: int
-    pages: int
\ No newline at end of file
+    pages: Optional[int] = None
+    # keyset mode only; None on the last page
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -4,6 +4,7 @@ from enum import Enum
 from pydantic import AliasChoices, AliasPath, BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
+from app.dto.common_enums import PageTotal
 
 from shapely import wkt as shapely_wkt
 from shapely.geometry import shape
@@ -248,6 +249,10 @@ class TripListParams(BaseModel):
 
     page: int = Field(1, gt=0, description="Page number, starting at 1")
     per_page: int = Field(20, gt=0, le=100, description="Items per page, max 100")
+    # keyset pagination instead of page: "" for the first page, then each
+    # response's next_cursor (see routes/common/pagination.py)
+    cursor: Optional[str] = None
+    total: Optional[PageTotal] = None
 
 
 class TripPage(BaseModel):
@@ -255,15 +260,17 @@ class TripPage(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     items: List[TripRead] = Field(..., description="List of trips on this page")
-    total_count: int = Field(..., description="Total number of trips matching filters")
-    page: int = Field(..., description="Current page number")
+    total_count: Optional[int] = Field(None, description="Total number of trips matching filters")
+    page: Optional[int] = Field(None, description="Current page number")
     per_page: int = Field(..., description="Number of items per page")
-    pages: int = Field(..., description="Total number of pages")
+    pages: Optional[int] = Field(None, description="Total number of pages")
+    # keyset mode only; None on the last page
+    next_cursor: Optional[str] = None
 
 
-# One page of trips is the realistic selection, and the aggregate walks each
-# trip's stops in Python, so the cost is bounded by keeping this near the max
-# page size rather than letting a caller ask for the whole history at once.
+# One page of trips is the realistic selection. The figures are grouped in SQL
+# (TripRepository.summary_figures), but a page still bounds the trips loaded
+# rather than letting a caller ask for the whole history at once.
 MAX_SUMMARY_TRIPS = 100
 
 
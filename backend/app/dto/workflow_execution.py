@@ -1,10 +1,12 @@
 from enum import Enum
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+from app.dto.common_enums import PageTotal
 from app.dto.workflow import WorkflowTags
 from app.dto.task_execution import TaskExecutionRead
+from app.entrypoint.routes.common.errors import BadRequestError
 
 class WorkflowStatus(str, Enum):
     NOT_STARTED = "not_started"
@@ -87,6 +89,29 @@ class WorkflowExecutionListParams(BaseModel):
 
     page: int = Field(1, gt=0, description="Page number (>=1)")
     per_page: int = Field(20, gt=0, le=100, description="Items per page (<=100)")
+    # keyset pagination instead of page: "" for the first page, then each
+    # response's next_cursor (see routes/common/pagination.py)
+    cursor: Optional[str] = None
+    total: Optional[PageTotal] = None
+
+class WorkflowExecutionBulkCancel(BaseModel):
+    """Executions to cancel: listed by uuid, or every one still running that
+    started before `started_before` (stale runs nobody finished)."""
+    model_config = ConfigDict(extra="forbid")
+    uuids: List[str] = Field(default_factory=list)
+    started_before: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def _one_selector(self):
+        if bool(self.uuids) == bool(self.started_before):
+            raise BadRequestError("Set exactly one of `uuids` or `started_before`.")
+        return self
+
+
+class WorkflowExecutionBulkCancelRead(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    uuids: List[str]  # the executions this call cancelled
+
 
 class SetCurrentStopParams(BaseModel):
     """Promote an upcoming trip stop to be the current one."""
@@ -99,7 +124,9 @@ class WorkflowExecutionPage(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     workflow_executions: List[WorkflowExecutionRead] = Field(..., description="WorkflowExecutions on this page")
-    total_count: int = Field(..., description="Total number of workflow executions")
-    page: int = Field(..., description="Current page number")
+    total_count: Optional[int] = Field(None, description="Total number of workflow executions")
+    page: Optional[int] = Field(None, description="Current page number")
     per_page: int = Field(..., description="Number of items per page")
-    pages: int = Field(..., description="Total pages available")
+    pages: Optional[int] = Field(None, description="Total pages available")
+    # keyset mode only; None on the last page
+    next_cursor: Optional[str] = None
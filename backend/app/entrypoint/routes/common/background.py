@@ -0,0 +1,26 @@
+"""Opt-in background execution for slow routes.
+
+A route that can take tens of seconds (a year-long rate backfill, trip routing)
+runs inline as it always has, and enqueues a job instead when the caller asks
+with `?background=true`. Opt-in rather than a silent switch because the 200 body
+of those routes is a contract today's clients read; a client that polls instead
+says so, gets 202 with the job document and a Location to poll, and finds the
+body it would have got in the job's `result` once it has succeeded.
+"""
+from flask import jsonify, request, url_for
+
+from app.dto.job import JobRead
+
+_TRUE = {"1", "true", "yes"}
+
+
+def wants_background() -> bool:
+    return request.args.get("background", "").lower() in _TRUE
+
+
+def accepted(job) -> tuple:
+    """202 for a freshly enqueued (or deduplicated) job."""
+    response = jsonify(JobRead.from_orm(job).model_dump(mode="json"))
+    response.status_code = 202
+    response.headers["Location"] = url_for("job.get_job", uuid=job.uuid)
+    return response
@@ -0,0 +1,33 @@
+"""Offset or keyset pagination for a list route, chosen by its query args.
+
+A list route passes its parsed *ListParams here instead of calling the
+repository's paginator directly. Without `cursor` nothing changes: page/per_page
+offset pagination with an exact total, which is what every existing client
+sends. With `cursor` (empty for the first page, then each response's
+`next_cursor`) the listing is walked by keyset instead, and the total is
+whatever `total=` asked for — none by default, since the COUNT is half of
+what made deep offset pages slow.
+"""
+from app.adapters.repositories._abstract_repo import InvalidCursor
+from app.dto.common_enums import PageTotal
+from app.entrypoint.routes.common.errors import BadRequestError
+
+
+def paginate(repository, filters: list, params, ordering: list = None):
+    if params.cursor is None:
+        return repository.find_all_by_filters_paginated(
+            filters=filters,
+            page=params.page,
+            per_page=params.per_page,
+            ordering=ordering,
+        )
+    try:
+        return repository.find_all_by_filters_keyset(
+            filters=filters,
+            per_page=params.per_page,
+            cursor=params.cursor or None,
+            ordering=ordering,
+            total=(params.total or PageTotal.NONE).value,
+        )
+    except InvalidCursor as e:
+        raise BadRequestError(str(e))
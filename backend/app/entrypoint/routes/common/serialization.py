@@ -0,0 +1,120 @@
+"""Fast JSON path for list responses.
+
+The list routes used to build every response three times over: each row went
+`XRead.from_orm(m).model_dump(mode='json')`, the dicts were then validated
+AGAIN by the `*Page` model and dumped a second time, and `jsonify` finally
+re-encoded the lot with the stdlib encoder. At 10,000 rows (`within_polygon`
+forces that page size on the customer list) the conversions, not the query,
+were the bulk of the request.
+
+Here the rows are validated ONCE, as a list, through a cached TypeAdapter,
+dumped straight to JSON-safe python, and encoded to bytes with orjson. The
+page envelope is plain ints from the repository's Pagination, so it is
+written around the rows rather than re-validated.
+
+orjson is a main dependency in pyproject.toml and is imported unconditionally:
+a stdlib fallback would serve subtly different documents (non-str keys,
+datetime formats) without anyone noticing.
+"""
+import json
+from functools import lru_cache
+from typing import Iterable, List, Type
+
+import orjson
+from flask import Response, current_app
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel, TypeAdapter
+
+# rows per chunk when a page is streamed out; large enough that the per-chunk
+# overhead is noise, small enough that a 10k-row page is not one giant bytes
+STREAM_CHUNK_ROWS = 500
+
+# sorted keys, as jsonify did, so documents keep their familiar layout.
+# Datetimes are passed through to Flask's own default so they keep the
+# HTTP-date format jsonify gave them rather than orjson's ISO 8601.
+_ORJSON_OPTIONS = (
+    orjson.OPT_SORT_KEYS
+    | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+)
+
+
+def dumps(obj) -> bytes:
+    """Encode to JSON bytes with orjson."""
+    try:
+        return orjson.dumps(
+            obj, default=DefaultJSONProvider.default, option=_ORJSON_OPTIONS
+        )
+    except (orjson.JSONEncodeError, TypeError):
+        # integers past 64 bits and the like: let the stdlib have a go
+        # rather than failing a request orjson merely cannot represent
+        pass
+    return json.dumps(
+        obj, default=DefaultJSONProvider.default, sort_keys=True
+    ).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Drop-in `app.json` so every `jsonify` in the app gets the fast encoder."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            # indent/separators and friends are stdlib-only options
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(read_model: Type[BaseModel]) -> TypeAdapter:
+    # building an adapter compiles a core schema — worth doing once per model
+    return TypeAdapter(List[read_model])
+
+
+def dump_rows(read_model: Type[BaseModel], rows: Iterable) -> list:
+    """ORM rows (or Read DTOs) -> JSON-safe dicts, validated once as a list.
+
+    Equivalent to `[read_model.from_orm(r).model_dump(mode='json') for r in rows]`.
+    """
+    adapter = _list_adapter(read_model)
+    validated = adapter.validate_python(list(rows), from_attributes=True)
+    return adapter.dump_python(validated, mode="json")
+
+
+def page_response(key: str, items: list, page_obj, status: int = 200) -> Response:
+    """Stream a `*Page` document: `{key: items, total_count, page, per_page, pages}`.
+
+    `items` must already be JSON-safe (from dump_rows). The envelope is taken
+    from the repository's Pagination as-is instead of round-tripping through
+    the Page model, which would only re-validate rows validated a moment ago.
+    """
+    envelope = {
+        "page": page_obj.page,
+        "pages": page_obj.pages,
+        "per_page": page_obj.per_page,
+        "total_count": page_obj.total,
+    }
+    if hasattr(page_obj, "next_cursor"):
+        # keyset pages (see routes/common/pagination.py)
+        envelope["next_cursor"] = page_obj.next_cursor
+
+    def generate():
+        # rows first, then the envelope: key order carries no meaning in JSON,
+        # and this way nothing has to be held back until the rows are out
+        yield dumps({key: []})[:-2]            # b'{"customers":['
+        for start in range(0, len(items), STREAM_CHUNK_ROWS):
+            chunk = dumps(items[start:start + STREAM_CHUNK_ROWS])[1:-1]
+            yield (b"," if start else b"") + chunk
+        yield b"]," + dumps(envelope)[1:]
+
+    return current_app.response_class(
+        generate(), status=status, mimetype="application/json"
+    )
@@ -14,6 +14,7 @@ from app.utils.geom_utils import lat_lon_to_wkt
 from models.common import Customer as CustomerModel
 
 from app.dto.customer import CustomerUpdate, CustomerReadList,CustomerListParams, CustomerPage
+from app.dto.customer import CustomerSearchParams
 from app.dto.customer import (
     MAX_MAP_POINTS,
     CustomerMapCluster,
@@ -22,6 +23,11 @@ from app.dto.customer import (
 )
 from app.entrypoint.routes.common.errors import BadRequestError
 from app.entrypoint.routes.common.errors import NotFoundError
+from app.entrypoint.routes.common.serialization import dump_rows, page_response
+from app.adapters.repositories._abstract_repo import InvalidCursor
+from app.entrypoint.routes.common.pagination import paginate
+from app.entrypoint.routes.common.export import created_range_filters, export_response
+from app.dto.export import ExportParams
 
 from app.dto.customer import CustomerCategory
 from app.dto.trip_stop import TripStopStatus
@@ -64,6 +70,7 @@ def get_customer(uuid: str):
         customer = uow.customer_repository.find_one(uuid=uuid,is_deleted=False)
         if not customer:
             raise NotFoundError('Customer not found')
+        uow.customer_repository.prime_balances([customer])
         customer_data = CustomerRead.from_orm(customer).model_dump(mode='json')
     return jsonify(customer_data), 200
 
@@ -88,6 +95,7 @@ def update_customer(uuid: str):
             if hasattr(customer, key):
                 setattr(customer, key, value)
         uow.customer_repository.save(model=customer, commit=True)
+        uow.customer_repository.prime_balances([customer])
         customer_data = CustomerRead.from_orm(customer).model_dump(mode='json')
 
     return jsonify(customer_data), 200
@@ -112,7 +120,9 @@ def delete_customer(uuid: str):
         credit_note_items = uow.credit_note_item_repository.find_all(uuid=uuid, is_deleted=False)
         if credit_note_items:
             raise BadRequestError("Customer has credit notes and cannot be deleted")
-        for k,v in customer.balance_per_currency.items():
+        balances = uow.customer_repository.balances_per_currency([customer.uuid])[customer.uuid]
+        customer.prime_balance_per_currency(balances)
+        for k,v in balances.items():
             if v > 0:
                 raise BadRequestError("Customer has balance and cannot be deleted")
 
@@ -186,26 +196,84 @@ def list_customers():
         # can mis-rank the nearest customers.
         ordering = [func.ST_DistanceSphere(CustomerModel.coordinates, point).asc()]
 
+    if params.near and params.cursor is not None:
+        # a distance is not a stable key to seek past: it depends on `near`
+        raise BadRequestError("cursor pagination cannot be combined with near")
+
     with SqlAlchemyUnitOfWork() as uow:
-        page_obj = uow.customer_repository.find_all_by_filters_paginated(
-            filters=filters,
-            page=params.page,
-            per_page=params.per_page,
-            ordering=ordering
-        )
-        items = [
-            CustomerRead.from_orm(c).model_dump(mode='json')
-            for c in page_obj.items
-        ]
-        result = CustomerPage(
-            customers=items,
-            total_count=page_obj.total,
-            page=page_obj.page,
-            per_page=page_obj.per_page,
-            pages=page_obj.pages
-        ).model_dump(mode='json')
+        page_obj = paginate(uow.customer_repository, filters, params, ordering)
+        # every balance on the page in one grouped query, not a graph walk per row
+        uow.customer_repository.prime_balances(page_obj.items)
+        # validated once as a list — within_polygon pages run to 10,000 rows
+        items = dump_rows(CustomerRead, page_obj.items)
 
-    return jsonify(result), 200
+    return page_response("customers", items, page_obj)
+
+
+@customer_blueprint.route('/search', methods=['GET'])
+@jwt_required()
+@scopes_required(PermissionScope.ADMIN.value,
+                 PermissionScope.SUPER_ADMIN.value,
+                 PermissionScope.SALES.value,
+                 PermissionScope.DRIVER.value,
+                 PermissionScope.ACCOUNTANT.value)
+def search_customers():
+    """One `q` across name, company, phone and email, best match first.
+
+    Keyset-paged: follow `next_cursor` (None on the last page). There is no
+    total — counting every fuzzy match would cost more than the page.
+    """
+    params = CustomerSearchParams(**request.args)
+    filters = [CustomerModel.is_deleted == False]
+    if params.category:
+        filters.append(CustomerModel.category == params.category.value)
+    with SqlAlchemyUnitOfWork() as uow:
+        try:
+            page_obj = uow.customer_repository.search(
+                q=params.q,
+                filters=filters,
+                per_page=params.per_page,
+                cursor=params.cursor or None,
+            )
+        except InvalidCursor as e:
+            raise BadRequestError(str(e))
+        uow.customer_repository.prime_balances(page_obj.items)
+        items = dump_rows(CustomerRead, page_obj.items)
+
+    return page_response("customers", items, page_obj)
+
+
+@customer_blueprint.route('/export', methods=['GET'])
+@jwt_required()
+@scopes_required(PermissionScope.ADMIN.value,
+                 PermissionScope.SUPER_ADMIN.value,
+                 PermissionScope.SALES.value,
+                 PermissionScope.DRIVER.value,
+                 PermissionScope.ACCOUNTANT.value)
+def export_customers():
+    """Every customer as streamed NDJSON or CSV (?format=), oldest first."""
+    params = ExportParams(**request.args)
+    filters = [CustomerModel.is_deleted == False,
+               *created_range_filters(CustomerModel, params)]
+    columns = [
+        CustomerModel.uuid,
+        CustomerModel.created_at,
+        CustomerModel.company_name,
+        CustomerModel.full_name,
+        CustomerModel.email_address,
+        CustomerModel.phone_number,
+        CustomerModel.full_address,
+        CustomerModel.category,
+        CustomerModel.notes,
+        # a spreadsheet has no use for EWKB
+        func.ST_Y(CustomerModel.coordinates).label("latitude"),
+        func.ST_X(CustomerModel.coordinates).label("longitude"),
+    ]
+    return export_response(
+        "customer_repository", columns, filters,
+        ordering=[CustomerModel.created_at, CustomerModel.uuid],
+        params=params, filename="customers",
+    )
 
 
 @customer_blueprint.route('/categories', methods=['GET'])
@@ -14,6 +14,7 @@ from app.entrypoint.routes.customer_order import customer_order_blueprint
 from app.domains.customer_order.domain import CustomerOrderDomain
 from app.dto.customer_order import CustomerOrderWithItemsAndInvoiceCreate
 from app.dto.customer_order import CustomerOrderCheckoutCreate
+from app.dto.customer_order import CustomerOrderBulkVoid
 from app.dto.customer_order import CustomerOrderWithItemsAndInvoiceRead
 
 from app.dto.customer_order_item import CustomerOrderItemBulkRead, CustomerOrderItemRead
@@ -146,6 +147,20 @@ def delete_customer_order(uuid: str):
         uow.commit()
     return jsonify(result), 200
 
+@customer_order_blueprint.route("/void", methods=["POST"])
+@jwt_required()
+@scopes_required(PermissionScope.ADMIN.value,
+                 PermissionScope.SUPER_ADMIN.value
+                 )
+def void_customer_orders():
+    """DELETE /<uuid> for many orders, or for every order of a trip."""
+    payload = CustomerOrderBulkVoid(**request.json)
+    with SqlAlchemyUnitOfWork() as uow:
+        void_read = CustomerOrderDomain.void_customer_orders(uow=uow, payload=payload)
+        result = void_read.model_dump(mode="json")
+        uow.commit()
+    return jsonify(result), 200
+
 @customer_order_blueprint.route("/", methods=["GET"])
 @jwt_required()
 @scopes_required(PermissionScope.ADMIN.value,
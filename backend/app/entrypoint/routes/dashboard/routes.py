@@ -88,9 +88,9 @@ def overview():
     with SqlAlchemyUnitOfWork() as uow:
         s = uow.session
 
-        # One converter per request: it caches each day's rate and pulls at most
-        # once, so restating a whole window of orders costs one rate lookup per
-        # distinct day. Every amount is converted at ITS OWN day's rate before it
+        # One converter per request: it caches each day's rate and queues at most
+        # one backfill, so restating a whole window of orders costs one rate
+        # lookup per distinct day. Every amount is converted at ITS OWN day's rate before it
         # is summed — the only honest way to combine SYP and USD into one number.
         conv = CurrencyConverter(uow, target)
 
@@ -260,6 +260,9 @@ def overview():
                 "collected": _series(day_keys, collected_conv_by_day),
             },
         }
+        # a backfill queued for a rate gap must outlive this read
+        if conv.backfill_queued:
+            uow.commit()
     return jsonify(result), 200
 
 
@@ -480,6 +483,10 @@ def profitability():
                 continue
             salaries[k] += c
 
+        # a backfill queued for a rate gap must outlive this read
+        if conv.backfill_queued or cost_ctx["backfill_queued"]:
+            uow.commit()
+
     groups = []
     for k in key_order:
         rev = round(revenue[k], 2)
@@ -605,6 +612,10 @@ def _revenue_over_time_result(created_by_uuid=None):
             revenue[k] += rc
             debt[k] += dc
 
+        # a backfill queued for a rate gap must outlive this read
+        if conv.backfill_queued:
+            uow.commit()
+
     groups = []
     cum_rev = 0.0
     cum_debt = 0.0
@@ -780,6 +791,10 @@ def expenses_breakdown():
             by_period[k][_SALARIES_KEY] += c
             seg_totals[_SALARIES_KEY] += c
 
+        # a backfill queued for a rate gap must outlive this read
+        if conv.backfill_queued:
+            uow.commit()
+
     # segment order: salaries first, then expense categories in their enum order,
     # then any stray stored value — but only segments that actually have spend
     canonical = [_SALARIES_KEY] + [c.value for c in ExpenseCategory]
@@ -14,6 +14,7 @@ from app.dto.exchange_rate import (
     ExchangeRateUpdate,
 )
 from app.entrypoint.routes.common.auth import add_logged_user_to_payload, scopes_required
+from app.entrypoint.routes.common.background import accepted, wants_background
 from app.entrypoint.routes.common.errors import NotFoundError
 from app.entrypoint.routes.exchange_rate import exchange_rate_blueprint
 from models.common import ExchangeRate as ExchangeRateModel
@@ -131,9 +132,24 @@ def pull_exchange_rate():
 @jwt_required()
 @scopes_required(*WRITERS)
 def backfill_exchange_rates():
-    """Ingest sp-today's daily history for a range, up to a year back."""
+    """Ingest sp-today's daily history for a range, up to a year back.
+
+    A year is a slow scrape; `?background=true` queues it instead (202, poll
+    GET /job/<uuid>). Asking again for the same backfill while it is queued or
+    running answers with that job rather than queueing a second one.
+    """
     current_uuid = get_jwt_identity()
     params = ExchangeRatePullParams(**(request.json or {}))
+    # refuse an unpullable pair now, not minutes later inside the worker
+    ExchangeRateDomain._pullable_or_raise(params.from_currency, params.to_currency)
+
+    if wants_background():
+        with SqlAlchemyUnitOfWork() as uow:
+            job = ExchangeRateDomain.enqueue_backfill(
+                uow, params, created_by_uuid=current_uuid
+            )
+            uow.commit()
+            return accepted(job)
 
     with SqlAlchemyUnitOfWork() as uow:
         result = ExchangeRateDomain.backfill(
@@ -7,12 +7,12 @@ from app.dto.financial_account import (
     FinancialAccountRead,
     FinancialAccountUpdate,
     FinancialAccountListParams,
-    FinancialAccountPage,
 )
 from models.common import FinancialAccount as FinancialAccountModel
 
 from app.entrypoint.routes.financial_account import financial_account_blueprint
 from app.entrypoint.routes.common.errors import NotFoundError, BadRequestError
+from app.entrypoint.routes.common.serialization import dump_rows, page_response
 from app.entrypoint.routes.common.auth import scopes_required
 
 from app.domains.financial_account.domain import FinancialAccountDomain
@@ -40,6 +40,7 @@ def create_account():
         acct = FinancialAccountModel(**data)
         acct.created_by_uuid = current_user_uuid
         uow.financial_account_repository.save(model=acct, commit=True)
+        uow.financial_account_repository.prime_balances([acct])
         result = FinancialAccountRead.from_orm(acct).model_dump(mode='json')
     return jsonify(result), 201
 
@@ -60,6 +61,7 @@ def get_default_account():
         acct = FinancialAccountDomain.resolve_default(uow=uow, currency=currency)
         if not acct:
             raise NotFoundError(f'No default account for {currency}')
+        uow.financial_account_repository.prime_balances([acct])
         result = FinancialAccountRead.from_orm(acct).model_dump(mode='json')
     return jsonify(result), 200
 
@@ -74,6 +76,7 @@ def get_account(uuid: str):
         acct = uow.financial_account_repository.find_one(uuid=uuid, is_deleted=False)
         if not acct:
             raise NotFoundError("FinancialAccount not found")
+        uow.financial_account_repository.prime_balances([acct])
         result = FinancialAccountRead.from_orm(acct).model_dump(mode='json')
     return jsonify(result), 200
 
@@ -113,15 +116,8 @@ def list_accounts():
             page=params.page,
             per_page=params.per_page
         )
-        items = [
-            FinancialAccountRead.from_orm(ac).model_dump(mode='json')
-            for ac in page_obj.items
-        ]
-        result = FinancialAccountPage(
-            accounts=items,
-            total_count=page_obj.total,
-            page=page_obj.page,
-            per_page=page_obj.per_page,
-            pages=page_obj.pages
-        ).model_dump(mode='json')
-    return jsonify(result), 200
\ No newline at end of file
+        # latest snapshot + movements since, for the whole page in one query
+        uow.financial_account_repository.prime_balances(page_obj.items)
+        items = dump_rows(FinancialAccountRead, page_obj.items)
+
+    return page_response("accounts", items, page_obj)
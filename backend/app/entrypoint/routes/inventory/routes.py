@@ -13,6 +13,7 @@ from models.common import Inventory as InventoryModel
 from app.domains.inventory.domain import InventoryDomain
 from app.dto.common_enums import Currency
 from app.entrypoint.routes.inventory import inventory_blueprint
+from app.entrypoint.routes.common.serialization import dump_rows, page_response
 
 
 def _cost_currency_arg():
@@ -71,8 +72,8 @@ def get_inventory(uuid: str):
         cost_ctx = InventoryDomain.new_cost_context(currency=cost_currency or Currency.SYP)
         InventoryDomain.enrich_cost_per_unit(uow=uow, inventory_dto=result, cost_ctx=cost_ctx)
         result = result.model_dump(mode='json')
-        # rates pulled on the spot for missing days should outlive this read
-        if cost_ctx["rates_ingested"]:
+        # a backfill queued for a rate gap must outlive this read
+        if cost_ctx["backfill_queued"]:
             uow.commit()
     return jsonify(result), 200
 #
@@ -143,18 +144,12 @@ def list_inventories():
         for i in page_obj.items:
             dto = InventoryRead.from_orm(i)
             InventoryDomain.enrich_cost_per_unit(uow=uow, inventory_dto=dto, cost_ctx=cost_ctx)
-            items.append(dto.model_dump(mode='json'))
-        # rates pulled on the spot for missing days should outlive this read
-        if cost_ctx["rates_ingested"]:
+            items.append(dto)
+        # a backfill queued for a rate gap must outlive this read
+        if cost_ctx["backfill_queued"]:
             uow.commit()
-        result = InventoryPage(
-            inventories=items,
-            total_count=page_obj.total,
-            page=page_obj.page,
-            per_page=page_obj.per_page,
-            pages=page_obj.pages
-        ).model_dump(mode='json')
-    return jsonify(result), 200
+        items = dump_rows(InventoryRead, items)
+    return page_response("inventories", items, page_obj)
 
 @inventory_blueprint.route('/manual-add', methods=['POST'])
 @jwt_required()
@@ -314,19 +309,9 @@ def _scoped_material_uuids(uow, material_uuids):
     """Keep only materials this tenant owns. The caller supplies these uuids,
     so they must be filtered before they reach ANY query — otherwise another
     tenant's material name/unit could be echoed back in the response."""
-    from models.common import Material as MAT
-    if not material_uuids:
+    if not material_uuids or uow.account_uuid is None:
         return []
-    rows = (
-        uow.session.query(MAT.uuid)
-        .filter(
-            MAT.uuid.in_(material_uuids),
-            MAT.account_uuid == uow.account_uuid,
-            MAT.is_deleted == False,
-        )
-        .all()
-    )
-    owned = {r[0] for r in rows}
+    owned = uow.material_repository.get_many(material_uuids)
     return [m for m in material_uuids if m in owned]
 
 
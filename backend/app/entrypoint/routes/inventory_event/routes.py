@@ -11,6 +11,8 @@ from app.dto.inventory_event import (
 from models.common import InventoryEvent as InventoryEventModel
 from app.domains.inventory_event.domain import InventoryEventDomain
 from app.entrypoint.routes.inventory_event import inventory_event_blueprint
+from app.entrypoint.routes.common.export import created_range_filters, export_response
+from app.dto.export import ExportParams
 from app.dto.inventory_event import InventoryEventType
 from app.entrypoint.routes.common.errors import BadRequestError
 from app.dto.auth import PermissionScope
@@ -141,6 +143,41 @@ def list_inventory_events():
     return jsonify(result), 200
 
 
+@inventory_event_blueprint.route('/export', methods=['GET'])
+@jwt_required()
+@scopes_required(PermissionScope.ADMIN.value,
+                 PermissionScope.SUPER_ADMIN.value,
+                 PermissionScope.ACCOUNTANT.value,
+                 PermissionScope.OPERATION_MANAGER.value,
+                 PermissionScope.OPERATOR.value,
+                 PermissionScope.SALES.value,
+                 PermissionScope.DRIVER.value)
+def export_inventory_events():
+    """Every inventory event as streamed NDJSON or CSV (?format=), oldest first."""
+    params = ExportParams(**request.args)
+    filters = [InventoryEventModel.is_deleted == False,
+               *created_range_filters(InventoryEventModel, params)]
+    columns = [
+        InventoryEventModel.uuid,
+        InventoryEventModel.created_at,
+        InventoryEventModel.inventory_uuid,
+        InventoryEventModel.material_uuid,
+        InventoryEventModel.event_type,
+        InventoryEventModel.quantity,
+        InventoryEventModel.cost_per_unit,
+        InventoryEventModel.currency,
+        InventoryEventModel.purchase_order_item_uuid,
+        InventoryEventModel.customer_order_item_uuid,
+        InventoryEventModel.process_uuid,
+        InventoryEventModel.notes,
+    ]
+    return export_response(
+        "inventory_event_repository", columns, filters,
+        ordering=[InventoryEventModel.created_at, InventoryEventModel.uuid],
+        params=params, filename="inventory_events",
+    )
+
+
 # InventoryEventType route
 @inventory_event_blueprint.route('/event_types', methods=['GET'])
 def list_inventory_event_types():
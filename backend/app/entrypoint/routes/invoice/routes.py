@@ -2,6 +2,10 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 from app.entrypoint.routes.common.errors import NotFoundError
+from app.entrypoint.routes.common.serialization import dump_rows, page_response
+from app.entrypoint.routes.common.pagination import paginate
+from app.entrypoint.routes.common.export import created_range_filters, export_response
+from app.dto.export import ExportParams
 from app.dto.invoice import (
     InvoiceCreate,
     InvoiceUpdate,
@@ -97,20 +101,36 @@ def list_invoices():
     if params.uuid:
         filters.append(InvoiceModel.uuid == params.uuid)
     with SqlAlchemyUnitOfWork() as uow:
-        page_obj = uow.invoice_repository.find_all_by_filters_paginated(
-            filters=filters,
-            page=params.page,
-            per_page=params.per_page
-        )
-        items = [InvoiceRead.from_orm(i).model_dump(mode='json') for i in page_obj.items]
-        result = InvoicePage(
-            invoices=items,
-            total_count=page_obj.total,
-            page=page_obj.page,
-            per_page=page_obj.per_page,
-            pages=page_obj.pages
-        ).model_dump(mode='json')
-    return jsonify(result), 200
+        page_obj = paginate(uow.invoice_repository, filters, params)
+        items = dump_rows(InvoiceRead, page_obj.items)
+    return page_response("invoices", items, page_obj)
+
+@invoice_blueprint.route('/export', methods=['GET'])
+@jwt_required()
+@scopes_required(PermissionScope.ADMIN.value,
+                 PermissionScope.SUPER_ADMIN.value,
+                 PermissionScope.ACCOUNTANT.value,
+                 PermissionScope.SALES.value,
+                 PermissionScope.DRIVER.value)
+def export_invoices():
+    """Every invoice header as streamed NDJSON or CSV (?format=), oldest first."""
+    params = ExportParams(**request.args)
+    filters = [InvoiceModel.is_deleted == False,
+               *created_range_filters(InvoiceModel, params)]
+    columns = [
+        InvoiceModel.uuid,
+        InvoiceModel.created_at,
+        InvoiceModel.customer_uuid,
+        InvoiceModel.customer_order_uuid,
+        InvoiceModel.currency,
+        InvoiceModel.due_date,
+        InvoiceModel.notes,
+    ]
+    return export_response(
+        "invoice_repository", columns, filters,
+        ordering=[InvoiceModel.created_at, InvoiceModel.uuid],
+        params=params, filename="invoices",
+    )
 
 @invoice_blueprint.route('/status', methods=['GET'])
 def list_invoice_status():
@@ -0,0 +1,7 @@
+from flask import Blueprint
+
+# Not in RESOURCE_SET: a job is only ever the caller's own request, deferred,
+# and the resource ACL was applied when that request enqueued it.
+job_blueprint = Blueprint('job', __name__)
+
+from app.entrypoint.routes.job import routes  # noqa: E402,F401
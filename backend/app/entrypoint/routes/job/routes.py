@@ -0,0 +1,32 @@
+"""Status polling for background jobs (see jobs/__main__.py).
+
+A caller sees the jobs it enqueued; a tenant admin sees every job in the
+account. Scoped by account like any other read, so nobody polls another
+tenant's job even with its uuid in hand.
+"""
+from flask import g, jsonify
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+from app.domains.job.domain import JobDomain
+from app.dto.auth import PermissionScope
+from app.entrypoint.routes.common.auth import scopes_required
+from app.entrypoint.routes.job import job_blueprint
+
+
+@job_blueprint.route('/<string:uuid>', methods=['GET'])
+@jwt_required()
+@scopes_required(
+    PermissionScope.ADMIN.value,
+    PermissionScope.SUPER_ADMIN.value,
+    PermissionScope.OPERATION_MANAGER.value,
+    PermissionScope.OPERATOR.value,
+    PermissionScope.ACCOUNTANT.value,
+    PermissionScope.DRIVER.value,
+    PermissionScope.SALES.value,
+)
+def get_job(uuid: str):
+    created_by = None if getattr(g, "is_admin", False) else get_jwt_identity()
+    with SqlAlchemyUnitOfWork() as uow:
+        dto = JobDomain.get(uow, uuid=uuid, created_by_uuid=created_by)
+    return jsonify(dto.model_dump(mode='json')), 200
@@ -195,8 +195,8 @@ def material_inventory_summary(uuid: str):
                 "expiration_date": inv.expiration_date.isoformat() if inv.expiration_date else None,
             })
         lots.sort(key=lambda l: l["created_at"] or "")
-        # rates pulled on the spot for missing days should outlive this read
-        if cost_ctx["rates_ingested"]:
+        # a backfill queued for a rate gap must outlive this read
+        if cost_ctx["backfill_queued"]:
             uow.commit()
     return jsonify({"events": events, "lots": lots}), 200
 
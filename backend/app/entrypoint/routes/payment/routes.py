@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 from app.entrypoint.routes.common.errors import NotFoundError
+from app.entrypoint.routes.common.serialization import dump_rows, page_response
+from app.entrypoint.routes.common.pagination import paginate
+from app.entrypoint.routes.common.export import created_range_filters, export_response
+from app.dto.export import ExportParams
 from app.dto.payment import (
     PaymentCreate,
     PaymentRead,
@@ -106,20 +110,40 @@ def list_payments():
     if params.financial_account_uuid:
         filters.append(PaymentModel.financial_account_uuid == params.financial_account_uuid)
     with SqlAlchemyUnitOfWork() as uow:
-        page_obj = uow.payment_repository.find_all_by_filters_paginated(
-            filters=filters,
-            page=params.page,
-            per_page=params.per_page
-        )
-        items = [PaymentRead.from_orm(p).model_dump(mode='json') for p in page_obj.items]
-        result = PaymentPage(
-            payments=items,
-            total_count=page_obj.total,
-            page=page_obj.page,
-            per_page=page_obj.per_page,
-            pages=page_obj.pages
-        ).model_dump(mode='json')
-    return jsonify(result), 200
+        page_obj = paginate(uow.payment_repository, filters, params)
+        items = dump_rows(PaymentRead, page_obj.items)
+    return page_response("payments", items, page_obj)
+
+@payment_blueprint.route('/export', methods=['GET'])
+@jwt_required()
+@scopes_required(PermissionScope.ADMIN.value,
+                 PermissionScope.SUPER_ADMIN.value,
+                 PermissionScope.SALES.value,
+                 PermissionScope.DRIVER.value,
+                 PermissionScope.ACCOUNTANT.value
+                 )
+def export_payments():
+    """Every payment as streamed NDJSON or CSV (?format=), oldest first."""
+    params = ExportParams(**request.args)
+    filters = [PaymentModel.is_deleted == False,
+               *created_range_filters(PaymentModel, params)]
+    columns = [
+        PaymentModel.uuid,
+        PaymentModel.created_at,
+        PaymentModel.invoice_uuid,
+        PaymentModel.debit_note_item_uuid,
+        PaymentModel.financial_account_uuid,
+        PaymentModel.amount,
+        PaymentModel.currency,
+        PaymentModel.payment_method,
+        PaymentModel.trip_stop_uuid,
+        PaymentModel.notes,
+    ]
+    return export_response(
+        "payment_repository", columns, filters,
+        ordering=[PaymentModel.created_at, PaymentModel.uuid],
+        params=params, filename="payments",
+    )
 
 # currency enum route list
 @payment_blueprint.route('/currencies', methods=['GET'])
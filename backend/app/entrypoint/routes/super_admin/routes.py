@@ -23,7 +23,6 @@ from models.common import (
     MONEY_TOLERANCE,
     Account as AccountModel,
     AccountLedgerEntry as LedgerModel,
-    User as UserModel,
 )
 from sqlalchemy import func
 
@@ -31,16 +30,7 @@ SUPER = PermissionScope.SUPER_ADMIN.value
 
 
 def _balances(uow, account_uuid: str) -> dict:
-    rows = (
-        uow.session.query(LedgerModel.currency, func.sum(LedgerModel.amount))
-        .filter(
-            LedgerModel.account_uuid == account_uuid,
-            LedgerModel.is_deleted.is_(False),
-        )
-        .group_by(LedgerModel.currency)
-        .all()
-    )
-    return {cur: round(total, 2) for cur, total in rows}
+    return uow.account_ledger_repository.balances([account_uuid])[account_uuid]
 
 
 def _account_or_404(uow, account_uuid: str) -> AccountModel:
@@ -50,15 +40,24 @@ def _account_or_404(uow, account_uuid: str) -> AccountModel:
     return account
 
 
+def _account_reads(uow, accounts: list) -> list[dict]:
+    """AccountRead for each account, with user counts and ledger balances
+    fetched for all of them at once — two grouped queries for a whole page, not
+    two per row."""
+    uuids = [a.uuid for a in accounts]
+    user_counts = uow.account_repository.user_counts(uuids)
+    balances = uow.account_ledger_repository.balances(uuids)
+    reads = []
+    for account in accounts:
+        dto = AccountRead.from_orm(account)
+        dto.user_count = user_counts[account.uuid]
+        dto.balances = balances[account.uuid]
+        reads.append(dto.model_dump(mode="json"))
+    return reads
+
+
 def _account_read(uow, account: AccountModel) -> dict:
-    dto = AccountRead.from_orm(account)
-    dto.user_count = (
-        uow.session.query(func.count(UserModel.uuid))
-        .filter(UserModel.account_uuid == account.uuid, UserModel.is_deleted.is_(False))
-        .scalar()
-    )
-    dto.balances = _balances(uow, account.uuid)
-    return dto.model_dump(mode="json")
+    return _account_reads(uow, [account])[0]
 
 
 @super_admin_blueprint.route("/accounts", methods=["GET"])
@@ -73,7 +72,7 @@ def list_accounts():
             per_page=per_page,
         )
         result = {
-            "accounts": [_account_read(uow, a) for a in pagination.items],
+            "accounts": _account_reads(uow, pagination.items),
             "total_count": pagination.total,
             "page": pagination.page,
             "per_page": pagination.per_page,
@@ -11,8 +11,13 @@ from models.common import TaskExecution as TaskExecutionModel
 from app.dto.task_execution import TaskExecutionRead
 from app.dto.task_execution import TaskExecutionListParams, TaskExecutionPage
 from app.domains.task_execution.domain import TaskExecutionDomain
+from app.domains.task_execution.workflow_operators.operator_entry_point import REGISTRY
 from app.dto.task_execution import TaskExecutionComplete
 from app.dto.task_execution import OperatorType
+from app.dto.workflow_execution import WorkflowStatus
+from app.dto.job import JobKind
+from app.domains.job.domain import JobDomain
+from app.entrypoint.routes.common.background import accepted, wants_background
 
 
 
@@ -89,9 +94,36 @@ def list_task_executions():
     PermissionScope.DRIVER.value,
     PermissionScope.SALES.value)
 def task_complete():
+    """Complete a task and run its operator.
+
+    Trip routing can take tens of seconds; with `?background=true` the task is
+    checked here and completed by the job worker instead (202, poll
+    GET /job/<uuid>). A second click while that job is live gets the same job,
+    and an already-completed task is refused rather than queued to run again.
+    """
     current_user_uuid = get_jwt_identity()
     payload = TaskExecutionComplete(**request.json)
     payload.completed_by_uuid = current_user_uuid
+    if wants_background():
+        with SqlAlchemyUnitOfWork() as uow:
+            task_exe = uow.task_execution_repository.find_one(uuid=payload.uuid)
+            # the cheap refusals up front, so a bad request is still a 4xx and
+            # not a job that fails later
+            if not task_exe or (task_exe.workflow_execution and task_exe.workflow_execution.is_deleted):
+                raise NotFoundError(f"TaskExecution not found with uuid: {payload.uuid}")
+            if task_exe.status in [WorkflowStatus.CANCELLED.value, WorkflowStatus.FAILED.value,
+                                   WorkflowStatus.NOT_STARTED.value, WorkflowStatus.COMPLETED.value]:
+                raise BadRequestError(f"TaskExecution cannot be completed with status: {task_exe.status}")
+            job = JobDomain.enqueue(
+                uow,
+                kind=JobKind.TASK_EXECUTION_COMPLETE,
+                payload=payload.model_dump(mode="json"),
+                dedupe_key=f"task_execution_complete:{payload.uuid}",
+                created_by_uuid=current_user_uuid,
+            )
+            uow.commit()
+            return accepted(job)
+
     with SqlAlchemyUnitOfWork() as uow:
         dto = TaskExecutionDomain.complete_task_execution(uow=uow,payload=payload)
         uow.commit()
@@ -107,6 +139,15 @@ def list_task_operators():
     return jsonify(values), 200
 
 
+@task_execution_blueprint.route("/operator-metrics", methods=["GET"])
+@jwt_required()
+@scopes_required(PermissionScope.SUPER_ADMIN.value)
+def operator_metrics():
+    """Calls, errors, wall time and SQL statements per workflow operator since
+    this process started. Each worker process reports its own."""
+    return jsonify(REGISTRY.metrics.snapshot()), 200
+
+
 @task_execution_blueprint.route("/<string:uuid>", methods=["GET"])
 @jwt_required()
 @scopes_required(
@@ -4,6 +4,8 @@ from sqlalchemy import func
 from shapely import wkt as shapely_wkt
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 from app.entrypoint.routes.common.errors import ApiError, BadRequestError, NotFoundError
+from app.entrypoint.routes.common.serialization import dump_rows, page_response
+from app.entrypoint.routes.common.pagination import paginate
 from app.dto.trip import (
     TripCreate,
     TripRead,
@@ -237,115 +239,14 @@ def _assigned_username_for_wfe(uow, wfe_uuid):
 )
 def get_trip_activity(uuid: str):
     """Stops, orders, fulfillments (vehicle sales) and payments at this trip's stops."""
-    from app.utils.geom_utils import wkt_or_wkb_to_lat_lon
+    from app.domains.trip.activity import trip_activity
 
     with SqlAlchemyUnitOfWork() as uow:
         trip = uow.trip_repository.find_one(uuid=uuid, is_deleted=False)
         if not trip:
             raise NotFoundError("Trip not found")
-
-        def customer_name(customer):
-            if not customer:
-                return None
-            return customer.company_name or customer.full_name
-
-        material_names: dict = {}
-        def material_name(material_uuid):
-            if material_uuid not in material_names:
-                mat = uow.material_repository.find_one(uuid=material_uuid)
-                material_names[material_uuid] = mat.name if mat else material_uuid
-            return material_names[material_uuid]
-
-        stops = []
-        for stop in trip.stops:
-            task_exe = (
-                uow.task_execution_repository.find_one(uuid=stop.task_execution_uuid)
-                if stop.task_execution_uuid else None
-            )
-            try:
-                latlon = wkt_or_wkb_to_lat_lon(stop.coordinates)
-            except Exception:
-                latlon = None
-            stops.append({
-                "uuid": stop.uuid,
-                "index": stop.index,
-                "customer_uuid": stop.customer_uuid,
-                "customer_name": customer_name(stop.customer),
-                "status": task_exe.status if task_exe else stop.status,
-                "outcome": stop.outcome,
-                "notes": stop.notes,
-                "coordinates": latlon,  # "lat,lon"
-                "created_at": stop.created_at.isoformat() if stop.created_at else None,
-                "completed_at": task_exe.end_time.isoformat() if task_exe and task_exe.end_time else None,
-            })
-        stops.sort(key=lambda s: (s["index"] is None, s["index"], s["created_at"] or ""))
-
-        orders, fulfillments, payments = [], [], []
-        for stop in trip.stops:
-            for o in stop.customer_orders:
-                if o.is_deleted:
-                    continue
-                items = []
-                for item in o.customer_order_items:
-                    if item.is_deleted:
-                        continue
-                    price = item.invoice_item.price_per_unit if item.invoice_item else None
-                    items.append({
-                        "material_name": material_name(item.material_uuid),
-                        "quantity": item.quantity,
-                        "price_per_unit": price,
-                        "amount": (item.quantity or 0) * price if price is not None else None,
-                    })
-                orders.append({
-                    "uuid": o.uuid,
-                    "created_at": o.created_at.isoformat() if o.created_at else None,
-                    "customer_name": customer_name(o.customer),
-                    "total": o.total_adjusted_amount,
-                    "amount_due": o.net_amount_due,
-                    "amount_paid": o.net_amount_paid,
-                    "currency": o.currency,
-                    "is_paid": o.is_paid,
-                    "is_fulfilled": o.is_fulfilled,
-                    "items": items,
-                })
-            for ev in stop.vehicle_inventory_events:
-                if ev.is_deleted or ev.event_type != "sale":
-                    continue
-                item = ev.customer_order_item
-                order = item.customer_order if item else None
-                # legacy voids: the order was deleted without cascading — its
-                # leftover sale events must not count as trip activity
-                if (item and item.is_deleted) or (order and order.is_deleted):
-                    continue
-                fulfillments.append({
-                    "created_at": ev.created_at.isoformat() if ev.created_at else None,
-                    "material_name": material_name(ev.material_uuid),
-                    "quantity": -ev.quantity,  # stored as negative delta; report as positive
-                    "customer_name": customer_name(order.customer) if order else None,
-                    "customer_order_uuid": order.uuid if order else None,
-                })
-            for p in stop.payments:
-                if p.is_deleted:
-                    continue
-                inv = p.invoice
-                order = inv.customer_order if inv else None
-                if (inv and inv.is_deleted) or (order and order.is_deleted):
-                    continue
-                payments.append({
-                    "created_at": p.created_at.isoformat() if p.created_at else None,
-                    "amount": p.amount,
-                    "currency": p.currency,
-                    "customer_name": customer_name(order.customer) if order else None,
-                    "customer_order_uuid": order.uuid if order else None,
-                })
-
-        newest_first = lambda rows: sorted(rows, key=lambda r: r["created_at"] or "", reverse=True)
-        result = {
-            "stops": stops,
-            "orders": newest_first(orders),
-            "fulfillments": newest_first(fulfillments),
-            "payments": newest_first(payments),
-        }
+        # a fixed number of statements however many stops the trip has
+        result = trip_activity(uow, trip)
     return jsonify(result), 200
 #
 #
@@ -426,11 +327,7 @@ def list_trips():
     filters.append(TripModel.is_deleted.is_(False))
 
     with SqlAlchemyUnitOfWork() as uow:
-        page = uow.trip_repository.find_all_by_filters_paginated(
-            filters=filters,
-            page=params.page,
-            per_page=params.per_page,
-        )
+        page = paginate(uow.trip_repository, filters, params)
 
         # batch-resolve each trip's assignee (start_trip result, stored as
         # username or uuid) — two queries for the whole page, no N+1
@@ -487,15 +384,9 @@ def list_trips():
             dto = TripRead.from_orm(m)
             dto.assigned_username = assigned_by_wfe.get(m.workflow_execution_uuid)
             dto.audited_by_username = auditor_names.get(m.audited_by_uuid)
-            items.append(dto.model_dump(mode="json"))
-        result = TripPage(
-            items=items,
-            total_count=page.total,
-            page=page.page,
-            per_page=page.per_page,
-            pages=page.pages,
-        ).model_dump(mode="json")
-    return jsonify(result), 200
+            items.append(dto)
+        items = dump_rows(TripRead, items)
+    return page_response("items", items, page)
 
 
 @trip_blueprint.route("/<string:uuid>", methods=["DELETE"])
@@ -14,8 +14,6 @@ from app.dto.trip_stop import (
     TripStopListParams,
     TripStopPage,
 )
-from datetime import timedelta
-
 from app.entrypoint.routes.common.analytics import (
     bucket_arg,
     csv_arg,
@@ -336,39 +334,53 @@ def _user_orders_query(uow, user, start, end, material_uuids=None):
     return q
 
 
-def _money_by_currency(orders):
-    """Revenue / paid / unpaid per currency for a list of order rows.
+def _money_by_currency(uow, orders_q, bucket=None):
+    """Revenue / paid / unpaid per currency over the orders `orders_q` selects.
+
+    ONE grouped statement: the LIVE invoices of those orders, summed through
+    the Invoice hybrids' SQL expressions. Loading the orders and reading the
+    order-level hybrids off each one issued several subqueries per order — a
+    salesperson's year is thousands of them. A voided invoice still drops out,
+    and an invoice-less order still contributes nothing rather than counting as
+    "paid".
 
-    Read off the order-level hybrids (each subqueries LIVE invoices), so a
-    voided invoice drops out and an invoice-less order contributes 0 instead of
-    counting as "paid".
+    With `bucket` ("day"/"week"/"month"), grouped by the order's created_at
+    truncated to it as well: returns {period: (revenue, paid, unpaid)} instead.
     """
-    revenue, paid, unpaid = {}, {}, {}
-    invoiced_orders = 0
-    for o in orders:
-        currency = o.currency
-        if not currency:
-            continue  # no live invoice -> no money to attribute
-        invoiced_orders += 1
-        revenue[currency] = round(
-            revenue.get(currency, 0.0) + float(o.total_adjusted_amount or 0), 2
-        )
-        paid[currency] = round(
-            paid.get(currency, 0.0) + float(o.net_amount_paid or 0), 2
-        )
-        unpaid[currency] = round(
-            unpaid.get(currency, 0.0) + float(o.net_amount_due or 0), 2
+    from models.common import CustomerOrder as CO, Invoice
+
+    orders = orders_q.with_entities(
+        CO.uuid.label("uuid"), CO.created_at.label("created_at")
+    ).subquery()
+    keys = [func.date_trunc(bucket, orders.c.created_at)] if bucket else []
+    rows = (
+        uow.session.query(
+            *keys,
+            Invoice.currency,
+            func.sum(Invoice.total_adjusted_amount),
+            func.sum(Invoice.net_amount_paid),
         )
-    return revenue, paid, unpaid, invoiced_orders
-
+        .select_from(orders)
+        .join(Invoice, Invoice.customer_order_uuid == orders.c.uuid)
+        .filter(Invoice.is_deleted.is_(False))
+        .group_by(*keys, Invoice.currency)
+        .all()
+    )
 
-def _bucket_key(dt, bucket):
-    if bucket == "month":
-        return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    if bucket == "week":
-        base = dt.replace(hour=0, minute=0, second=0, microsecond=0)
-        return base - timedelta(days=base.weekday())
-    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    result = {}
+    for row in rows:
+        period, (currency, total, paid_sum) = (row[0], row[1:]) if bucket else (None, row)
+        if not currency or (bucket and period is None):
+            continue
+        revenue, paid, unpaid = result.setdefault(period, ({}, {}, {}))
+        total, paid_sum = float(total or 0), float(paid_sum or 0)
+        revenue[currency] = round(total, 2)
+        paid[currency] = round(paid_sum, 2)
+        # net_amount_due is total_adjusted_amount - net_amount_paid, per invoice
+        unpaid[currency] = round(total - paid_sum, 2)
+    if bucket:
+        return result
+    return result.get(None, ({}, {}, {}))
 
 
 @trip_stop_blueprint.route("/analytics/user-summary", methods=["GET"])
@@ -376,6 +388,8 @@ def _bucket_key(dt, bucket):
 @scopes_required(*_USER_ANALYTICS_SCOPES)
 def analytics_user_summary():
     """Totals for one user: stops, orders, revenue/paid/unpaid per currency."""
+    from sqlalchemy import exists, select
+    from models.common import CustomerOrder as CO, Invoice
     user_uuid = request.args.get("user_uuid")
     if not user_uuid:
         raise BadRequestError("user_uuid is required")
@@ -385,17 +399,35 @@ def analytics_user_summary():
 
     with SqlAlchemyUnitOfWork() as uow:
         user = _user_or_404(uow, user_uuid)
-        stops_q = _user_stops_query(uow, user, start, end)
-        stops_total = stops_q.count()
-        sold_stops = stops_q.filter(TripStopModel.outcome.ilike("sale%")).count()
-        orders = _user_orders_query(uow, user, start, end, material_uuids).all()
-        revenue, paid, unpaid, invoiced = _money_by_currency(orders)
+        stops = (
+            _user_stops_query(uow, user, start, end)
+            .with_entities(TripStopModel.uuid, TripStopModel.outcome)
+            .subquery()
+        )
+        orders_q = _user_orders_query(uow, user, start, end, material_uuids)
+        orders = orders_q.with_entities(CO.uuid).subquery()
+        # every count in one round trip; "invoiced" is an order with a live
+        # invoice, the same orders the money below is attributed to
+        stops_total, sold_stops, orders_total, invoiced = uow.session.query(
+            select(func.count()).select_from(stops).scalar_subquery(),
+            select(func.count()).select_from(stops)
+            .where(stops.c.outcome.ilike("sale%")).scalar_subquery(),
+            select(func.count()).select_from(orders).scalar_subquery(),
+            select(func.count()).select_from(orders).where(
+                exists().where(
+                    Invoice.customer_order_uuid == orders.c.uuid,
+                    Invoice.is_deleted.is_(False),
+                    Invoice.currency.isnot(None),
+                )
+            ).scalar_subquery(),
+        ).one()
+        revenue, paid, unpaid = _money_by_currency(uow, orders_q)
         result = {
             "user_uuid": user.uuid,
             "username": user.username,
             "stops": stops_total,
             "stops_with_sale": sold_stops,
-            "orders": len(orders),
+            "orders": orders_total,
             "orders_invoiced": invoiced,
             "revenue": revenue,
             "paid": paid,
@@ -410,7 +442,6 @@ def analytics_user_summary():
 def analytics_user_sales_over_time():
     """Revenue per bucket for one user, plus the pre-window baseline so the
     caller can draw a true cumulative curve."""
-    from collections import defaultdict
     from models.common import CustomerOrder as CO
     user_uuid = request.args.get("user_uuid")
     if not user_uuid:
@@ -422,30 +453,31 @@ def analytics_user_sales_over_time():
 
     with SqlAlchemyUnitOfWork() as uow:
         user = _user_or_404(uow, user_uuid)
-        orders = _user_orders_query(uow, user, start, end, material_uuids).all()
-        # bucketed in Python: revenue comes from per-order hybrid subqueries,
-        # which can't be GROUP BY'd in SQL without re-deriving all of them
-        per_bucket = defaultdict(lambda: {"revenue": {}, "orders": 0})
-        for o in orders:
-            if not o.created_at:
-                continue
-            slot = per_bucket[_bucket_key(o.created_at, bucket).isoformat()]
-            slot["orders"] += 1
-            currency = o.currency
-            if currency:
-                slot["revenue"][currency] = round(
-                    slot["revenue"].get(currency, 0.0)
-                    + float(o.total_adjusted_amount or 0),
-                    2,
-                )
+        orders_q = _user_orders_query(uow, user, start, end, material_uuids)
+        # bucketed in SQL: order counts in one grouped statement, revenue in
+        # another (see _money_by_currency) — no order is loaded
+        expr = func.date_trunc(bucket, CO.created_at)
+        counts = (
+            orders_q.with_entities(expr, func.count(CO.uuid))
+            .filter(CO.created_at.isnot(None))
+            .group_by(expr)
+            .all()
+        )
+        revenue = _money_by_currency(uow, orders_q, bucket=bucket)
+        per_bucket = {
+            period.isoformat(): {
+                "revenue": revenue.get(period, ({},))[0],
+                "orders": int(count or 0),
+            }
+            for period, count in counts
+        }
         baseline = {}
         if start:
             before = (
                 _user_orders_query(uow, user, None, None, material_uuids)
                 .filter(CO.created_at < start)
-                .all()
             )
-            baseline, _, _, _ = _money_by_currency(before)
+            baseline, _, _ = _money_by_currency(uow, before)
         result = {
             "bucket": bucket,
             "baseline": baseline,
@@ -4,13 +4,13 @@ from flask_jwt_extended import get_jwt_identity, jwt_required
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 from app.entrypoint.routes.common.errors import NotFoundError
 from app.entrypoint.routes.common.auth import scopes_required, add_logged_user_to_payload
+from app.entrypoint.routes.common.serialization import dump_rows, page_response
 from app.dto.auth import PermissionScope
 from app.dto.vehicle_inventory import (
     VehicleInventoryCreate,
     VehicleInventoryUpdate,
     VehicleInventoryRead,
     VehicleInventoryListParams,
-    VehicleInventoryPage,
 )
 from models.common import VehicleInventory as VehicleInventoryModel
 from app.domains.vehicle_inventory.domain import VehicleInventoryDomain
@@ -49,6 +49,7 @@ def get_vehicle_inventory(uuid: str):
         inv = uow.vehicle_inventory_repository.find_one(uuid=uuid, is_deleted=False)
         if not inv:
             raise NotFoundError('Vehicle inventory not found')
+        uow.vehicle_inventory_repository.prime_quantities([inv])
         result = VehicleInventoryRead.from_orm(inv).model_dump(mode='json')
     return jsonify(result), 200
 
@@ -66,6 +67,7 @@ def update_vehicle_inventory(uuid: str):
         for field, val in updates.items():
             setattr(inv, field, val)
         uow.vehicle_inventory_repository.save(model=inv, commit=True)
+        uow.vehicle_inventory_repository.prime_quantities([inv])
         result = VehicleInventoryRead.from_orm(inv).model_dump(mode='json')
     return jsonify(result), 200
 
@@ -101,12 +103,8 @@ def list_vehicle_inventories():
             page=params.page,
             per_page=params.per_page,
         )
-        items = [VehicleInventoryRead.from_orm(i).model_dump(mode='json') for i in page_obj.items]
-        result = VehicleInventoryPage(
-            vehicle_inventories=items,
-            total_count=page_obj.total,
-            page=page_obj.page,
-            per_page=page_obj.per_page,
-            pages=page_obj.pages,
-        ).model_dump(mode='json')
-    return jsonify(result), 200
+        # every row's stock in one grouped sum, not a load of its whole event history
+        uow.vehicle_inventory_repository.prime_quantities(page_obj.items)
+        items = dump_rows(VehicleInventoryRead, page_obj.items)
+
+    return page_response("vehicle_inventories", items, page_obj)
@@ -2,6 +2,8 @@
 from flask import Blueprint, request, jsonify
 from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 from app.entrypoint.routes.common.errors import NotFoundError, BadRequestError
+from app.entrypoint.routes.common.serialization import dump_rows, page_response
+from app.entrypoint.routes.common.pagination import paginate
 from app.dto.workflow import (
     WorkflowCreate,
     WorkflowRead,
@@ -19,6 +21,7 @@ from app.domains.workflow.domain import WorkflowDomain
 from app.dto.workflow import WorkflowTags
 from app.domains.workflow_execution.domain import WorkflowExecutionDomain
 from app.dto.workflow_execution import (
+    WorkflowExecutionBulkCancel,
     WorkflowExecutionCreate,
     WorkflowExecutionRead,
     WorkflowStatus,
@@ -502,25 +505,15 @@ def list_workflow_executions():
                 filters.append(owned_or_assigned_filter(target))
 
         filters.append(WorkflowExecutionModel.is_deleted.is_(False))
-        page = uow.workflow_execution_repository.find_all_by_filters_paginated(
-            filters=filters,
-            page=params.page,
-            per_page=params.per_page
-        )
+        page = paginate(uow.workflow_execution_repository, filters, params)
         items = []
         for workflow_exe in page.items:
             read = WorkflowExecutionRead.from_orm(workflow_exe)
             read.trip_name = _trip_name_for(workflow_exe)
-            items.append(read.model_dump(mode="json"))
-        result = WorkflowExecutionPage(
-            workflow_executions=items,
-            total_count=page.total,
-            page=page.page,
-            per_page=page.per_page,
-            pages=page.pages
-        ).model_dump(mode="json")
+            items.append(read)
+        items = dump_rows(WorkflowExecutionRead, items)
 
-    return jsonify(result), 200
+    return page_response("workflow_executions", items, page)
 
 
 @workflow_execution_blueprint.route("/cancel/<string:uuid>", methods=["POST"])
@@ -542,6 +535,22 @@ def cancel_workflow_execution(uuid: str):
         uow.commit()
     return jsonify(dto.model_dump(mode="json")), 200
 
+@workflow_execution_blueprint.route("/cancel", methods=["POST"])
+@jwt_required()
+@scopes_required(
+    PermissionScope.ADMIN.value,
+    PermissionScope.SUPER_ADMIN.value,
+    PermissionScope.OPERATION_MANAGER.value)
+def cancel_workflow_executions():
+    """/cancel/<uuid> for many executions, or for every stale one still running
+    that started before `started_before`."""
+    payload = WorkflowExecutionBulkCancel(**request.json)
+    with SqlAlchemyUnitOfWork() as uow:
+        cancel_read = WorkflowExecutionDomain.cancel_workflow_executions(uow=uow, payload=payload)
+        result = cancel_read.model_dump(mode="json")
+        uow.commit()
+    return jsonify(result), 200
+
 @workflow_execution_blueprint.route("/status", methods=["GET"])
 def list_workflow_status():
     """
@@ -1,4 +1,5 @@
-"""Daily platform jobs: subscription charges, and the USD->SYP exchange rate.
+"""Daily platform jobs: subscription charges, the USD->SYP exchange rate, and
+financial account balance snapshots.
 
 Runs as its own compose service on the backend image, the same way
 `location_ingest` does:
@@ -13,9 +14,10 @@ restart at 02:05 — and both deploy paths take the whole stack down, twice. Her
 database is the schedule and the clock only decides how often to look, so a tick
 lost to a deploy is picked up by the next one.
 
-That only works because both tasks are idempotent against their own rows: billing
-bills from MAX(period_end) and skips an account already covered, and the rate
-upserts against a unique index on (account, pair, date).
+That only works because every task is idempotent against its own rows: billing
+bills from MAX(period_end) and skips an account already covered, the rate
+upserts against a unique index on (account, pair, date), and a snapshot already
+taken at an hour's cutoff is not taken again.
 
 Why not the alternatives. `cron` inside the image does not inherit the container
 environment, so SQLALCHEMY_DATABASE_URI would be unset and every run would die at
@@ -63,7 +65,7 @@ def _damascus_hour() -> int:
 
 
 def run_once() -> int:
-    """Run both tasks unconditionally. Returns a process exit code."""
+    """Run every task unconditionally. Returns a process exit code."""
     from daily_tasks.tasks import run_all
 
     started = datetime.now(timezone.utc)
@@ -104,6 +106,17 @@ def tick() -> None:
         except Exception:
             log.exception("billing task raised")
 
+    global _snapshot_day
+    if _snapshot_day != today:
+        try:
+            result = tasks.snapshot_financial_accounts()
+            log.info("task %s: %s — %s", result.name,
+                     "OK" if result.ok else "FAILED", result.detail)
+            if result.ok:
+                _snapshot_day = today
+        except Exception:
+            log.exception("balance snapshot task raised")
+
     if _damascus_hour() < RATE_FROM_HOUR:
         return
     if time.monotonic() - _last_rate_attempt < RATE_RETRY_SECONDS:
@@ -122,13 +135,14 @@ def tick() -> None:
 
 
 _billed_day = None
+_snapshot_day = None
 _last_rate_attempt = 0.0
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(prog="daily_tasks")
     parser.add_argument("--once", action="store_true",
-                        help="run both tasks immediately, ignoring the gates, and exit")
+                        help="run every task immediately, ignoring the gates, and exit")
     args = parser.parse_args()
 
     if args.once:
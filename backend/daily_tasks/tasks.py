@@ -13,7 +13,7 @@ rate rows.
 from __future__ import annotations
 
 import logging
-from datetime import date
+from datetime import date, datetime
 from typing import NamedTuple, Optional
 
 from sqlalchemy import text
@@ -225,9 +225,30 @@ def pull_usd_syp_rate(today: Optional[date] = None) -> TaskResult:
     return TaskResult("pull_usd_syp_rate", True, detail)
 
 
+# --------------------------------------------------------------------------
+# 3. financial account balance snapshots
+# --------------------------------------------------------------------------
+
+def snapshot_financial_accounts(now: Optional[datetime] = None) -> TaskResult:
+    """Checkpoint every financial account's balance, across all tenants.
+
+    Purely an optimisation — an account with no snapshot still reads the right
+    balance, only slower — so a missed night costs nothing but speed. One
+    transaction for the sweep: it is one INSERT per account and nothing else,
+    well inside the shutdown grace. A re-run lands on the same cutoff (see
+    FinancialAccountDomain.take_snapshots) and writes nothing.
+    """
+    from app.domains.financial_account.domain import FinancialAccountDomain
+
+    with SqlAlchemyUnitOfWork(account_uuid=None) as uow:
+        written = FinancialAccountDomain.take_snapshots(uow, now=now)
+        uow.commit()
+    return TaskResult("snapshot_financial_accounts", True, f"{written} account(s) checkpointed")
+
+
 # --------------------------------------------------------------------------
 
-TASKS = (charge_due_subscriptions, pull_usd_syp_rate)
+TASKS = (charge_due_subscriptions, pull_usd_syp_rate, snapshot_financial_accounts)
 
 
 def run_all() -> list[TaskResult]:
@@ -0,0 +1,187 @@
+"""Background job worker: runs what routes enqueue on the `job` table.
+
+Runs as its own compose service on the backend image, the same way
+`daily_tasks` does:
+
+    entrypoint: ["python", "-m", "jobs"]
+    python -m jobs --once             # drain what is runnable now and exit
+    python -m jobs --concurrency 4    # four jobs in flight in this process
+
+WHY A QUEUE AT ALL. A year-long sp-today backfill and trip routing each take
+tens of seconds. On the request thread that is a gunicorn worker doing nothing
+else for the duration, and a few of them at once is the whole pool. The routes
+now answer 202 with a job document and the client polls GET /job/<uuid>.
+
+WHY POSTGRES. Claiming is `SELECT ... FOR UPDATE SKIP LOCKED` (see
+JobRepository.claim_next): any number of these processes can poll the same
+table, none ever takes a job another holds, and none waits behind another's
+claim. The job row is written in the same transaction as the request's own
+changes, so there is no window where one exists without the other — which a
+separate broker could not promise — and nothing new to deploy or back up.
+
+CONCURRENCY. `--concurrency` threads per process, each claiming one job at a
+time; JOBS_LIMIT_<KIND> caps a kind across every worker (one backfill at a time
+by default — sp-today rate-limits, and a second year-long scrape of the same
+history gains nothing). Threads rather than processes because the handlers
+spend their time waiting on sp-today and Postgres, not on the GIL.
+
+RETRIES AND CRASHES. A handler that raises is retried with exponential backoff
+up to the job's max_attempts; a domain "no" (ApiError) fails it outright. A
+worker killed mid-job leaves the row `running` with a lease that expires, after
+which another worker takes it over — handlers are written to be safe to re-run.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(threadName)s %(message)s")
+log = logging.getLogger("jobs")
+
+ENV = os.getenv("KARMA_ENV", "dev")
+CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "2"))
+# how long an idle thread sleeps before asking again; a job waits at most this
+# long to be picked up
+POLL_SECONDS = float(os.getenv("JOBS_POLL_SECONDS", "2"))
+
+_stop = threading.Event()
+
+
+def _handle_signal(signum, _frame):
+    log.info("received signal %s — will exit after the jobs in flight", signum)
+    _stop.set()
+
+
+def kind_limits() -> dict[str, int]:
+    """Per-kind caps across all workers, from JOBS_LIMIT_<KIND> (0 = no cap)."""
+    from app.dto.job import JobKind
+
+    defaults = {JobKind.EXCHANGE_RATE_BACKFILL.value: 1}
+    limits = {}
+    for kind in JobKind:
+        raw = os.getenv(f"JOBS_LIMIT_{kind.name}")
+        limit = int(raw) if raw is not None else defaults.get(kind.value, 0)
+        if limit > 0:
+            limits[kind.value] = limit
+    return limits
+
+
+def run_one(worker_id: str, limits: dict[str, int]) -> bool:
+    """Claim and run one job. Returns False when nothing was runnable.
+
+    Claim, run and record are three transactions on purpose. The claim commits
+    at once so other workers see the job taken; the handler commits its own
+    work; the outcome is recorded last, in a fresh session, so a handler that
+    poisoned its session cannot also lose the record of having failed.
+    """
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from app.domains.job.domain import JobDomain
+    from jobs.handlers import HANDLERS
+
+    # unscoped: the queue is shared by every tenant; each handler re-scopes
+    with SqlAlchemyUnitOfWork(account_uuid=None) as uow:
+        job = JobDomain.claim(uow, worker_id=worker_id, kind_limits=limits)
+        if job is None:
+            return False
+        # read everything out BEFORE the session closes (see daily_tasks.tasks)
+        job_uuid, kind, attempt = job.uuid, job.kind, job.attempts
+        payload, account_uuid, created_by_uuid = job.payload, job.account_uuid, job.created_by_uuid
+        uow.commit()
+
+    log.info("job %s (%s) attempt %d started", job_uuid, kind, attempt)
+    started = time.monotonic()
+    result, error = None, None
+    try:
+        handler = HANDLERS.get(kind)
+        if handler is None:
+            raise LookupError(f"no handler for job kind {kind!r}")
+        result = handler(payload, account_uuid, created_by_uuid)
+    except Exception as exc:  # noqa: BLE001 — recorded on the job, never fatal here
+        error = exc
+
+    with SqlAlchemyUnitOfWork(account_uuid=None) as uow:
+        job = uow.job_repository.find_one(uuid=job_uuid)
+        if error is None:
+            JobDomain.succeed(uow, job, result)
+            log.info("job %s (%s) succeeded in %.1fs", job_uuid, kind, time.monotonic() - started)
+        else:
+            retry = JobDomain.fail(uow, job, error)
+            log.error(
+                "job %s (%s) attempt %d failed%s: %s", job_uuid, kind, attempt,
+                " — will retry" if retry else "", error,
+                exc_info=error,
+            )
+        uow.commit()
+    return True
+
+
+def drain(worker_id: str, limits: dict[str, int]) -> int:
+    """Run jobs until none is runnable. Returns how many ran."""
+    ran = 0
+    while not _stop.is_set() and run_one(worker_id, limits):
+        ran += 1
+    return ran
+
+
+def _loop(worker_id: str, limits: dict[str, int]) -> None:
+    while not _stop.is_set():
+        try:
+            if run_one(worker_id, limits):
+                continue
+        except Exception:
+            # the database went away or similar; never let a thread die and
+            # quietly shrink the pool
+            log.exception("claiming a job failed; backing off")
+        _stop.wait(POLL_SECONDS)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="jobs")
+    parser.add_argument("--once", action="store_true",
+                        help="run every job runnable now, one at a time, and exit")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY,
+                        help="jobs in flight at once in this process")
+    args = parser.parse_args()
+
+    base_id = f"{socket.gethostname()}:{os.getpid()}"
+    limits = kind_limits()
+
+    if args.once:
+        ran = drain(base_id, limits)
+        log.info("jobs --once: ran %d job(s)", ran)
+        return 0
+
+    signal.signal(signal.SIGTERM, _handle_signal)
+    signal.signal(signal.SIGINT, _handle_signal)
+
+    log.info(
+        "jobs worker up (env=%s concurrency=%d poll=%ss limits=%s)",
+        ENV, args.concurrency, POLL_SECONDS, limits or "none",
+    )
+    threads = [
+        threading.Thread(
+            target=_loop, args=(f"{base_id}:{n}", limits), name=f"job-{n}", daemon=True
+        )
+        for n in range(max(1, args.concurrency))
+    ]
+    for thread in threads:
+        thread.start()
+    # The main thread only waits for a signal. Threads finish the job they are
+    # on and then see the stop flag; one still busy when compose's grace period
+    # ends is killed, and its lease hands the job to the next worker.
+    while not _stop.is_set():
+        _stop.wait(1)
+    for thread in threads:
+        thread.join()
+    log.info("jobs worker stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
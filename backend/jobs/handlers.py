@@ -0,0 +1,79 @@
+"""What each job kind does. Separated from the worker loop so it is testable.
+
+A handler takes the job's payload plus who it runs for, does the work in its OWN
+unit of work scoped to the job's account — exactly the scope the request that
+enqueued it had — commits, and returns the JSON the synchronous route would have
+answered with. That return value becomes the job's `result`.
+
+Delivery is AT LEAST ONCE: a worker killed after the handler committed but before
+the job was marked succeeded leaves it to be claimed again once its lease runs
+out. Every handler therefore has to be safe to run twice.
+"""
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+from app.dto.exchange_rate import ExchangeRatePullParams
+from app.dto.job import JobKind
+from app.dto.task_execution import TaskExecutionComplete, TaskExecutionRead
+from app.dto.workflow_execution import WorkflowStatus
+from app.entrypoint.routes.common.errors import BadRequestError
+
+
+def exchange_rate_backfill(
+    payload: dict, account_uuid: Optional[str], created_by_uuid: Optional[str]
+) -> dict:
+    """POST /exchange-rate/backfill, off the request thread.
+
+    Idempotent because the upsert is: re-ingesting a day updates it in place.
+    """
+    from app.domains.exchange_rate.domain import ExchangeRateDomain
+
+    params = ExchangeRatePullParams(**payload)
+    with SqlAlchemyUnitOfWork(account_uuid=account_uuid) as uow:
+        try:
+            result = ExchangeRateDomain.backfill(
+                uow=uow,
+                created_by_uuid=created_by_uuid,
+                from_currency=params.from_currency,
+                to_currency=params.to_currency,
+                backfill_range=params.range,
+                start=params.start,
+                end=params.end,
+            ).model_dump(mode="json")
+        except BadRequestError as exc:
+            # The pair was validated before enqueueing, so the only "no" left is
+            # sp-today failing or coming back short — worth another attempt
+            # later, which a BadRequestError (final, by JobDomain.fail's rule)
+            # would not get.
+            raise RuntimeError(exc.message) from exc
+        uow.commit()
+    return result
+
+
+def task_execution_complete(
+    payload: dict, account_uuid: Optional[str], created_by_uuid: Optional[str]
+) -> dict:
+    """POST /task-execution/complete, off the request thread (trip routing).
+
+    A task already COMPLETED is returned as it stands rather than executed a
+    second time: that is what a redelivered job finds, and running the operator
+    again would recompute the route and re-fire its callbacks.
+    """
+    from app.domains.task_execution.domain import TaskExecutionDomain
+
+    body = TaskExecutionComplete(**payload)
+    with SqlAlchemyUnitOfWork(account_uuid=account_uuid) as uow:
+        task_exe = uow.task_execution_repository.find_one(uuid=body.uuid)
+        if task_exe is not None and task_exe.status == WorkflowStatus.COMPLETED.value:
+            return TaskExecutionRead.from_orm(task_exe).model_dump(mode="json")
+        dto = TaskExecutionDomain.complete_task_execution(uow=uow, payload=body)
+        uow.commit()
+    return dto.model_dump(mode="json")
+
+
+HANDLERS: dict[str, Callable[[dict, Optional[str], Optional[str]], dict]] = {
+    JobKind.EXCHANGE_RATE_BACKFILL.value: exchange_rate_backfill,
+    JobKind.TASK_EXECUTION_COMPLETE.value: task_execution_complete,
+}
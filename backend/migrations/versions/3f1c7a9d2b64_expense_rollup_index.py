@@ -0,0 +1,27 @@
+"""Composite index for the expense analytics rollup.
+
+The analytics chart reads a tenant's expenses in a date window, in one
+currency or all of them. Before this only account_uuid was indexed, so the
+rest of the filter was checked row by row. This index on (account_uuid,
+currency, created_at) serves the window directly.
+
+Revision ID: 3f1c7a9d2b64
+Revises: 8e8859f6100d
+"""
+from alembic import op
+
+revision = '3f1c7a9d2b64'
+down_revision = '8e8859f6100d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_expense_account_currency_created', 'expense',
+        ['account_uuid', 'currency', 'created_at'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_expense_account_currency_created', table_name='expense')
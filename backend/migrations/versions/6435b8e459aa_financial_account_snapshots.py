@@ -0,0 +1,50 @@
+"""Balance snapshots for financial accounts.
+
+FinancialAccount.balance summed every payment, payout and transaction the
+account ever had, on every read. A `financial_account_snapshot` row holds the
+balance as of a cutoff; the current balance is the latest one plus the
+movements created since, which the new (account, created_at) indexes on the
+movement tables answer without touching the older history.
+
+No snapshots are written here: an account without one falls back to summing
+everything, which is exactly the old figure. The nightly task starts the
+checkpoints, or run `python scripts/financial_account_snapshots.py rebuild`.
+
+Revision ID: 6435b8e459aa
+Revises: d59831639223
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = '6435b8e459aa'
+down_revision = 'd59831639223'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'financial_account_snapshot',
+        sa.Column('uuid', sa.String(length=36), primary_key=True),
+        sa.Column('account_uuid', sa.String(length=36), sa.ForeignKey('account.uuid'), nullable=False),
+        sa.Column('financial_account_uuid', sa.String(length=36), sa.ForeignKey('financial_account.uuid'),
+                  nullable=False),
+        sa.Column('cutoff', sa.DateTime(), nullable=False),
+        sa.Column('balance', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('financial_account_uuid', 'cutoff', name='uq_financial_account_snapshot_cutoff'),
+    )
+    op.create_index('ix_financial_account_snapshot_account_uuid', 'financial_account_snapshot', ['account_uuid'])
+    op.create_index('ix_payment_financial_account_created', 'payment', ['financial_account_uuid', 'created_at'])
+    op.create_index('ix_payout_financial_account_created', 'payout', ['financial_account_uuid', 'created_at'])
+    op.create_index('ix_transaction_from_account_created', 'transaction', ['from_account_uuid', 'created_at'])
+    op.create_index('ix_transaction_to_account_created', 'transaction', ['to_account_uuid', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_transaction_to_account_created', table_name='transaction')
+    op.drop_index('ix_transaction_from_account_created', table_name='transaction')
+    op.drop_index('ix_payout_financial_account_created', table_name='payout')
+    op.drop_index('ix_payment_financial_account_created', table_name='payment')
+    op.drop_index('ix_financial_account_snapshot_account_uuid', table_name='financial_account_snapshot')
+    op.drop_table('financial_account_snapshot')
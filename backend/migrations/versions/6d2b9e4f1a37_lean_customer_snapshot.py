@@ -0,0 +1,51 @@
+"""Shrink the customer stored in trip stop task inputs to CustomerSnapshot v1.
+
+Each trip stop's task carried a full CustomerRead dump under
+task_inputs.data.customer: email, address, category, notes, timestamps,
+flags and the rest. It went back to the app with every task read, and the
+app downloads one per stop at trip start. New stops now store a
+CustomerSnapshot (uuid, names, phone, coordinates and balances, tagged
+"v": 1). This rewrites the stops already stored to the same shape, so the
+clients and later migrations see one format.
+
+Only snapshots without a "v" are touched, so re-running is harmless. The
+balances stay the ones recorded when the stop was created, as a snapshot's
+should.
+
+Downgrade is a no-op: the dropped fields can't be restored, and every reader
+only ever used the ones kept.
+
+Revision ID: 6d2b9e4f1a37
+Revises: a84d2c6e1f37
+"""
+from alembic import op
+
+revision = '6d2b9e4f1a37'
+down_revision = 'a84d2c6e1f37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        UPDATE task
+        SET task_inputs = jsonb_set(
+            task_inputs, '{data,customer}',
+            jsonb_strip_nulls(jsonb_build_object(
+                'v', 1,
+                'uuid', task_inputs #> '{data,customer,uuid}',
+                'company_name', task_inputs #> '{data,customer,company_name}',
+                'full_name', task_inputs #> '{data,customer,full_name}',
+                'phone_number', task_inputs #> '{data,customer,phone_number}',
+                'coordinates', task_inputs #> '{data,customer,coordinates}',
+                'balance_per_currency', task_inputs #> '{data,customer,balance_per_currency}'
+            ))
+        )
+        WHERE operator = 'trip_stop_operator'
+          AND jsonb_typeof(task_inputs #> '{data,customer}') = 'object'
+          AND NOT (task_inputs #> '{data,customer}') ? 'v'
+    """)
+
+
+def downgrade():
+    pass
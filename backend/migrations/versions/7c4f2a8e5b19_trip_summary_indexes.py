@@ -0,0 +1,27 @@
+"""Indexes for the set-based trip summary.
+
+TripRepository.summary_figures reaches a week of trips' payments and sale
+events through their stops, and their expenses' payouts through
+payout.expense_uuid. Neither trip_stop.trip_uuid nor payout.expense_uuid was
+indexed, so each grouped SELECT scanned the whole table to find a few hundred
+rows.
+
+Revision ID: 7c4f2a8e5b19
+Revises: 6d2b9e4f1a37
+"""
+from alembic import op
+
+revision = '7c4f2a8e5b19'
+down_revision = '6d2b9e4f1a37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_trip_stop_trip_uuid', 'trip_stop', ['trip_uuid'])
+    op.create_index('ix_payout_expense_uuid', 'payout', ['expense_uuid'])
+
+
+def downgrade():
+    op.drop_index('ix_payout_expense_uuid', table_name='payout')
+    op.drop_index('ix_trip_stop_trip_uuid', table_name='trip_stop')
@@ -0,0 +1,38 @@
+"""Trigram indexes for customer search.
+
+The customer list filters email, company name, full name and phone number with
+ILIKE '%…%'. A B-tree cannot answer a leading wildcard, so every search was a
+sequential scan of the tenant's customers. A pg_trgm GIN index can, for the
+existing filters unchanged, and it also ranks the new /customer/search
+endpoint by similarity.
+
+pg_trgm is a trusted extension (Postgres 13+), so the migration role can
+create it without superuser.
+
+Revision ID: 8e8859f6100d
+Revises: 6435b8e459aa
+"""
+from alembic import op
+
+revision = '8e8859f6100d'
+down_revision = '6435b8e459aa'
+branch_labels = None
+depends_on = None
+
+_FIELDS = ('email_address', 'company_name', 'full_name', 'phone_number')
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name in _FIELDS:
+        op.create_index(
+            f'ix_customer_{name}_trgm', 'customer', [name],
+            postgresql_using='gin',
+            postgresql_ops={name: 'gin_trgm_ops'},
+        )
+
+
+def downgrade():
+    for name in reversed(_FIELDS):
+        op.drop_index(f'ix_customer_{name}_trgm', table_name='customer')
+    # the extension stays: dropping it would take any other trigram index with it
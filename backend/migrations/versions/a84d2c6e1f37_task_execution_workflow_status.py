@@ -0,0 +1,31 @@
+"""Index task executions by (workflow_execution_uuid, status).
+
+Completing a task used to load every execution in its workflow: once to find
+what it unblocks, and again to count what is finished. For a trip with
+hundreds of stops that was quadratic over the trip's life. The completion
+path now asks the database for the waiting dependants of the one task that
+finished, and whether anything unfinished is left. This index narrows both
+to one workflow's executions in one status; which of those depend on the
+finished task is still checked row by row. Until now task_execution had no
+index on workflow_execution_uuid at all.
+
+Revision ID: a84d2c6e1f37
+Revises: 3f1c7a9d2b64
+"""
+from alembic import op
+
+revision = 'a84d2c6e1f37'
+down_revision = '3f1c7a9d2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_task_execution_workflow_status', 'task_execution',
+        ['workflow_execution_uuid', 'status'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_task_execution_workflow_status', table_name='task_execution')
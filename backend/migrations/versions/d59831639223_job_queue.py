@@ -0,0 +1,61 @@
+"""A Postgres-backed job queue for work too slow for a request.
+
+A year-long sp-today backfill and trip routing both ran on the request thread,
+holding a gunicorn worker for tens of seconds each. They now enqueue a `job` row
+and return 202; `python -m jobs` claims rows with FOR UPDATE SKIP LOCKED and the
+client polls GET /job/<uuid>.
+
+The unique index is partial on the live statuses so a dedupe key only blocks a
+second job while the first is still queued or running — once it has finished
+the same work can be asked for again.
+
+Revision ID: d59831639223
+Revises: a4e81c37b295
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = 'd59831639223'
+down_revision = 'a4e81c37b295'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'job',
+        sa.Column('uuid', sa.String(length=36), primary_key=True),
+        sa.Column('account_uuid', sa.String(length=36), sa.ForeignKey('account.uuid'), nullable=True),
+        sa.Column('created_by_uuid', sa.String(length=36), sa.ForeignKey('user.uuid'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('kind', sa.String(length=60), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('dedupe_key', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('run_after', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('locked_by', sa.String(length=120), nullable=True),
+        sa.Column('result', postgresql.JSONB(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_job_account_uuid', 'job', ['account_uuid'])
+    op.create_index('ix_job_claim', 'job', ['status', 'run_after'])
+    op.create_index(
+        'uq_job_active_dedupe',
+        'job',
+        ['dedupe_key'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade():
+    op.drop_index('uq_job_active_dedupe', table_name='job')
+    op.drop_index('ix_job_claim', table_name='job')
+    op.drop_index('ix_job_account_uuid', table_name='job')
+    op.drop_table('job')
@@ -203,6 +203,18 @@ class Customer(Base):
     coordinates = Column(Geometry("POINT", srid=4326), nullable=True)
     is_deleted = Column(Boolean, default=False)
 
+    # pg_trgm GIN indexes on the searchable text: they answer the list route's
+    # leading-wildcard ILIKE filters as well as /customer/search's similarity
+    # ranking, both of which were a sequential scan on a B-tree-only table
+    __table_args__ = tuple(
+        Index(
+            f"ix_customer_{name}_trgm", name,
+            postgresql_using="gin",
+            postgresql_ops={name: "gin_trgm_ops"},
+        )
+        for name in ("email_address", "company_name", "full_name", "phone_number")
+    )
+
     # relations
     orders = relationship("CustomerOrder", back_populates="customer")
     debit_note_items = relationship("DebitNoteItem", back_populates="customer")
@@ -232,10 +244,16 @@ class Customer(Base):
         return order_total + debit_note_total - credit_note_total
     @property
     def balance_per_currency(self) -> dict[str, float]:
+        # primed by CustomerRepository.prime_balances: one grouped query for a
+        # whole page instead of this walk over every order, invoice and note
+        primed = self.__dict__.get("_primed_balance_per_currency")
+        if primed is not None:
+            return primed
         currencies = ["USD", "SYP"]
         return {currency: self._calculate_balance_per_currency(currency) for currency in currencies}
 
-
+    def prime_balance_per_currency(self, balances: dict[str, float]) -> None:
+        self.__dict__["_primed_balance_per_currency"] = balances
 
     def __repr__(self):
         return (
@@ -764,6 +782,10 @@ class InvoiceItem(Base):
 
 class Payment(Base):
     __tablename__ = "payment"
+    __table_args__ = (
+        # FinancialAccountRepository.balances: the movements since a snapshot
+        Index('ix_payment_financial_account_created', 'financial_account_uuid', 'created_at'),
+    )
 
     uuid = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     account_uuid = Column(String(36), ForeignKey('account.uuid'), nullable=False, index=True)
@@ -831,6 +853,18 @@ class FinancialAccount(Base):
 
     @property
     def balance(self):
+        # primed by FinancialAccountRepository.prime_balances: the latest
+        # snapshot plus one grouped sum of what moved since, instead of this
+        # walk over the account's entire history
+        primed = self.__dict__.get("_primed_balance")
+        if primed is not None:
+            return primed
+        return self._calculate_balance()
+
+    def prime_balance(self, balance: float) -> None:
+        self.__dict__["_primed_balance"] = balance
+
+    def _calculate_balance(self):
         transactions_in = sum(
             transaction.to_amount
             for transaction in self.transactions_to
@@ -863,6 +897,11 @@ class FinancialAccount(Base):
 
 class Transaction(Base):
     __tablename__ = "transaction"
+    __table_args__ = (
+        # FinancialAccountRepository.balances: the movements since a snapshot
+        Index('ix_transaction_from_account_created', 'from_account_uuid', 'created_at'),
+        Index('ix_transaction_to_account_created', 'to_account_uuid', 'created_at'),
+    )
 
     uuid = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     account_uuid = Column(String(36), ForeignKey('account.uuid'), nullable=False, index=True)
@@ -885,6 +924,35 @@ class Transaction(Base):
     def __repr__(self):
         return f"<Transaction(uuid={self.uuid}, amount={self.amount}, created_at={self.created_at})>"
 
+
+class FinancialAccountSnapshot(Base):
+    """A financial account's balance as of `cutoff`: every live movement
+    (payment, payout, transaction leg) created strictly before it, summed.
+
+    The current balance is the latest snapshot plus what moved since — see
+    FinancialAccountRepository.balances. Snapshots are a cache, never the
+    record: changing a movement from before a cutoff drops the snapshots it is
+    baked into (see financial_account_repository.py), and
+    `scripts/financial_account_snapshots.py rebuild` recomputes them all.
+    """
+    __tablename__ = "financial_account_snapshot"
+    __table_args__ = (
+        UniqueConstraint('financial_account_uuid', 'cutoff', name='uq_financial_account_snapshot_cutoff'),
+    )
+
+    uuid = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    account_uuid = Column(String(36), ForeignKey('account.uuid'), nullable=False, index=True)
+    financial_account_uuid = Column(String(36), ForeignKey("financial_account.uuid"), nullable=False)
+    cutoff = Column(DateTime, nullable=False)
+    balance = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<FinancialAccountSnapshot(financial_account_uuid={self.financial_account_uuid}, "
+            f"cutoff={self.cutoff}, balance={self.balance})>"
+        )
+
 # ------------------------------
 # Vendor, Material & Pricing Models
 # ------------------------------
@@ -932,10 +1000,18 @@ class Vendor(Base):
         return res
     @property
     def balance_per_currency(self) -> dict[str, float]:
+        # primed by VendorRepository.prime_balances: one grouped query for a
+        # whole page instead of this walk over every purchase order and note
+        primed = self.__dict__.get("_primed_balance_per_currency")
+        if primed is not None:
+            return primed
         currencies = ["USD", "SYP"]
         res = {currency: self._calculate_balance_per_currency(currency) for currency in currencies}
         return res
 
+    def prime_balance_per_currency(self, balances: dict[str, float]) -> None:
+        self.__dict__["_primed_balance_per_currency"] = balances
+
     def __repr__(self):
         return (
             f"<Vendor(uuid={self.uuid}, email_address={self.email_address}, "
@@ -1296,12 +1372,17 @@ class PurchaseOrderItem(Base):
 
 class Payout(Base):
     __tablename__ = "payout"
+    __table_args__ = (
+        # FinancialAccountRepository.balances: the movements since a snapshot
+        Index('ix_payout_financial_account_created', 'financial_account_uuid', 'created_at'),
+    )
 
     uuid = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     account_uuid = Column(String(36), ForeignKey('account.uuid'), nullable=False, index=True)
     created_by_uuid = Column(String(36), ForeignKey('user.uuid'), nullable=True)
     purchase_order_uuid = Column(String(36), ForeignKey("purchase_order.uuid"), nullable=True)
-    expense_uuid = Column(String(36), ForeignKey("expense.uuid"), nullable=True)
+    # Expense.amount_paid, summed per trip by TripRepository.summary_figures
+    expense_uuid = Column(String(36), ForeignKey("expense.uuid"), nullable=True, index=True)
     amount = Column(Float, nullable=False)
     currency = Column(String(120), nullable=False)
     financial_account_uuid = Column(String(36), ForeignKey("financial_account.uuid"), nullable=False)
@@ -1324,6 +1405,11 @@ class Payout(Base):
 
 class Expense(Base):
     __tablename__ = "expense"
+    __table_args__ = (
+        # ExpenseRepository.rollup: a tenant's expenses in a date window,
+        # optionally one currency
+        Index('ix_expense_account_currency_created', 'account_uuid', 'currency', 'created_at'),
+    )
 
     uuid = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     account_uuid = Column(String(36), ForeignKey('account.uuid'), nullable=False, index=True)
@@ -1965,6 +2051,11 @@ class WorkflowExecution(Base):
 
 class TaskExecution(Base):
     __tablename__ = "task_execution"
+    __table_args__ = (
+        # TaskExecutionRepository: the waiting dependants of a completed task
+        # and the "is anything left" probe, both within one workflow execution
+        Index('ix_task_execution_workflow_status', 'workflow_execution_uuid', 'status'),
+    )
 
     uuid = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     account_uuid = Column(String(36), ForeignKey('account.uuid'), nullable=False, index=True)
@@ -2111,11 +2202,23 @@ class Trip(Base):
     def is_audited(cls):
         return cls.audited_at.isnot(None)
 
+    def prime_summary(self, figures: dict) -> None:
+        # set by TripRepository.prime_summaries: the grouped-SQL form of the
+        # walks below, so summarizing many trips reads none of their stops
+        self.__dict__["_primed_summary"] = figures
+
+    def _primed(self, key):
+        primed = self.__dict__.get("_primed_summary")
+        return None if primed is None else dict(primed[key])
+
     @hybrid_property
     def expected_cash(self):
         # cash actually collected at this trip's stops (payments tagged to the stop),
         # including payments taken for previously-created orders during the trip.
         # Keyed by currency, since a trip may collect in more than one (USD/SYP).
+        primed = self._primed("collected")
+        if primed is not None:
+            return primed
         totals: dict[str, float] = {}
         for stop in self.stops:
             for payment in stop.payments:
@@ -2152,6 +2255,9 @@ class Trip(Base):
         The face value of the run's costs. It is NOT the cash figure: see
         trip_expenses_paid for what has actually left.
         """
+        primed = self._primed("expenses")
+        if primed is not None:
+            return primed
         return self._expense_totals(lambda expense: expense.amount)
 
     @property
@@ -2163,6 +2269,9 @@ class Trip(Base):
         pocket. An expense booked but not paid has taken nothing out of the
         run, and a payout since reversed (soft-deleted) has put the cash back.
         """
+        primed = self._primed("expenses_paid")
+        if primed is not None:
+            return primed
         return self._expense_totals(lambda expense: expense.amount_paid)
 
     @property
@@ -2173,6 +2282,9 @@ class Trip(Base):
         from the driver. Rounded because it is a difference, and float residue
         would otherwise surface as a phantom outstanding fraction.
         """
+        primed = self._primed("expenses_unpaid")
+        if primed is not None:
+            return primed
         return {
             currency: round(amount, 2)
             for currency, amount in self._expense_totals(
@@ -2214,6 +2326,9 @@ class Trip(Base):
         (rather than walking the stops' orders) captures stock handed off for
         previously-created orders that are fulfilled during the trip.
         """
+        primed = self._primed("sold")
+        if primed is not None:
+            return primed
         sold: dict[str, float] = {}
         for stop in self.stops:
             for ev in stop.vehicle_inventory_events:
@@ -2260,7 +2375,8 @@ class TripStop(Base):
     account_uuid = Column(String(36), ForeignKey('account.uuid'), nullable=False, index=True)
     created_by_uuid = Column(String(36), ForeignKey('user.uuid'), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    trip_uuid = Column(String(36), ForeignKey("trip.uuid"), nullable=False)
+    # TripRepository.summary_figures reaches payments and sale events through it
+    trip_uuid = Column(String(36), ForeignKey("trip.uuid"), nullable=False, index=True)
     coordinates = Column(Geometry("POINT", srid=4326), nullable=False)  # Location of the stop
     notes = Column(Text, nullable=True)
     status = Column(String(120), nullable=False)  # e.g., planned, completed, skipped
@@ -2329,8 +2445,17 @@ class VehicleInventory(Base):
 
     @hybrid_property
     def current_quantity(self):
+        # primed by VehicleInventoryRepository.prime_quantities: one grouped
+        # sum for a whole page instead of loading every event the truck ever
+        # recorded for this material
+        primed = self.__dict__.get("_primed_current_quantity")
+        if primed is not None:
+            return primed
         return sum(e.quantity for e in self.events if not e.is_deleted)
 
+    def prime_current_quantity(self, quantity: float) -> None:
+        self.__dict__["_primed_current_quantity"] = quantity
+
     @current_quantity.expression
     def current_quantity(cls):
         return (
@@ -2474,3 +2599,62 @@ class ExchangeRate(Base):
     source = Column(String(60), nullable=False, default='manual')
     notes = Column(Text, nullable=True)
     is_deleted = Column(Boolean, default=False, nullable=False)
+
+
+class Job(Base):
+    """One unit of background work, queued in Postgres and run by `python -m jobs`.
+
+    Long operations (a year-long rate backfill, routing a trip) used to run on
+    the request thread and hold a gunicorn worker for tens of seconds. The route
+    now inserts a row here and answers 202; the worker claims rows with
+    `SELECT ... FOR UPDATE SKIP LOCKED`, so any number of workers can poll the
+    same table without ever picking up the same job twice, and the client polls
+    GET /job/<uuid> for the outcome.
+
+    Postgres rather than a broker on purpose: the job is enqueued in the SAME
+    transaction as whatever the request wrote, so it exists exactly when that
+    write does, and there is no second service to deploy, back up or lose.
+
+    `account_uuid` is the tenant the job runs for — the worker opens its unit of
+    work scoped to it, exactly as the request that enqueued it was.
+    """
+    __tablename__ = "job"
+    __table_args__ = (
+        # the worker's claim: oldest runnable first
+        Index('ix_job_claim', 'status', 'run_after'),
+        # One live job per dedupe key. A double-clicked button or two readers
+        # hitting the same gap enqueue one job, not two; once it has finished the
+        # key is free again, so the same work can be asked for later.
+        Index(
+            'uq_job_active_dedupe',
+            'dedupe_key',
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    uuid = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    account_uuid = Column(String(36), ForeignKey('account.uuid'), nullable=True, index=True)
+    created_by_uuid = Column(String(36), ForeignKey('user.uuid'), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    kind = Column(String(60), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    dedupe_key = Column(String(255), nullable=True)
+
+    # queued -> running -> succeeded | failed; a failed attempt with retries
+    # left goes back to queued with run_after pushed out
+    status = Column(String(20), nullable=False, default='queued')
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # which worker holds it and since when; a running job whose lease has run
+    # out belonged to a worker that died and is claimable again
+    locked_at = Column(DateTime, nullable=True)
+    locked_by = Column(String(120), nullable=True)
+
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,52 @@
+"""Rebuild financial account balance snapshots, or check them against the walk.
+
+FinancialAccount.balance is now the latest snapshot plus the movements since
+(FinancialAccountRepository.balances). Snapshots are a cache and this is the
+tool for when one is in doubt:
+
+    python scripts/financial_account_snapshots.py check
+        compare every account's snapshot-backed balance with the old walk over
+        its whole history; prints each disagreement, exits 1 if there is one
+
+    python scripts/financial_account_snapshots.py rebuild
+        drop every snapshot and checkpoint every account afresh from the
+        movements alone, then run the check
+
+Both run across all tenants. Run inside the backend container (needs
+SQLALCHEMY_DATABASE_URI set).
+"""
+import argparse
+import sys
+
+from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+from app.domains.financial_account.domain import FinancialAccountDomain
+
+
+def check() -> int:
+    with SqlAlchemyUnitOfWork(account_uuid=None) as uow:
+        mismatches = FinancialAccountDomain.balance_mismatches(uow)
+    for m in mismatches:
+        print(f"MISMATCH {m.financial_account_uuid} ({m.account_name}): "
+              f"ledger {m.ledger:.2f} != walked {m.walked:.2f}")
+    print(f"{len(mismatches)} mismatch(es) "
+          f"({'PASS' if not mismatches else 'FAIL — run `rebuild`, then check again'})")
+    return 1 if mismatches else 0
+
+
+def rebuild() -> int:
+    with SqlAlchemyUnitOfWork(account_uuid=None) as uow:
+        written = FinancialAccountDomain.rebuild_snapshots(uow)
+        uow.commit()
+    print(f"rebuilt: {written} account(s) checkpointed")
+    return check()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="financial_account_snapshots")
+    parser.add_argument("command", choices=["check", "rebuild"])
+    args = parser.parse_args()
+    return rebuild() if args.command == "rebuild" else check()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""The job queue's statements in JobRepository.
+
+There is no Postgres here and the job table is JSONB, so the statements are
+captured from a session that never reaches a database and are compiled for
+Postgres. Pinned:
+
+  * a stale running job is taken over only while it has attempts left, and
+    the ones that have none are failed rather than left running;
+  * a deduped insert goes through ON CONFLICT DO NOTHING on the partial
+    unique index. When it loses the race it returns the live job, and when
+    that job finished in between it inserts after all.
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+from sqlalchemy.orm import Session
+
+from app.adapters.repositories.job_repository import JobRepository
+from app.domains.job.domain import LEASE
+from models.common import Job
+
+
+class _Captured(Exception):
+    pass
+
+
+@pytest.fixture
+def captured():
+    """A session that records each statement; `returning` holds the uuids
+    that successive INSERT ... RETURNING calls answer with (None: conflict)."""
+    session = Session()
+    session.sent = []
+    session.returning = []
+
+    @event.listens_for(session, "do_orm_execute")
+    def _record(state):
+        session.sent.append(str(state.statement.compile(dialect=postgresql.dialect())))
+        if not session.returning:
+            raise _Captured
+        uuid = session.returning.pop(0)
+        return IteratorResult(SimpleResultMetaData(["uuid"]), iter([(uuid,)] if uuid else []))
+
+    return session
+
+
+def test_a_stale_job_is_reclaimed_only_with_attempts_left(captured):
+    with pytest.raises(_Captured):
+        JobRepository(captured).claim_next(worker_id="w-1", lease=LEASE)
+    sql, = captured.sent
+    assert "job.attempts < job.max_attempts" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+
+
+def test_exhausted_stale_jobs_are_failed(captured):
+    with pytest.raises(_Captured):
+        JobRepository(captured).fail_exhausted(lease=LEASE, error="lease expired")
+    sql, = captured.sent
+    assert sql.startswith("UPDATE job SET status=")
+    assert "job.attempts >= job.max_attempts" in sql
+
+
+def test_a_deduped_insert_does_nothing_on_conflict(captured):
+    job = Job(kind="k", dedupe_key="acc-1:k", status="queued", attempts=0, max_attempts=3)
+    captured.returning = ["j-new"]
+    captured.get = lambda model, uuid: (model, uuid)
+    assert JobRepository(captured, account_uuid="acc-1").insert_unless_live(job) == (Job, "j-new")
+    sql, = captured.sent
+    assert "ON CONFLICT (dedupe_key) WHERE status IN ('queued', 'running') DO NOTHING" in sql
+    assert sql.endswith("RETURNING job.uuid")
+    assert job.account_uuid == "acc-1"
+
+
+def test_losing_the_race_returns_the_live_job(captured, monkeypatch):
+    live = Job(uuid="j-live", dedupe_key="acc-1:k", status="running")
+    repo = JobRepository(captured, account_uuid="acc-1")
+    monkeypatch.setattr(repo, "_find_first_by_filters", lambda filters=None, ordering=None: live)
+    captured.returning = [None]
+    assert repo.insert_unless_live(Job(kind="k", dedupe_key="acc-1:k")) is live
+    assert len(captured.sent) == 1
+
+
+def test_a_winner_that_finished_meanwhile_frees_the_key(captured, monkeypatch):
+    repo = JobRepository(captured, account_uuid="acc-1")
+    monkeypatch.setattr(repo, "_find_first_by_filters", lambda filters=None, ordering=None: None)
+    captured.returning = [None, "j-new"]
+    captured.get = lambda model, uuid: uuid
+    assert repo.insert_unless_live(Job(kind="k", dedupe_key="acc-1:k")) == "j-new"
+    assert len(captured.sent) == 2
@@ -0,0 +1,140 @@
+"""The material lookup cache in MaterialRepository.
+
+Run end to end against in-memory SQLite with only the material table, since
+the cache is plain SELECTs plus the Session flush/commit/rollback hooks.
+Pinned:
+
+  * a material edited in one unit of work is read fresh by the next, and by
+    the same unit of work once flushed;
+  * a rolled-back material never reaches another unit of work;
+  * one tenant's lookups never answer another's, from either cache;
+  * a change the hooks cannot see (another worker's) is served stale for at
+    most the TTL.
+"""
+import pytest
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.repositories import material_repository
+from app.adapters.repositories.material_repository import MaterialRepository, invalidate_materials
+from models.common import Material
+
+SUGAR = "aaaaaaaa-1111-4111-8111-aaaaaaaaaaaa"
+SALT = "bbbbbbbb-2222-4222-8222-bbbbbbbbbbbb"
+
+
+@pytest.fixture
+def sessions():
+    engine = create_engine("sqlite://")
+    Material.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as s:
+        s.add_all([
+            Material(uuid=SUGAR, account_uuid="a", name="Sugar", measure_unit="kg",
+                     sku="SUG", type="product", is_deleted=False),
+            Material(uuid=SALT, account_uuid="b", name="Salt", measure_unit="kg",
+                     sku="SAL", type="product", is_deleted=False),
+        ])
+        s.commit()
+    invalidate_materials()
+    yield factory
+    invalidate_materials()
+    engine.dispose()
+
+
+def _repo(session, account_uuid="a"):
+    return MaterialRepository(session, account_uuid=account_uuid)
+
+
+def _selects(session):
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_a_second_unit_of_work_reads_from_the_process_cache(sessions):
+    with sessions() as s:
+        assert _repo(s).get(SUGAR).name == "Sugar"
+    with sessions() as s:
+        statements = _selects(s)
+        assert _repo(s).get(SUGAR).name == "Sugar"
+        assert statements == []
+
+
+def test_an_edit_is_seen_fresh_by_the_next_unit_of_work(sessions):
+    with sessions() as s:
+        assert _repo(s).get(SUGAR).name == "Sugar"
+    with sessions() as s:
+        s.get(Material, SUGAR).name = "Cane sugar"
+        s.commit()
+    with sessions() as s:
+        assert _repo(s).get(SUGAR).name == "Cane sugar"
+
+
+def test_an_edit_is_seen_by_its_own_unit_of_work_once_flushed(sessions):
+    with sessions() as s:
+        repo = _repo(s)
+        assert repo.get(SUGAR).measure_unit == "kg"
+        s.get(Material, SUGAR).measure_unit = "g"
+        s.flush()
+        assert repo.get(SUGAR).measure_unit == "g"
+        # uncommitted, so not for anyone else
+        s.rollback()
+    with sessions() as s:
+        assert _repo(s).get(SUGAR).measure_unit == "kg"
+
+
+def test_a_rolled_back_material_is_never_served(sessions):
+    pepper = "cccccccc-3333-4333-8333-cccccccccccc"
+    with sessions() as s:
+        s.add(Material(uuid=pepper, account_uuid="a", name="Pepper", sku="PEP",
+                       type="product", is_deleted=False))
+        s.flush()
+        assert _repo(s).get(pepper).name == "Pepper"
+        s.rollback()
+        assert _repo(s).get(pepper) is None
+    with sessions() as s:
+        assert _repo(s).get(pepper) is None
+
+
+def test_a_deleted_material_is_absent(sessions):
+    with sessions() as s:
+        assert _repo(s).get(SUGAR) is not None
+    with sessions() as s:
+        s.get(Material, SUGAR).is_deleted = True
+        s.commit()
+    with sessions() as s:
+        assert _repo(s).get_many([SUGAR]) == {}
+
+
+def test_no_cross_account_hits(sessions):
+    with sessions() as s:
+        # each tenant warms the caches with its own material
+        assert _repo(s, "b").get(SALT).name == "Salt"
+        assert _repo(s, "a").get(SUGAR).name == "Sugar"
+        # and still cannot see the other's, from this unit of work's cache
+        assert _repo(s, "a").get(SALT) is None
+        assert _repo(s, "b").get(SUGAR) is None
+    with sessions() as s:
+        # nor from the process cache
+        assert _repo(s, "a").get_many([SUGAR, SALT]).keys() == {SUGAR}
+        assert _repo(s, "b").get_many([SUGAR, SALT]).keys() == {SALT}
+
+
+def test_an_unseen_change_expires_with_the_ttl(sessions, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(material_repository.time, "monotonic", lambda: clock[0])
+    with sessions() as s:
+        assert _repo(s).get(SUGAR).name == "Sugar"
+    # another worker renames it: no hook in this process sees the write
+    with sessions() as s:
+        s.execute(update(Material).where(Material.uuid == SUGAR).values(name="Cane sugar"))
+        s.commit()
+
+    clock[0] += material_repository._MATERIAL_TTL_SECONDS - 1
+    with sessions() as s:
+        assert _repo(s).get(SUGAR).name == "Sugar"
+    clock[0] += 2
+    with sessions() as s:
+        assert _repo(s).get(SUGAR).name == "Cane sugar"
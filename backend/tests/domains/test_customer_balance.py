@@ -0,0 +1,30 @@
+"""Customer.balance_per_currency: primed from the grouped query, walked otherwise.
+
+The grouped query itself is pinned against Postgres in
+tests/perf/test_customer_balance.py (parity with the walk, one statement per
+page); here only the model's side of the contract.
+"""
+from models.common import Customer, CustomerOrder, DebitNoteItem, Invoice
+
+
+def _customer_owing_usd(amount):
+    customer = Customer(uuid="c-1", is_deleted=False)
+    customer.debit_note_items = [
+        DebitNoteItem(uuid="d-1", amount=amount, currency="USD", is_deleted=False)
+    ]
+    return customer
+
+
+def test_an_unprimed_customer_still_walks_its_graph():
+    assert _customer_owing_usd(12.5).balance_per_currency == {"USD": 12.5, "SYP": 0}
+
+
+def test_a_primed_balance_is_returned_without_walking():
+    customer = _customer_owing_usd(12.5)
+    customer.orders = [CustomerOrder(uuid="o-1", is_deleted=False, invoices=[
+        Invoice(uuid="i-1", currency="USD", is_deleted=False),
+    ])]
+    # a walk would have to touch the invoice's items and payments; the primed
+    # figure is returned as-is
+    customer.prime_balance_per_currency({"USD": 99.0, "SYP": 1.0})
+    assert customer.balance_per_currency == {"USD": 99.0, "SYP": 1.0}
@@ -0,0 +1,43 @@
+"""What a trip stop's task input says about its customer.
+
+A full CustomerRead dump used to be stored per stop and sent back with every
+task read. CustomerSnapshot keeps only what the stop screens use, tagged with
+a version for the clients and later migrations.
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+from geoalchemy2.elements import WKTElement
+
+from app.dto.customer import CUSTOMER_SNAPSHOT_VERSION, CustomerRead, CustomerSnapshot
+
+
+def _customer():
+    return SimpleNamespace(
+        uuid="c-1", company_name="Cafe", full_name="Sami", phone_number="0999",
+        email_address="sami@example.com", full_address="Main st", business_cards=None,
+        notes="long notes " * 50, category="restaurant",
+        coordinates=WKTElement("POINT(36.29 33.51)", srid=4326),
+        created_at=datetime(2025, 1, 1), is_deleted=False, created_by_uuid=None,
+        balance_per_currency={"USD": 12.5, "SYP": 0.0},
+    )
+
+
+def test_the_snapshot_keeps_what_the_stop_screens_read():
+    snapshot = CustomerSnapshot.model_validate(_customer()).model_dump(mode="json")
+    assert snapshot == {
+        "v": CUSTOMER_SNAPSHOT_VERSION,
+        "uuid": "c-1",
+        "company_name": "Cafe",
+        "full_name": "Sami",
+        "phone_number": "0999",
+        "coordinates": "33.51,36.29",
+        "balance_per_currency": {"USD": 12.5, "SYP": 0.0},
+    }
+
+
+def test_the_snapshot_agrees_with_customer_read_on_what_it_keeps():
+    customer = _customer()
+    snapshot = CustomerSnapshot.model_validate(customer).model_dump(mode="json")
+    full = CustomerRead.model_validate(customer).model_dump(mode="json")
+    assert {k: full[k] for k in snapshot if k != "v"} == {k: v for k, v in snapshot.items() if k != "v"}
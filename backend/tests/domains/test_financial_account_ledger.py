@@ -0,0 +1,86 @@
+"""FinancialAccount balance snapshots: what a flush invalidates, and priming.
+
+The SQL itself (snapshot + movements since, parity with the walk) is pinned
+against Postgres in tests/perf/test_financial_account_balance.py.
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.adapters.repositories.financial_account_repository import stale_snapshot_marks
+from app.domains.financial_account.domain import FinancialAccountDomain
+from models.common import FinancialAccount, Payment, Transaction
+
+OLD = datetime(2025, 1, 10, 9, 30)
+
+
+def _persistent(obj):
+    """`obj` as if loaded from the database: later changes are dirty."""
+    make_transient_to_detached(obj)
+    session = Session()
+    session.add(obj)
+    return session
+
+
+def _payment(**kw):
+    fields = dict(uuid="p-1", financial_account_uuid="fa-1", amount=10.0,
+                  currency="USD", payment_method="cash", created_at=OLD, is_deleted=False)
+    fields.update(kw)
+    return Payment(**fields)
+
+
+def _marks(session):
+    return stale_snapshot_marks(session.new, session.dirty, session.deleted)
+
+
+def test_soft_deleting_an_old_payment_marks_its_account():
+    payment = _payment()
+    session = _persistent(payment)
+    payment.is_deleted = True
+    assert _marks(session) == {"fa-1": OLD}
+
+
+def test_a_notes_edit_marks_nothing():
+    payment = _payment()
+    session = _persistent(payment)
+    payment.notes = "paid at the counter"
+    assert _marks(session) == {}
+
+
+def test_moving_a_payment_marks_both_accounts():
+    payment = _payment()
+    session = _persistent(payment)
+    payment.financial_account_uuid = "fa-2"
+    assert _marks(session) == {"fa-1": OLD, "fa-2": OLD}
+
+
+def test_a_cancelled_transfer_marks_both_legs():
+    tx = Transaction(uuid="t-1", from_account_uuid="fa-1", to_account_uuid="fa-2",
+                     from_amount=5.0, to_amount=5.0, created_at=OLD, is_deleted=False)
+    session = _persistent(tx)
+    tx.is_deleted = True
+    assert _marks(session) == {"fa-1": OLD, "fa-2": OLD}
+
+
+def test_a_new_payment_marks_nothing():
+    # stamped `now` at insert, after every cutoff
+    assert stale_snapshot_marks([_payment(created_at=None)], [], []) == {}
+
+
+def test_a_primed_balance_is_returned_without_walking():
+    account = FinancialAccount(uuid="fa-1", account_name="Cash", currency="USD")
+    account.payments = [_payment(amount=3.0)]
+    assert account.balance == 3.0
+    account.prime_balance(120.5)
+    assert account.balance == 120.5
+
+
+def test_snapshots_are_cut_on_the_hour_behind_the_clock():
+    cutoffs = []
+    uow = SimpleNamespace(financial_account_repository=SimpleNamespace(
+        write_snapshots=lambda cutoff: cutoffs.append(cutoff) or 1,
+    ))
+    FinancialAccountDomain.take_snapshots(uow, now=datetime(2025, 3, 4, 2, 40, 11))
+    FinancialAccountDomain.take_snapshots(uow, now=datetime(2025, 3, 4, 2, 55))
+    assert cutoffs == [datetime(2025, 3, 4, 1, 0)] * 2
@@ -113,6 +113,63 @@ def test_single_lot_oversell_matches_the_observed_behaviour():
     assert [(o.inventory_uuid, o.quantity) for o in out] == [("only", 1486)]
 
 
+# --- a whole basket at once (fulfilment) -------------------------------------
+# allocate_sales reads every lot in one statement and draws them down in memory.
+# It must answer exactly what calling the single allocator once per item gave,
+# when each item's events were flushed before the next item's FIFO query.
+
+class _Row:
+    def __init__(self, uuid, current_quantity, material_uuid=MATERIAL):
+        self.uuid = uuid
+        self.material_uuid = material_uuid
+        self.current_quantity = current_quantity
+
+
+class _BasketUow:
+    def __init__(self, rows):
+        self.inventory_repository = self
+        self._rows = rows
+
+    def lots_for_allocation(self, material_uuids, lot_uuids=()):
+        return self._rows
+
+
+def allocate_basket(rows, requests):
+    out = InventoryDomain.allocate_sales(uow=_BasketUow(rows), requests=requests)
+    return [[(o.inventory_uuid, o.quantity) for o in entry] for entry in out]
+
+
+def test_later_items_see_what_earlier_items_took():
+    out = allocate_basket([_Row("old", 100), _Row("new", 100)],
+                          [(MATERIAL, 60, None), (MATERIAL, 60, None)])
+    assert out == [[("old", 60)], [("old", 40), ("new", 20)]]
+
+
+def test_basket_overdraft_stays_on_the_lot_fifo_stopped_at():
+    out = allocate_basket([_Row("old", 100), _Row("new", 50)],
+                          [(MATERIAL, 120, None), (MATERIAL, 80, None)])
+    # the second item finds 'new' with 30 left and overdraws it by 50
+    assert out == [[("old", 100), ("new", 20)], [("new", 80)]]
+
+
+def test_basket_with_nothing_left_overdraws_the_newest_lot():
+    out = allocate_basket([_Row("drained", 0), _Row("newest", -5)], [(MATERIAL, 30, None)])
+    assert out == [[("newest", 30)]]
+
+
+def test_a_named_lot_skips_fifo_but_counts_against_it():
+    out = allocate_basket([_Row("old", 100), _Row("new", 100)],
+                          [(MATERIAL, 90, "old"), (MATERIAL, 20, None)])
+    assert out == [[("old", 90)], [("old", 10), ("new", 10)]]
+
+
+def test_basket_refuses_an_unknown_named_lot_and_a_material_without_lots():
+    with pytest.raises(NotFoundError, match="Inventory not found"):
+        allocate_basket([], [(MATERIAL, 1, "gone")])
+    with pytest.raises(BadRequestError, match="no inventory lot"):
+        allocate_basket([], [(MATERIAL, 1, None)])
+
+
 # --- unit cost when the receipts net to zero --------------------------------
 # A lot whose receipts were fully credited back leaves signed costs of
 # [+1000, -1000] over signed quantities of [+100, -100]. Dividing by that zero
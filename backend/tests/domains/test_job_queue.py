@@ -0,0 +1,240 @@
+"""The background job queue (app/domains/job, jobs/__main__.py).
+
+Pinned: a failed attempt is retried with a doubling delay until max_attempts,
+a domain "no" (ApiError) fails at once, dedupe keys are per account and a
+racing enqueue gets the live job, a job whose worker died on its last attempt
+is failed rather than claimed again, and the
+worker records the handler's outcome on the job in its own transaction — a
+handler that raises never takes the worker down with it.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.domains.job import domain as job_domain
+from app.domains.job.domain import JobDomain
+from app.dto.job import JobKind, JobStatus
+from app.entrypoint.routes.common.errors import BadRequestError
+from models.common import Job as JobModel
+
+
+class _Repo:
+    def __init__(self, existing=None, winner=None):
+        self.saved = []
+        self.existing = existing
+        self.winner = winner
+        self.filters = None
+        self.calls = []
+
+    def save(self, model, commit=False):
+        self.saved.append(model)
+
+    def insert_unless_live(self, job):
+        # ON CONFLICT DO NOTHING: a racing request's job wins over ours
+        if self.winner is not None:
+            return self.winner
+        self.saved.append(job)
+        return job
+
+    def fail_exhausted(self, lease, error):
+        self.calls.append("fail_exhausted")
+        return 0
+
+    def claim_next(self, worker_id, lease, exclude_kinds=()):
+        self.calls.append("claim_next")
+        return None
+
+    def _find_first_by_filters(self, filters=None, ordering=None):
+        self.filters = filters
+        return self.existing
+
+
+def _uow(existing=None, account_uuid="acc-1", winner=None):
+    return SimpleNamespace(job_repository=_Repo(existing, winner), account_uuid=account_uuid)
+
+
+def _running_job(attempts, max_attempts=3):
+    return JobModel(
+        uuid="j-1", kind=JobKind.EXCHANGE_RATE_BACKFILL.value, status="running",
+        attempts=attempts, max_attempts=max_attempts, locked_at=datetime.utcnow(),
+        locked_by="w", run_after=datetime.utcnow(),
+    )
+
+
+def test_enqueue_queues_a_fresh_job():
+    uow = _uow()
+    job = JobDomain.enqueue(uow, JobKind.EXCHANGE_RATE_BACKFILL, {"range": "1y"})
+    assert uow.job_repository.saved == [job]
+    assert job.status == JobStatus.QUEUED.value
+    assert job.attempts == 0
+    assert job.dedupe_key is None
+
+
+def test_a_live_job_with_the_same_key_is_reused():
+    live = _running_job(attempts=1)
+    uow = _uow(existing=live)
+    job = JobDomain.enqueue(uow, JobKind.EXCHANGE_RATE_BACKFILL, dedupe_key="exchange_rate_backfill")
+    assert job is live
+    assert uow.job_repository.saved == []
+
+
+def test_dedupe_keys_are_per_account():
+    uow = _uow(account_uuid="acc-7")
+    job = JobDomain.enqueue(uow, JobKind.EXCHANGE_RATE_BACKFILL, dedupe_key="k")
+    assert job.dedupe_key == "acc-7:k"
+
+
+def test_a_racing_enqueue_gets_the_winners_job():
+    # both requests missed the lookup; the insert that lost the race hands back
+    # the job that won it instead of failing on the unique index
+    winner = _running_job(attempts=0)
+    uow = _uow(winner=winner)
+    job = JobDomain.enqueue(uow, JobKind.EXCHANGE_RATE_BACKFILL, dedupe_key="exchange_rate_backfill")
+    assert job is winner
+    assert uow.job_repository.saved == []
+
+
+def test_claim_fails_exhausted_jobs_before_claiming():
+    uow = _uow()
+    assert JobDomain.claim(uow, worker_id="w-1") is None
+    assert uow.job_repository.calls == ["fail_exhausted", "claim_next"]
+
+
+def test_backfill_dedupe_keys_carry_the_params():
+    from datetime import date
+
+    from app.domains.exchange_rate.domain import ExchangeRateDomain
+    from app.dto.exchange_rate import ExchangeRatePullParams
+
+    def key(**params):
+        uow = _uow(account_uuid="acc-1")
+        return ExchangeRateDomain.enqueue_backfill(uow, ExchangeRatePullParams(**params)).dedupe_key
+
+    assert key(range="1y") == "acc-1:exchange_rate_backfill:USD:SYP:1y::"
+    assert key(range="1y") == key(range="1y")
+    # another pair, range or window is its own job, not the live USD/SYP one
+    assert key(range="1y") != key(range="1y", from_currency="SYP", to_currency="USD")
+    assert key(range="1y") != key(range="1m")
+    assert key(range="1y") != key(range="1y", start=date(2026, 1, 1))
+    assert key(range="1y", start=date(2026, 1, 1)) != key(range="1y", end=date(2026, 1, 1))
+
+
+def test_a_transient_failure_is_retried_with_backoff():
+    uow = _uow()
+    first = _running_job(attempts=1)
+    before = datetime.utcnow()
+    assert JobDomain.fail(uow, first, TimeoutError("sp-today timed out")) is True
+    assert first.status == JobStatus.QUEUED.value
+    assert first.locked_by is None
+    assert first.error == "TimeoutError: sp-today timed out"
+    assert first.run_after >= before + timedelta(seconds=job_domain.RETRY_BASE_SECONDS)
+
+    second = _running_job(attempts=2)
+    JobDomain.fail(uow, second, TimeoutError("again"))
+    assert second.run_after >= before + timedelta(seconds=2 * job_domain.RETRY_BASE_SECONDS)
+
+
+def test_the_last_attempt_fails_the_job():
+    job = _running_job(attempts=3, max_attempts=3)
+    assert JobDomain.fail(_uow(), job, TimeoutError("down")) is False
+    assert job.status == JobStatus.FAILED.value
+    assert job.finished_at is not None
+
+
+def test_a_domain_refusal_is_final():
+    job = _running_job(attempts=1)
+    assert JobDomain.fail(_uow(), job, BadRequestError("already completed")) is False
+    assert job.status == JobStatus.FAILED.value
+    assert job.error == "already completed"
+
+
+def test_success_stores_the_result_and_releases_the_lease():
+    job = _running_job(attempts=1)
+    job.error = "earlier attempt"
+    JobDomain.succeed(_uow(), job, {"created": 3})
+    assert job.status == JobStatus.SUCCEEDED.value
+    assert job.result == {"created": 3}
+    assert job.error is None
+    assert job.locked_at is None
+
+
+# --- the worker ---------------------------------------------------------------
+
+
+class _WorkerUow:
+    """Every `with SqlAlchemyUnitOfWork(...)` in run_one shares one job row."""
+    job = None
+    commits = 0
+
+    def __init__(self, account_uuid=None):
+        assert account_uuid is None  # the queue itself is read unscoped
+        self.job_repository = SimpleNamespace(
+            find_one=lambda uuid: _WorkerUow.job, save=lambda model, commit=False: None,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_a):
+        return False
+
+    def commit(self):
+        _WorkerUow.commits += 1
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    import jobs.__main__ as worker_main
+    from app.adapters.unit_of_work import sqlalchemy_unit_of_work
+    from jobs import handlers
+
+    _WorkerUow.job = None
+    _WorkerUow.commits = 0
+    monkeypatch.setattr(sqlalchemy_unit_of_work, "SqlAlchemyUnitOfWork", _WorkerUow)
+
+    def claim(uow, worker_id, kind_limits=None):
+        job = _WorkerUow.job
+        if job is None or job.status != "queued":
+            return None
+        job.status, job.attempts = "running", job.attempts + 1
+        return job
+
+    monkeypatch.setattr(JobDomain, "claim", staticmethod(claim))
+    return worker_main, handlers
+
+
+def _queued(kind=JobKind.EXCHANGE_RATE_BACKFILL):
+    return JobModel(
+        uuid="j-1", kind=kind.value, status="queued", attempts=0, max_attempts=3,
+        payload={"range": "1y"}, account_uuid="acc-1", created_by_uuid="u-1",
+    )
+
+
+def test_the_worker_records_a_handlers_result(worker, monkeypatch):
+    worker_main, handlers = worker
+    calls = []
+    monkeypatch.setitem(
+        handlers.HANDLERS, JobKind.EXCHANGE_RATE_BACKFILL.value,
+        lambda payload, account, user: calls.append((payload, account, user)) or {"ok": 1},
+    )
+    _WorkerUow.job = _queued()
+    assert worker_main.run_one("w-1", {}) is True
+    assert calls == [({"range": "1y"}, "acc-1", "u-1")]
+    assert _WorkerUow.job.status == JobStatus.SUCCEEDED.value
+    assert _WorkerUow.job.result == {"ok": 1}
+    assert _WorkerUow.commits == 2      # the claim, then the outcome
+    assert worker_main.run_one("w-1", {}) is False
+
+
+def test_a_raising_handler_is_recorded_not_raised(worker, monkeypatch):
+    worker_main, handlers = worker
+
+    def boom(payload, account, user):
+        raise ConnectionError("sp-today unreachable")
+
+    monkeypatch.setitem(handlers.HANDLERS, JobKind.EXCHANGE_RATE_BACKFILL.value, boom)
+    _WorkerUow.job = _queued()
+    assert worker_main.run_one("w-1", {}) is True
+    assert _WorkerUow.job.status == JobStatus.QUEUED.value
+    assert "sp-today unreachable" in _WorkerUow.job.error
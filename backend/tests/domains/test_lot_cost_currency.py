@@ -4,9 +4,10 @@ Every cost contribution is restated in the requested currency at the exchange
 rate whose market day is nearest the event's day. Nearest is the normal case,
 not a fallback: the source publishes nothing on idle market days, so exact-day
 misses are routine. Only a genuine GAP — no rate within a week of the day, and
-the day young enough for the source to still have it — triggers an on-the-spot
-sp-today pull: at most one per request, and always the full year, so one pull
-fixes every gap this request and later ones would hit.
+the day young enough for the source to still have it — queues an sp-today
+backfill for the jobs worker: at most one per request, and always the full
+year, so one pull fixes every gap later requests would hit. The scrape never
+runs inline; the request answers with the nearest rate it already has.
 
 A cost that cannot be converted (no currency on the row, no rate anywhere) is
 UNKNOWN, not zero: it is excluded from the average, a lot with nothing knowable
@@ -46,9 +47,21 @@ def _patch_closest(monkeypatch, rates, calls=None):
 
 
 def _forbid_backfill(monkeypatch):
-    def boom(**_kwargs):
+    def boom(*_args, **_kwargs):
         raise AssertionError("backfill should not have fired")
     monkeypatch.setattr(ExchangeRateDomain, "backfill", boom)
+    monkeypatch.setattr(ExchangeRateDomain, "enqueue_backfill", boom)
+
+
+def _record_queued(monkeypatch):
+    """Record the range of each queued backfill; an inline scrape still fails."""
+    _forbid_backfill(monkeypatch)
+    queued = []
+    monkeypatch.setattr(
+        ExchangeRateDomain, "enqueue_backfill",
+        lambda uow, params, **_kwargs: queued.append(params.range),
+    )
+    return queued
 
 
 def _forbid_closest(monkeypatch):
@@ -120,14 +133,10 @@ def test_same_currency_costs_never_touch_the_rate_table(monkeypatch):
 
 
 def test_a_zero_cost_needs_no_rate_and_stays_known(monkeypatch):
-    # 0 is 0 in every currency: with the rate table empty and the source
-    # unreachable, the free USD receipt still averages against the SYP one
+    # 0 is 0 in every currency: with the rate table empty, the free USD
+    # receipt still averages against the SYP one
     _patch_closest(monkeypatch, {})
-    _forbid_backfill_called = []
-    monkeypatch.setattr(
-        ExchangeRateDomain, "backfill",
-        lambda **kw: _forbid_backfill_called.append(1) or (_ for _ in ()).throw(Exception("down")),
-    )
+    _record_queued(monkeypatch)
     lot = _Lot("a", [
         _Event(100, cost_per_unit=0, currency="USD"),
         _Event(100, cost_per_unit=10, currency="SYP"),
@@ -182,7 +191,7 @@ def test_an_unknowable_ingredient_makes_the_process_output_unknown(monkeypatch):
     assert dto.cost_per_unit == pytest.approx(10)
 
 
-# --- the gap policy: nearest first, one full-year pull only for real gaps ---
+# --- the gap policy: nearest first, one queued full-year pull for real gaps ---
 
 
 def test_a_rate_a_few_days_away_is_used_without_pulling(monkeypatch):
@@ -192,82 +201,52 @@ def test_a_rate_a_few_days_away_is_used_without_pulling(monkeypatch):
     assert _enrich(_Uow(lot), "a").cost_per_unit == pytest.approx(240)
 
 
-def test_a_real_gap_pulls_the_full_year_once(monkeypatch):
-    calls = []
-    rates = _patch_closest(monkeypatch, {})
-
-    def fake_backfill(uow, backfill_range, **_kwargs):
-        calls.append(backfill_range)
-        rates[DAY] = RATE
-        rates[date(2026, 6, 1)] = 130.0
-
-    monkeypatch.setattr(ExchangeRateDomain, "backfill", fake_backfill)
+def test_a_real_gap_queues_the_full_year_once(monkeypatch):
+    _patch_closest(monkeypatch, {})
+    queued = _record_queued(monkeypatch)
 
-    other_day = datetime(2026, 6, 1)
     lot = _Lot("a", [
         _Event(100, cost_per_unit=2, currency="USD"),
-        _Event(100, cost_per_unit=2, currency="USD", created_at=other_day),
+        _Event(100, cost_per_unit=2, currency="USD", created_at=datetime(2026, 6, 1)),
     ])
     ctx = InventoryDomain.new_cost_context()
     dto = _enrich(_Uow(lot), "a", cost_ctx=ctx)
 
-    assert calls == [BackfillRange.ONE_YEAR]
-    assert ctx["rates_ingested"] is True
-    # each event converted at its own day's rate from the single pull
-    assert dto.cost_per_unit == pytest.approx((2 * RATE * 100 + 2 * 130.0 * 100) / 200)
-
-
-def test_the_pull_is_attempted_at_most_once_per_request(monkeypatch):
-    calls = []
-    rates = _patch_closest(monkeypatch, {})
+    assert queued == [BackfillRange.ONE_YEAR]
+    assert ctx["backfill_queued"] is True
+    # nothing was ingested on this request, so the cost stays unknown until
+    # the worker has run
+    assert dto.cost_per_unit is None
 
-    def fake_backfill(uow, backfill_range, **_kwargs):
-        calls.append(backfill_range)
-        rates[DAY] = RATE  # the pull happens to cover only one of the days
 
-    monkeypatch.setattr(ExchangeRateDomain, "backfill", fake_backfill)
+def test_a_gap_answers_with_the_nearest_recorded_day_meanwhile(monkeypatch):
+    _patch_closest(monkeypatch, {DAY - timedelta(days=60): 100.0})
+    queued = _record_queued(monkeypatch)
 
     lot = _Lot("a", [
         _Event(100, cost_per_unit=2, currency="USD"),
         _Event(100, cost_per_unit=2, currency="USD", created_at=datetime(2026, 1, 5)),
     ])
-    dto = _enrich(_Uow(lot), "a")
-    assert len(calls) == 1
-    # the uncovered day settles for the nearest recorded rate
-    assert dto.cost_per_unit == pytest.approx(2 * RATE)
+    ctx = InventoryDomain.new_cost_context()
+    dto = _enrich(_Uow(lot), "a", cost_ctx=ctx)
+    # two gapped days, one queued backfill
+    assert len(queued) == 1
+    assert dto.cost_per_unit == pytest.approx(200)
 
 
-def test_days_beyond_the_sources_reach_never_trigger_a_pull(monkeypatch):
+def test_days_beyond_the_sources_reach_never_queue_a_backfill(monkeypatch):
     _forbid_backfill(monkeypatch)
     old_day = datetime.combine(date.today() - timedelta(days=500), datetime.min.time())
     _patch_closest(monkeypatch, {date.today() - timedelta(days=360): 110.0})
     lot = _Lot("a", [_Event(100, cost_per_unit=2, currency="USD", created_at=old_day)])
-    assert _enrich(_Uow(lot), "a").cost_per_unit == pytest.approx(220)
-
-
-def test_a_dead_rate_source_falls_back_to_the_nearest_recorded_day(monkeypatch):
-    from app.entrypoint.routes.common.errors import BadRequestError
-
-    _patch_closest(monkeypatch, {DAY - timedelta(days=60): 100.0})
-    monkeypatch.setattr(
-        ExchangeRateDomain, "backfill",
-        lambda **_kwargs: (_ for _ in ()).throw(BadRequestError("sp-today is down")),
-    )
-    lot = _Lot("a", [_Event(100, cost_per_unit=2, currency="USD")])
     ctx = InventoryDomain.new_cost_context()
-    dto = _enrich(_Uow(lot), "a", cost_ctx=ctx)
-    assert dto.cost_per_unit == pytest.approx(200)
-    assert ctx["rates_ingested"] is False
+    assert _enrich(_Uow(lot), "a", cost_ctx=ctx).cost_per_unit == pytest.approx(220)
+    assert ctx["backfill_queued"] is False
 
 
 def test_no_rate_anywhere_means_unknown_cost_not_a_crash(monkeypatch):
-    from app.entrypoint.routes.common.errors import BadRequestError
-
     _patch_closest(monkeypatch, {})
-    monkeypatch.setattr(
-        ExchangeRateDomain, "backfill",
-        lambda **_kwargs: (_ for _ in ()).throw(BadRequestError("down")),
-    )
+    _record_queued(monkeypatch)
     lot = _Lot("a", [
         _Event(100, cost_per_unit=2, currency="USD"),
         _Event(100, cost_per_unit=134, currency="SYP"),
@@ -277,6 +256,24 @@ def test_no_rate_anywhere_means_unknown_cost_not_a_crash(monkeypatch):
     assert dto.cost_per_unit == pytest.approx(134)
 
 
+def test_the_dashboard_converter_queues_instead_of_scraping(monkeypatch):
+    from app.domains.exchange_rate.converter import CurrencyConverter
+
+    _patch_closest(monkeypatch, {DAY - timedelta(days=60): 100.0})
+    queued = _record_queued(monkeypatch)
+    conv = CurrencyConverter(uow=None, target=Currency.SYP)
+    # the rate it already has answers now; nothing is claimed as ingested
+    assert conv.convert(2, "USD", DAY) == pytest.approx(200)
+    assert conv.convert(3, "USD", datetime(2026, 1, 5)) == pytest.approx(300)
+    assert queued == [BackfillRange.ONE_YEAR]
+    assert conv.backfill_queued is True
+
+    _patch_closest(monkeypatch, {})
+    empty = CurrencyConverter(uow=None, target=Currency.SYP)
+    # no rate at all is "rate missing", never a number
+    assert empty.convert(2, "USD", DAY) is None
+
+
 # --- picking the nearest market day (real query, real SQLite) ---------------
 
 ACCOUNT = "acct-1"
@@ -0,0 +1,110 @@
+"""Operators are shared per process and measured on every call.
+
+complete_task_execution used to build a fresh OperatorEntryPoint, and with it
+a fresh operator, for every completion. The operator then read the task
+execution the domain had just loaded by uuid a second time. Operators now
+come from one OperatorRegistry per process and get the loaded execution
+passed in. Each call is timed and its statements counted in
+REGISTRY.metrics, which GET /task_execution/operator-metrics exports.
+
+Sharing instances is only safe because the state execute() keeps on `self`
+is per thread: the job worker completes tasks on several threads at once.
+"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.domains.task_execution.workflow_operators.operator_entry_point import (
+    OperatorEntryPoint,
+    OperatorRegistry,
+)
+from app.domains.task_execution.workflow_operators.operator_interface import OperatorInterface
+from app.dto.task_execution import OperatorType, TaskExecutionComplete
+
+
+class _Repo:
+    def __init__(self):
+        self.saved = []
+
+    def find_one(self, **kwargs):
+        raise AssertionError("the loaded task execution should have been used")
+
+    def save(self, model, commit=False):
+        self.saved.append(model)
+
+
+def _uow():
+    return SimpleNamespace(task_execution_repository=_Repo())
+
+
+def _payload():
+    return TaskExecutionComplete(uuid="te-1", result={"ok": True})
+
+
+def test_operators_are_instantiated_once_per_registry():
+    registry = OperatorRegistry()
+    first = OperatorEntryPoint(registry).operator(OperatorType.NOOP_OPERATOR)
+    assert OperatorEntryPoint(registry).operator(OperatorType.NOOP_OPERATOR) is first
+    assert OperatorEntryPoint(registry).operator(OperatorType.NOOP_OPERATOR.value) is first
+
+
+def test_the_loaded_task_execution_is_passed_through_and_measured():
+    registry = OperatorRegistry()
+    uow, task_exe = _uow(), SimpleNamespace()
+    OperatorEntryPoint(registry).execute(
+        uow=uow, payload=_payload(), operator_type=OperatorType.NOOP_OPERATOR.value,
+        task_execution=task_exe,
+    )
+    assert task_exe.status == "completed"
+    assert uow.task_execution_repository.saved == [task_exe]
+
+    stats = registry.metrics.snapshot()[OperatorType.NOOP_OPERATOR.value]
+    assert stats["calls"] == 1 and stats["errors"] == 0
+    assert stats["seconds_max"] >= 0 and stats["statements_total"] == 0
+
+
+def test_a_failing_call_is_counted_as_an_error():
+    registry = OperatorRegistry()
+    with pytest.raises(AssertionError):
+        # no task_execution: the operator reads it, and this repo refuses
+        OperatorEntryPoint(registry).execute(
+            uow=_uow(), payload=_payload(), operator_type=OperatorType.NOOP_OPERATOR,
+        )
+    stats = registry.metrics.snapshot()[OperatorType.NOOP_OPERATOR.value]
+    assert stats["calls"] == 1 and stats["errors"] == 1
+
+
+def test_statements_are_counted_per_thread():
+    registry = OperatorRegistry()
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))  # outside any operator: not counted
+        registry.metrics.measure(
+            OperatorType.NOOP_OPERATOR, lambda: [conn.execute(text("SELECT 1")) for _ in range(3)],
+        )
+        conn.execute(text("SELECT 1"))
+    assert registry.metrics.snapshot()[OperatorType.NOOP_OPERATOR.value]["statements_total"] == 3
+
+
+def test_per_call_state_is_not_shared_between_threads():
+    class _Operator(OperatorInterface):
+        pass
+
+    operator = _Operator()
+    operator.task_exe = "main"
+    seen = []
+
+    def other_thread():
+        seen.append(hasattr(operator, "task_exe"))
+        operator.task_exe = "other"
+        seen.append(operator.task_exe)
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    thread.join()
+    assert seen == [False, "other"]
+    assert operator.task_exe == "main"
+    operator.release()
+    assert not hasattr(operator, "task_exe")
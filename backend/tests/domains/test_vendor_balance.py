@@ -0,0 +1,35 @@
+"""Vendor.balance_per_currency: primed from the grouped query, walked otherwise.
+
+VendorRepository.balances_per_currency mirrors the customer query pinned in
+tests/perf/test_customer_balance.py; here only the model's side of the
+contract and the empty-page short cut.
+"""
+from app.adapters.repositories.vendor_repository import VendorRepository
+from models.common import CreditNoteItem, DebitNoteItem, Vendor
+
+
+def _vendor(debit=1.0, credit=1.0):
+    vendor = Vendor(uuid="v-1", is_deleted=False)
+    vendor.debit_note_items = [
+        DebitNoteItem(uuid="d-1", amount=debit, currency="USD", is_deleted=False)
+    ]
+    vendor.credit_note_items = [
+        CreditNoteItem(uuid="c-1", amount=credit, currency="SYP", is_deleted=False)
+    ]
+    return vendor
+
+
+def test_an_unprimed_vendor_still_walks_its_notes():
+    assert _vendor(debit=10.0, credit=4.0).balance_per_currency == {"USD": -10.0, "SYP": 4.0}
+
+
+def test_a_primed_balance_is_returned_without_walking():
+    vendor = _vendor(debit=10.0)
+    vendor.prime_balance_per_currency({"USD": 0.0, "SYP": 0.0})
+    assert vendor.balance_per_currency == {"USD": 0.0, "SYP": 0.0}
+
+
+def test_an_empty_page_costs_no_query():
+    repo = VendorRepository.__new__(VendorRepository)
+    repo._session = None  # any query would blow up on this
+    assert repo.balances_per_currency([]) == {}
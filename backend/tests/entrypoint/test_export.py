@@ -0,0 +1,110 @@
+"""Streaming exports (app/entrypoint/routes/common/export.py).
+
+Pinned: the body is produced batch by batch from the repository's
+`stream_columns` (nothing is read before the response starts streaming), the
+UoW is opened inside the stream and closed once it is drained, NDJSON and CSV
+carry the same rows, and a bad ?format= is the usual validation 422, not a
+500 from inside the stream.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from app.dto.export import ExportParams
+from app.entrypoint.routes.common import export as export_module
+from app.entrypoint.routes.common.errors import register_error_handlers
+
+ROWS = [
+    {"uuid": "c-1", "created_at": datetime(2025, 1, 1, 8, 0), "company_name": "Café, Ltd"},
+    {"uuid": "c-2", "created_at": datetime(2025, 1, 2, 8, 0), "company_name": None},
+    {"uuid": "c-3", "created_at": datetime(2025, 1, 3, 8, 0), "company_name": "Third"},
+]
+COLUMNS = [SimpleNamespace(key=k) for k in ("uuid", "created_at", "company_name")]
+
+
+class _Repo:
+    def __init__(self, uow):
+        self.uow = uow
+
+    def stream_columns(self, columns, filters=None, ordering=None, batch_size=1000):
+        self.uow.calls.append(batch_size)
+        yield ROWS[:2]
+        yield ROWS[2:]
+
+
+class _Uow:
+    instances = []
+
+    def __init__(self):
+        self.calls = []
+        self.closed = False
+        self.customer_repository = _Repo(self)
+        _Uow.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_a):
+        self.closed = True
+        return False
+
+
+@pytest.fixture
+def export_app(monkeypatch):
+    _Uow.instances = []
+    monkeypatch.setattr(export_module, "SqlAlchemyUnitOfWork", _Uow)
+    app = Flask(__name__)
+    register_error_handlers(app)
+
+    @app.route("/export")
+    def export():
+        from flask import request
+        params = ExportParams(**request.args)
+        return export_module.export_response(
+            "customer_repository", COLUMNS, [], [], params, "customers"
+        )
+
+    return app
+
+
+def test_ndjson_streams_every_row(export_app):
+    response = export_app.test_client().get("/export")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert 'filename="customers.ndjson"' in response.headers["Content-Disposition"]
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [line["uuid"] for line in lines] == ["c-1", "c-2", "c-3"]
+    assert lines[0]["created_at"] == "2025-01-01T08:00:00"
+    assert lines[1]["company_name"] is None
+    (uow,) = _Uow.instances
+    assert uow.calls == [export_module.EXPORT_BATCH_SIZE]
+    assert uow.closed
+
+
+def test_csv_has_header_and_quotes_cells(export_app):
+    response = export_app.test_client().get("/export?format=csv")
+    assert response.mimetype == "text/csv"
+    rows = list(csv.reader(io.StringIO(response.data.decode())))
+    assert rows[0] == ["uuid", "created_at", "company_name"]
+    assert rows[1] == ["c-1", "2025-01-01T08:00:00", "Café, Ltd"]
+    assert rows[2] == ["c-2", "2025-01-02T08:00:00", ""]
+    assert len(rows) == 4
+
+
+def test_nothing_is_read_until_the_body_is_consumed(export_app):
+    with export_app.test_request_context("/export"):
+        response = export_module.export_response(
+            "customer_repository", COLUMNS, [], [], ExportParams(), "customers"
+        )
+        assert _Uow.instances == []
+        assert b"c-3" in b"".join(response.response)
+
+
+def test_unknown_format_is_rejected(export_app):
+    response = export_app.test_client().get("/export?format=xlsx")
+    assert response.status_code == 422
@@ -0,0 +1,93 @@
+"""The fast list-response path must produce the same documents as the old one.
+
+`dump_rows` + `page_response` replaced `from_orm(...).model_dump()` per row
+followed by a `*Page(...).model_dump()` and `jsonify`. Pinned here: the rows
+and the envelope come out equal to what the Page model produced, across the
+chunk boundary of the streamed body and for an empty page, and the app-wide
+JSON provider keeps jsonify's handling of datetimes.
+"""
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List, Optional
+
+from flask import Flask, jsonify
+from pydantic import BaseModel, ConfigDict
+
+from app.adapters.repositories._abstract_repo import Pagination
+from app.entrypoint.routes.common import serialization
+from app.entrypoint.routes.common.serialization import (
+    FastJSONProvider,
+    dump_rows,
+    page_response,
+)
+
+
+class _Read(BaseModel):
+    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    uuid: str
+    created_at: datetime
+    balance: dict[str, float]
+    notes: Optional[str] = None
+
+
+class _Page(BaseModel):
+    rows: List[_Read]
+    total_count: int
+    page: int
+    per_page: int
+    pages: int
+
+
+def _orm_rows(n):
+    return [
+        SimpleNamespace(uuid=f"u-{i}", created_at=datetime(2025, 1, 1, 12, i % 60),
+                        balance={"USD": i * 1.5}, notes=None if i % 2 else "é")
+        for i in range(n)
+    ]
+
+
+def _old_path(rows, page_obj):
+    items = [_Read.model_validate(r).model_dump(mode="json") for r in rows]
+    return _Page(rows=items, total_count=page_obj.total, page=page_obj.page,
+                 per_page=page_obj.per_page, pages=page_obj.pages).model_dump(mode="json")
+
+
+def _app():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    return app
+
+
+def test_dump_rows_matches_per_row_model_dump():
+    rows = _orm_rows(3)
+    assert dump_rows(_Read, rows) == [
+        _Read.model_validate(r).model_dump(mode="json") for r in rows
+    ]
+
+
+def test_page_response_matches_page_model_across_chunks(monkeypatch):
+    monkeypatch.setattr(serialization, "STREAM_CHUNK_ROWS", 4)
+    rows = _orm_rows(10)
+    page_obj = Pagination(items=rows, total=25, page=1, per_page=10)
+    with _app().test_request_context():
+        response = page_response("rows", dump_rows(_Read, rows), page_obj)
+        body = b"".join(response.response)
+    assert json.loads(body) == _old_path(rows, page_obj)
+
+
+def test_page_response_empty_page():
+    page_obj = Pagination(items=[], total=0, page=3, per_page=20)
+    with _app().test_request_context():
+        body = b"".join(page_response("rows", [], page_obj).response)
+    assert json.loads(body) == _old_path([], page_obj)
+
+
+def test_provider_keeps_jsonify_datetime_format():
+    stamp = datetime(2025, 1, 2, 3, 4, 5)
+    with _app().test_request_context():
+        fast = jsonify({"at": stamp, "n": 1}).get_json()
+    plain = Flask(__name__)
+    with plain.test_request_context():
+        stock = jsonify({"at": stamp, "n": 1}).get_json()
+    assert fast == stock
@@ -0,0 +1,279 @@
+"""Bulk seed for the query-budget suite.
+
+One tenant with enough rows that anything done per row is visible in a
+statement count: customers with orders, invoices and payments, trips with
+stops and vehicle stock, workflow executions, inventory lots and expenses.
+
+Rows are written with Core executemany (`conn.execute(table.insert(), rows)`)
+rather than through the ORM or the domains: the seed is not what is being
+measured, and the ORM would spend minutes on a few hundred thousand objects.
+uuids are generated here so the relationships can be wired without a
+round-trip per parent.
+
+Volumes scale linearly with `scale` (PERF_SCALE in the environment), so the
+same suite can be pointed at a larger dataset when hunting a regression that
+only shows at production size.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import List
+
+from models.common import (
+    Account,
+    Customer,
+    CustomerOrder,
+    CustomerOrderItem,
+    ExchangeRate,
+    Expense,
+    FinancialAccount,
+    Inventory,
+    InventoryEvent,
+    Invoice,
+    InvoiceItem,
+    Material,
+    Payment,
+    TaskExecution,
+    Trip,
+    TripStop,
+    User,
+    Vehicle,
+    VehicleInventory,
+    VehicleInventoryEvent,
+    Warehouse,
+    Workflow,
+    WorkflowExecution,
+)
+
+# days of USD->SYP rates to lay down: comfortably more than any dashboard
+# window, so CurrencyConverter always finds a rate and never queues a
+# backfill in the middle of a measured request
+RATE_DAYS = 400
+
+
+@dataclass
+class PerfData:
+    account_uuid: str
+    admin_uuid: str
+    customer_uuids: List[str] = field(default_factory=list)
+    trip_uuids: List[str] = field(default_factory=list)
+    vehicle_uuids: List[str] = field(default_factory=list)
+    workflow_execution_uuids: List[str] = field(default_factory=list)
+
+
+def _uuid():
+    return str(uuid.uuid4())
+
+
+def _point(lon, lat):
+    return f"SRID=4326;POINT({lon} {lat})"
+
+
+def _insert(conn, model, rows):
+    if rows:
+        conn.execute(model.__table__.insert(), rows)
+
+
+def seed(engine, scale: float = 1.0, rng_seed: int = 1234) -> PerfData:
+    rng = random.Random(rng_seed)
+    n = lambda base: max(1, int(base * scale))
+    now = datetime.utcnow()
+    ago = lambda max_days: now - timedelta(days=rng.uniform(0, max_days))
+
+    account_uuid, admin_uuid = _uuid(), _uuid()
+    data = PerfData(account_uuid=account_uuid, admin_uuid=admin_uuid)
+    acct = {"account_uuid": account_uuid, "created_by_uuid": admin_uuid}
+
+    with engine.begin() as conn:
+        _insert(conn, Account, [{
+            "uuid": account_uuid, "company_name": "Perf Co", "created_at": now,
+            "is_deleted": False, "is_blocked": False, "is_verified": True,
+            "verified_at": now, "subscription_type": "flat",
+        }])
+        _insert(conn, User, [{
+            "uuid": admin_uuid, "account_uuid": account_uuid,
+            "username": "perf-admin", "first_name": "Perf", "last_name": "Admin",
+            # never logged in with: the suite mints its token directly
+            "password": "!", "permission_scope": "admin", "created_at": now,
+            "is_deleted": False, "is_active": True,
+            "track_location": False, "location_ping_seconds": 15,
+        }])
+
+        _insert(conn, ExchangeRate, [
+            {**acct, "uuid": _uuid(), "created_at": now, "from_currency": "USD",
+             "to_currency": "SYP", "rate": 13000.0 + rng.uniform(-200, 200),
+             "rate_date": date.today() - timedelta(days=d), "source": "manual",
+             "is_deleted": False}
+            for d in range(RATE_DAYS)
+        ])
+
+        materials = [
+            {**acct, "uuid": _uuid(), "name": f"Material {i}", "sku": f"PERF-{i:04d}",
+             "type": "product", "measure_unit": "kg", "created_at": now,
+             "is_deleted": False}
+            for i in range(n(20))
+        ]
+        _insert(conn, Material, materials)
+        material_uuids = [m["uuid"] for m in materials]
+
+        warehouses = [
+            {**acct, "uuid": _uuid(), "name": f"Warehouse {i}",
+             "address": f"{i} Perf Street", "coordinates": _point(36.3, 33.5),
+             "created_at": now, "is_deleted": False}
+            for i in range(2)
+        ]
+        _insert(conn, Warehouse, warehouses)
+
+        lots, lot_events = [], []
+        for i in range(n(40)):
+            lot_uuid, material_uuid = _uuid(), rng.choice(material_uuids)
+            lots.append({**acct, "uuid": lot_uuid, "material_uuid": material_uuid,
+                         "warehouse_uuid": rng.choice(warehouses)["uuid"],
+                         "lot_id": f"LOT-{i:05d}", "unit": "kg", "created_at": ago(200),
+                         "is_deleted": False, "is_active": True})
+            lot_events.append({**acct, "uuid": _uuid(), "inventory_uuid": lot_uuid,
+                               "material_uuid": material_uuid, "event_type": "manual",
+                               "quantity": 1000.0, "cost_per_unit": 2.0, "currency": "USD",
+                               "affect_original": True, "created_at": ago(200),
+                               "is_deleted": False})
+            for _ in range(4):
+                lot_events.append({**acct, "uuid": _uuid(), "inventory_uuid": lot_uuid,
+                                   "material_uuid": material_uuid, "event_type": "sale",
+                                   "quantity": -float(rng.randint(1, 50)),
+                                   "affect_original": False, "created_at": ago(200),
+                                   "is_deleted": False})
+        _insert(conn, Inventory, lots)
+        _insert(conn, InventoryEvent, lot_events)
+
+        cash = {**acct, "uuid": _uuid(), "account_name": "Cash USD", "currency": "USD",
+                "created_at": now, "is_deleted": False, "is_external": False}
+        _insert(conn, FinancialAccount, [cash])
+
+        customers = [
+            {**acct, "uuid": _uuid(), "company_name": f"Customer {i}",
+             "full_name": f"Owner {i}", "phone_number": f"+9639{i:08d}",
+             "full_address": f"{i} Market Road", "category": "minimarket",
+             "coordinates": _point(36.2 + rng.uniform(0, 0.2), 33.4 + rng.uniform(0, 0.2)),
+             "created_at": ago(365), "is_deleted": False}
+            for i in range(n(2000))
+        ]
+        _insert(conn, Customer, customers)
+        data.customer_uuids = [c["uuid"] for c in customers]
+
+        vehicles = [
+            {**acct, "uuid": _uuid(), "plate_number": f"PERF-{i:03d}", "model": "Van",
+             "make": "Perf", "year": 2020, "color": "white", "status": "active",
+             "created_at": now, "is_deleted": False}
+            for i in range(n(5))
+        ]
+        _insert(conn, Vehicle, vehicles)
+        data.vehicle_uuids = [v["uuid"] for v in vehicles]
+
+        vehicle_stock, vehicle_events = [], []
+        for vehicle in vehicles:
+            for material_uuid in material_uuids:
+                vi_uuid = _uuid()
+                vehicle_stock.append({**acct, "uuid": vi_uuid, "vehicle_uuid": vehicle["uuid"],
+                                      "material_uuid": material_uuid, "unit": "kg",
+                                      "is_active": True, "created_at": ago(200),
+                                      "is_deleted": False})
+                for _ in range(5):
+                    vehicle_events.append({**acct, "uuid": _uuid(),
+                                           "vehicle_inventory_uuid": vi_uuid,
+                                           "material_uuid": material_uuid,
+                                           "event_type": "manual",
+                                           "quantity": float(rng.randint(1, 20)),
+                                           "created_at": ago(200), "is_deleted": False})
+        _insert(conn, VehicleInventory, vehicle_stock)
+        _insert(conn, VehicleInventoryEvent, vehicle_events)
+
+        workflow_uuid = _uuid()
+        _insert(conn, Workflow, [{"uuid": workflow_uuid, "created_by_uuid": admin_uuid,
+                                  "name": "perf-trip", "created_at": now,
+                                  "is_deleted": False, "tags": [], "parameters": {},
+                                  "callback_fns": []}])
+        executions, task_executions = [], []
+        for _ in range(n(300)):
+            wfe_uuid, started = _uuid(), ago(120)
+            executions.append({**acct, "uuid": wfe_uuid, "workflow_uuid": workflow_uuid,
+                               "status": rng.choice(["in_progress", "completed"]),
+                               "created_at": started, "start_time": started,
+                               "is_deleted": False, "result": {}, "parameters": {}})
+            for _ in range(3):
+                task_executions.append({**acct, "uuid": _uuid(),
+                                        "workflow_execution_uuid": wfe_uuid,
+                                        "status": "completed", "created_at": started,
+                                        "result": {}, "depends_on": []})
+        _insert(conn, WorkflowExecution, executions)
+        _insert(conn, TaskExecution, task_executions)
+        data.workflow_execution_uuids = [e["uuid"] for e in executions]
+
+        trips, stops = [], []
+        for i in range(n(60)):
+            trip_uuid, started = _uuid(), ago(120)
+            trips.append({**acct, "uuid": trip_uuid, "name": f"Trip {i}",
+                          "vehicle_uuid": rng.choice(vehicles)["uuid"],
+                          "status": "completed", "created_at": started,
+                          "start_time": started, "end_time": started + timedelta(hours=8),
+                          "workflow_execution_uuid": executions[i % len(executions)]["uuid"],
+                          "is_deleted": False, "data": {}, "service_area_names": []})
+            for index in range(15):
+                customer = rng.choice(customers)
+                stops.append({**acct, "uuid": _uuid(), "trip_uuid": trip_uuid,
+                              "customer_uuid": customer["uuid"],
+                              "coordinates": customer["coordinates"],
+                              "status": "completed", "index": index,
+                              "created_at": started, "sales": {}})
+        _insert(conn, Trip, trips)
+        _insert(conn, TripStop, stops)
+        data.trip_uuids = [t["uuid"] for t in trips]
+
+        orders, items, invoices, invoice_items, payments = [], [], [], [], []
+        for _ in range(n(3000)):
+            customer_uuid, created = rng.choice(data.customer_uuids), ago(365)
+            stop = rng.choice(stops) if rng.random() < 0.3 else None
+            order_uuid, invoice_uuid = _uuid(), _uuid()
+            orders.append({**acct, "uuid": order_uuid, "customer_uuid": customer_uuid,
+                           "created_at": created, "is_deleted": False,
+                           "trip_stop_uuid": stop["uuid"] if stop else None})
+            invoices.append({**acct, "uuid": invoice_uuid, "customer_uuid": customer_uuid,
+                             "customer_order_uuid": order_uuid, "currency": "USD",
+                             "created_at": created, "is_deleted": False})
+            total = 0.0
+            for _ in range(rng.randint(1, 3)):
+                item_uuid, quantity = _uuid(), rng.randint(1, 10)
+                price = round(rng.uniform(1, 20), 2)
+                total += quantity * price
+                items.append({**acct, "uuid": item_uuid, "customer_order_uuid": order_uuid,
+                              "material_uuid": rng.choice(material_uuids),
+                              "quantity": quantity, "unit": "kg", "is_fulfilled": True,
+                              "fulfilled_at": created, "created_at": created,
+                              "is_deleted": False})
+                invoice_items.append({**acct, "uuid": _uuid(), "invoice_uuid": invoice_uuid,
+                                      "customer_order_item_uuid": item_uuid,
+                                      "price_per_unit": price, "unit": "kg",
+                                      "created_at": created, "is_deleted": False})
+            if rng.random() < 0.66:
+                payments.append({**acct, "uuid": _uuid(), "invoice_uuid": invoice_uuid,
+                                 "financial_account_uuid": cash["uuid"],
+                                 "amount": round(total * rng.choice([0.5, 1.0]), 2),
+                                 "currency": "USD", "payment_method": "cash",
+                                 "created_at": created, "is_deleted": False,
+                                 "trip_stop_uuid": stop["uuid"] if stop else None})
+        _insert(conn, CustomerOrder, orders)
+        _insert(conn, CustomerOrderItem, items)
+        _insert(conn, Invoice, invoices)
+        _insert(conn, InvoiceItem, invoice_items)
+        _insert(conn, Payment, payments)
+
+        _insert(conn, Expense, [
+            {**acct, "uuid": _uuid(), "amount": round(rng.uniform(5, 500), 2),
+             "currency": rng.choice(["USD", "SYP"]),
+             "category": rng.choice(["travel", "maintenance", "supplies", "rent"]),
+             "trip_uuid": rng.choice(data.trip_uuids) if rng.random() < 0.4 else None,
+             "created_at": ago(365), "is_deleted": False}
+            for _ in range(n(500))
+        ])
+
+    return data
@@ -0,0 +1,89 @@
+"""The driver app's checkout stays within a fixed query budget.
+
+create_order_checkout used to look up each line's material, invoice
+item and order item separately. It re-fetched the invoice and the order to
+rebuild the response, re-read the invoice for the amount due, and then read
+the order once more. Every hybrid on the way lazy-loaded its collections.
+Now the materials resolve in at most one SELECT and each table gets one
+INSERT. The new order graph stays loaded, so totals and the response are
+computed in memory. This suite checks out a SMALL and a LARGE basket (fulfil
+and pay) at a seeded trip stop and requires:
+
+  * the same statement count for both, within MAX_STATEMENTS;
+  * a response that agrees with the database: totals, a paid invoice and
+    fulfilled items.
+
+Timings are printed so `-s` doubles as the benchmark.
+"""
+import pytest
+
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+SMALL, LARGE = 1, 12
+MAX_STATEMENTS = 20
+
+
+def test_checkout_is_a_fixed_number_of_statements(perf_data, count_queries):
+    from app.adapters.repositories.material_repository import invalidate_materials
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from app.domains.customer_order.domain import CustomerOrderDomain
+    from app.domains.vehicle_inventory.domain import VehicleInventoryDomain
+    from app.dto.customer_order import CustomerOrderCheckoutCreate
+    from models.common import FinancialAccount, Inventory, Invoice, TripStop
+
+    # never committed: the UoW rolls back on exit
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        stop = uow.session.query(TripStop).filter(TripStop.account_uuid == perf_data.account_uuid).first()
+        cash = uow.session.query(FinancialAccount).filter(
+            FinancialAccount.account_uuid == perf_data.account_uuid, FinancialAccount.currency == "USD",
+        ).first()
+        material_uuids = [m for (m,) in uow.session.query(Inventory.material_uuid).filter(
+            Inventory.account_uuid == perf_data.account_uuid).distinct()]
+        # the van already carries every material, as it does mid-trip
+        for material_uuid in material_uuids:
+            VehicleInventoryDomain.get_or_create_inventory(
+                uow=uow, vehicle_uuid=stop.trip.vehicle_uuid, material_uuid=material_uuid,
+            )
+
+        results = {}
+        for size in (SMALL, LARGE):
+            payload = CustomerOrderCheckoutCreate(
+                customer_uuid=perf_data.customer_uuids[0],
+                currency="USD",
+                trip_stop_uuid=stop.uuid,
+                items=[{"material_uuid": material_uuids[i % len(material_uuids)],
+                        "quantity": i % 5 + 1, "price_per_unit": 2.5}
+                       for i in range(size)],
+                fulfill=True,
+                pay=True,
+                financial_account_uuid=cash.uuid,
+                payment_method="cash",
+            )
+            uow.session.expire_all()
+            # both sizes start with the material cache cold
+            invalidate_materials()
+            uow.session.info.pop("material_refs", None)
+            with count_queries() as counter:
+                full = CustomerOrderDomain.create_order_checkout(uow=uow, payload=payload)
+            results[size] = counter
+            print(f"\ncheckout {size} lines: {counter.count} statements, "
+                  f"{counter.elapsed * 1000:.1f} ms")
+
+            invoice = full.invoices[0]
+            expected = sum(2.5 * (i % 5 + 1) for i in range(size))
+            assert invoice.total_amount == pytest.approx(expected)
+            assert invoice.net_amount_paid == pytest.approx(expected)
+            assert invoice.is_paid and invoice.status == "paid"
+            assert full.customer_order.is_fulfilled
+            assert len(full.customer_order.customer_order_items) == size
+            assert len(invoice.invoice_items) == size
+
+            uow.session.expire_all()
+            stored = uow.session.get(Invoice, invoice.uuid)
+            assert stored.net_amount_paid == pytest.approx(invoice.net_amount_paid)
+            assert stored.net_amount_due == pytest.approx(0)
+
+    small, large = results[SMALL], results[LARGE]
+    assert large.count == small.count, (small.statements, large.statements)
+    assert large.count <= MAX_STATEMENTS, large.statements
+    assert large.elapsed <= 0.5 * LATENCY_FACTOR
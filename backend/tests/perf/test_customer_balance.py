@@ -0,0 +1,69 @@
+"""The set-based customer balance (CustomerRepository.balances_per_currency).
+
+Pinned against the seeded tenant:
+
+  * PARITY: the grouped query gives the same per-currency balance as the
+    model's own walk over orders, invoices and notes, customer by customer.
+  * COST: a whole page of balances is ONE statement however many customers it
+    covers, and the per-customer cost on a 10k-customer page (or as many as
+    PERF_SCALE seeded) stays under PER_CUSTOMER_SECONDS. The figure is printed
+    so a run with `-s` doubles as the benchmark: the walk it replaced measured
+    ~1.4 ms per customer (see app/dto/customer.py).
+"""
+import time
+
+import pytest
+
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+PAGE = 10_000
+PER_CUSTOMER_SECONDS = 0.0002
+PARITY_SAMPLE = 200
+
+
+def _uow(perf_data):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    return SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid)
+
+
+def test_grouped_balances_match_the_model_walk(perf_data):
+    uuids = perf_data.customer_uuids[:PARITY_SAMPLE]
+    with _uow(perf_data) as uow:
+        grouped = uow.customer_repository.balances_per_currency(uuids)
+        from models.common import Customer
+        sample = uow.customer_repository._find_all_by_filters(
+            filters=[Customer.uuid.in_(uuids)]
+        )
+        for customer in sample:
+            walked = customer.balance_per_currency
+            for currency, amount in walked.items():
+                assert grouped[customer.uuid][currency] == pytest.approx(amount, abs=1e-6), (
+                    customer.uuid, currency,
+                )
+
+
+def test_a_page_of_balances_is_one_statement(perf_data, count_queries):
+    uuids = perf_data.customer_uuids[:PAGE]
+    with _uow(perf_data) as uow:
+        with count_queries() as counter:
+            uow.customer_repository.balances_per_currency(uuids)
+    assert counter.count == 1, counter.statements
+
+    per_customer = counter.elapsed / len(uuids)
+    print(f"\ncustomer balances: {len(uuids)} customers in {counter.elapsed * 1000:.1f} ms "
+          f"= {per_customer * 1e6:.1f} us/customer")
+    assert per_customer <= PER_CUSTOMER_SECONDS * LATENCY_FACTOR
+
+
+def test_primed_rows_never_walk_the_graph(perf_data, count_queries):
+    from app.dto.customer import CustomerRead
+
+    with _uow(perf_data) as uow:
+        customers = uow.customer_repository.find_all(limit=50)
+        uow.customer_repository.prime_balances(customers)
+        started = time.perf_counter()
+        with count_queries() as counter:
+            for customer in customers:
+                CustomerRead.from_orm(customer)
+    assert counter.count == 0, counter.statements
+    assert time.perf_counter() - started < 1.0 * LATENCY_FACTOR
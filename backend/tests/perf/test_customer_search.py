@@ -0,0 +1,129 @@
+"""Customer search on a synthetic 100k-customer tenant: trigram index vs ILIKE.
+
+The customer list filters with `ILIKE '%…%'`, which a B-tree cannot answer, so
+every search was a sequential scan of the tenant. This suite adds SEARCH_SIZE
+customers (100k by default) to the seeded tenant in a transaction it never
+commits, then measures:
+
+  * BEFORE: today's list filters with index scans switched off, which is
+    what every deployment ran before the ix_customer_*_trgm migration;
+  * AFTER: CustomerRepository.search — one `q`, ranked, keyset-paged, read
+    off the trigram indexes.
+
+Both timings are printed so a run with `-s` doubles as the benchmark. The
+assertions pin what must not regress: the trigram index is in the plan, the
+misspelt target is still the top hit, a page costs one statement however
+deep it is, and a page stays under SEARCH_SECONDS.
+"""
+import os
+import random
+import time
+import uuid
+
+from sqlalchemy import insert, or_, text
+
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+SEARCH_SIZE = int(os.environ.get("PERF_SEARCH_CUSTOMERS", "100000"))
+SEARCH_SECONDS = 0.05
+_SYLLABLES = ["ka", "ra", "mo", "bel", "dan", "sha", "lo", "mi", "tar", "zen", "qu", "ho", "fi"]
+
+
+def _name(rng):
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(3, 5))).title()
+
+
+def _seed_customers(uow, account_uuid):
+    from models.common import Customer
+
+    rng = random.Random(38)
+    rows = [
+        {"uuid": str(uuid.uuid4()), "account_uuid": account_uuid,
+         "company_name": f"{_name(rng)} {rng.choice(['Roastery', 'Market', 'Cafe'])}",
+         "full_name": f"{_name(rng)} {_name(rng)}",
+         "phone_number": f"+9639{rng.randint(0, 99_999_999):08d}",
+         "email_address": f"{_name(rng).lower()}{i}@example.com",
+         "full_address": "Perf Street", "category": "minimarket", "is_deleted": False}
+        for i in range(SEARCH_SIZE)
+    ]
+    # a name no generated row can contain, so there is exactly one right answer
+    target = rows[SEARCH_SIZE // 2]
+    target["company_name"] = "Xylophonia Trading"
+    for start in range(0, len(rows), 10_000):
+        uow.session.execute(insert(Customer), rows[start:start + 10_000])
+    uow.session.execute(text("ANALYZE customer"))
+    return target["uuid"]
+
+
+def _timed(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def test_trigram_search_against_ilike_filters(perf_data, count_queries):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from models.common import Customer
+
+    live = [Customer.is_deleted == False]
+
+    # never committed: the UoW rolls back on exit
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        target_uuid = _seed_customers(uow, perf_data.account_uuid)
+        repo = uow.customer_repository
+
+        # BEFORE: the list route's filters, as a sequential scan
+        uow.session.execute(text("SET LOCAL enable_bitmapscan = off"))
+        uow.session.execute(text("SET LOCAL enable_indexscan = off"))
+        needle = "xylophon"
+        scanned, before = _timed(lambda: repo.find_all_by_filters_paginated(
+            filters=[*live, or_(Customer.company_name.ilike(f"%{needle}%"),
+                                Customer.full_name.ilike(f"%{needle}%"))],
+            page=1, per_page=20,
+        ).items)
+        uow.session.execute(text("RESET enable_bitmapscan"))
+        uow.session.execute(text("RESET enable_indexscan"))
+
+        # AFTER: one misspelt q, ranked, off the trigram indexes
+        q = "Xylofonia Trading"
+        page, after = _timed(lambda: repo.search(q=q, filters=live, per_page=20))
+        plan = "\n".join(r[0] for r in uow.session.execute(
+            text("EXPLAIN SELECT uuid FROM customer WHERE company_name ILIKE :p"),
+            {"p": f"%{needle}%"},
+        ))
+
+        with count_queries() as counter:
+            second = repo.search(q="market", filters=live, per_page=20)
+            repo.search(q="market", filters=live, per_page=20, cursor=second.next_cursor)
+
+    print(f"\ncustomer search over {SEARCH_SIZE} customers: ilike seq scan "
+          f"{before * 1000:.1f} ms, trigram search {after * 1000:.1f} ms")
+    assert [c.uuid for c in scanned] == [target_uuid]
+    assert page.items and page.items[0].uuid == target_uuid
+    assert "ix_customer_company_name_trgm" in plan, plan
+    assert second.next_cursor is not None
+    assert counter.count == 2, counter.statements
+    assert after <= SEARCH_SECONDS * LATENCY_FACTOR
+
+
+def test_search_pages_do_not_overlap(perf_data):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from models.common import Customer
+
+    seen = []
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        cursor = None
+        for _ in range(5):
+            page = uow.customer_repository.search(
+                q="Customer 1", filters=[Customer.is_deleted == False],
+                per_page=7, cursor=cursor,
+            )
+            seen.extend(c.uuid for c in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+    assert seen and len(seen) == len(set(seen))
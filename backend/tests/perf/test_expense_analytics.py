@@ -0,0 +1,63 @@
+"""GET /expense/analytics/over-time is one rollup statement.
+
+The chart used to scan the filtered expenses three times: totals per currency,
+the period x category breakdown, then paid and count. Each subqueried payouts
+per row, and every currency or bucket flip paid for all of it again. It is now
+one GROUPING SETS pass (ExpenseRepository.rollup). Pinned against the seeded
+tenant:
+
+  * PARITY: the rollup agrees with the straightforward per-figure queries.
+  * COST: the endpoint makes a fixed, small number of statements whatever
+    the currency or bucket.
+"""
+import pytest
+
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+MAX_STATEMENTS = 6
+
+
+def test_rollup_matches_the_separate_queries(perf_data):
+    from sqlalchemy import func
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from models.common import Expense
+
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        live = [Expense.account_uuid == uow.account_uuid, Expense.is_deleted == False]
+        rows = uow.expense_repository.rollup(filters=[Expense.is_deleted == False], bucket="month")
+
+        expected = dict(
+            uow.session.query(Expense.currency, func.sum(Expense.amount))
+            .filter(*live).group_by(Expense.currency).all()
+        )
+        period = func.date_trunc("month", Expense.created_at)
+        segments = {
+            (cur, p, cat): total for cur, p, cat, total in
+            uow.session.query(Expense.currency, period, Expense.category, func.sum(Expense.amount))
+            .filter(*live).group_by(Expense.currency, period, Expense.category).all()
+        }
+        paid = {
+            cur: (float(p), n) for cur, p, n in
+            uow.session.query(
+                Expense.currency, func.coalesce(func.sum(Expense.amount_paid), 0), func.count(Expense.uuid)
+            ).filter(*live).group_by(Expense.currency).all()
+        }
+
+    totals = {r.currency: r for r in rows if r.currency_row}
+    assert {c: r.total for c, r in totals.items()} == pytest.approx(expected)
+    assert {(r.currency, r.period, r.category): r.total for r in rows if not r.currency_row} \
+        == pytest.approx(segments)
+    for cur, (amount_paid, count) in paid.items():
+        assert totals[cur].paid == pytest.approx(amount_paid)
+        assert totals[cur].count == count
+
+
+@pytest.mark.parametrize("query", ["", "?currency=SYP", "?currency=USD&bucket=week", "?bucket=day"])
+def test_over_time_is_a_fixed_number_of_statements(client, auth_headers, count_queries, query):
+    with count_queries() as counter:
+        response = client.get(f"/expense/analytics/over-time{query}", headers=auth_headers)
+    assert response.status_code == 200, response.get_json()
+    body = response.get_json()
+    assert body["buckets"] and body["count"] > 0
+    assert counter.count <= MAX_STATEMENTS, counter.statements
+    assert counter.elapsed <= 1.0 * LATENCY_FACTOR
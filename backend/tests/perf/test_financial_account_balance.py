@@ -0,0 +1,63 @@
+"""Snapshot-backed financial account balances (FinancialAccountRepository.balances).
+
+Pinned against the seeded tenant, whose cash account carries every payment:
+
+  * PARITY: with no snapshot, with one, and after a movement from before the
+    cutoff is deleted, the ledger gives the walk's figure to the cent.
+  * COST: a balance is ONE statement, however long the history.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.common import MONEY_TOLERANCE
+
+
+def _uow(perf_data):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    return SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid)
+
+
+def _assert_parity(uow):
+    accounts = uow.financial_account_repository.find_all()
+    ledger = uow.financial_account_repository.balances([a.uuid for a in accounts])
+    for account in accounts:
+        assert ledger[account.uuid] == pytest.approx(account._calculate_balance(), abs=MONEY_TOLERANCE)
+
+
+def test_ledger_matches_the_walk_with_and_without_snapshots(perf_data):
+    from app.domains.financial_account.domain import FinancialAccountDomain
+
+    # never committed: the UoW rolls back on exit, leaving the seed as it was
+    with _uow(perf_data) as uow:
+        _assert_parity(uow)
+        # half the seeded history lies behind this cutoff
+        assert FinancialAccountDomain.take_snapshots(uow, now=datetime.utcnow() - timedelta(days=180)) > 0
+        _assert_parity(uow)
+        assert FinancialAccountDomain.balance_mismatches(uow) == []
+
+
+def test_deleting_an_old_payment_drops_the_snapshots_it_is_baked_into(perf_data):
+    from app.domains.financial_account.domain import FinancialAccountDomain
+    from models.common import FinancialAccountSnapshot, Payment
+
+    with _uow(perf_data) as uow:
+        FinancialAccountDomain.take_snapshots(uow)
+        payment = uow.payment_repository._find_first_by_filters(
+            filters=[Payment.is_deleted.is_(False)], ordering=[Payment.created_at],
+        )
+        payment.is_deleted = True
+        uow.session.flush()
+        assert uow.session.query(FinancialAccountSnapshot).filter(
+            FinancialAccountSnapshot.financial_account_uuid == payment.financial_account_uuid,
+            FinancialAccountSnapshot.cutoff > payment.created_at,
+        ).count() == 0
+        _assert_parity(uow)
+
+
+def test_a_balance_is_one_statement(perf_data, count_queries):
+    with _uow(perf_data) as uow:
+        accounts = uow.financial_account_repository.find_all()
+        with count_queries() as counter:
+            uow.financial_account_repository.prime_balances(accounts)
+    assert counter.count == 1, counter.statements
@@ -0,0 +1,90 @@
+"""Fulfilling a basket costs the same statements at any size.
+
+fulfill_items used to look each item up on its own and run a FIFO query per
+item. It then created each warehouse event through the sales handler, which
+re-read the lot and the item, and each vehicle sale through
+record_trip_sale, which read the van's stock row and the material. Now the
+items load in one SELECT and the lots of every material in one more. The
+events go in as batched INSERTs. This suite fulfils a SMALL and a LARGE
+basket on a seeded trip stop and requires:
+
+  * the same statement count for both;
+  * warehouse events that sum to each item's quantity;
+  * one vehicle sale per item, attributed to the stop.
+
+Timings are printed so `-s` doubles as the benchmark.
+"""
+import pytest
+
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+SMALL, LARGE = 2, 24
+MAX_STATEMENTS = 12
+
+
+def _basket(uow, customer_uuid, trip_stop_uuid, material_uuids, size):
+    from models.common import CustomerOrder, CustomerOrderItem
+
+    order = CustomerOrder(account_uuid=uow.account_uuid, customer_uuid=customer_uuid,
+                          trip_stop_uuid=trip_stop_uuid)
+    uow.session.add(order)
+    uow.session.flush()
+    items = [
+        CustomerOrderItem(account_uuid=uow.account_uuid, customer_order_uuid=order.uuid,
+                          material_uuid=material_uuids[i % len(material_uuids)],
+                          quantity=i % 7 + 1, unit="kg", is_fulfilled=False)
+        for i in range(size)
+    ]
+    uow.session.add_all(items)
+    uow.session.flush()
+    return items
+
+
+def test_fulfillment_is_flat_with_basket_size(perf_data, count_queries):
+    from sqlalchemy import func
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from app.domains.customer_order_item.domain import CustomerOrderItemDomain
+    from app.domains.vehicle_inventory.domain import VehicleInventoryDomain
+    from app.dto.customer_order_item import CustomerOrderItemBulkFulfill, FulfillItem
+    from models.common import Inventory, InventoryEvent, TripStop, VehicleInventoryEvent
+
+    # never committed: the UoW rolls back on exit
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        stop = uow.session.query(TripStop).filter(TripStop.account_uuid == perf_data.account_uuid).first()
+        material_uuids = [m for (m,) in uow.session.query(Inventory.material_uuid).filter(
+            Inventory.account_uuid == perf_data.account_uuid).distinct()]
+        # a first sale of a material creates the van's stock row, an INSERT the
+        # other basket might not need; start both with every row in place
+        for material_uuid in material_uuids:
+            VehicleInventoryDomain.get_or_create_inventory(
+                uow=uow, vehicle_uuid=stop.trip.vehicle_uuid, material_uuid=material_uuid,
+            )
+        results = {}
+        for size in (SMALL, LARGE):
+            items = _basket(uow, perf_data.customer_uuids[0], stop.uuid, material_uuids, size)
+            uow.session.expire_all()
+            payload = CustomerOrderItemBulkFulfill(
+                items=[FulfillItem(customer_order_item_uuid=i.uuid) for i in items],
+            )
+            with count_queries() as counter:
+                CustomerOrderItemDomain.fulfill_items(uow=uow, payload=payload)
+            results[size] = counter
+            print(f"\nfulfil {size} items: {counter.count} statements, "
+                  f"{counter.elapsed * 1000:.1f} ms")
+
+            uuids = [i.uuid for i in items]
+            drawn = dict(
+                uow.session.query(InventoryEvent.customer_order_item_uuid, func.sum(InventoryEvent.quantity))
+                .filter(InventoryEvent.customer_order_item_uuid.in_(uuids)).group_by(InventoryEvent.customer_order_item_uuid)
+            )
+            assert drawn == pytest.approx({i.uuid: -float(i.quantity) for i in items})
+            sales = uow.session.query(VehicleInventoryEvent).filter(
+                VehicleInventoryEvent.customer_order_item_uuid.in_(uuids)).all()
+            assert len(sales) == size
+            assert {s.trip_stop_uuid for s in sales} == {stop.uuid}
+            assert all(i.is_fulfilled for i in items)
+
+    small, large = results[SMALL], results[LARGE]
+    assert large.count == small.count, (small.statements, large.statements)
+    assert large.count <= MAX_STATEMENTS, large.statements
+    assert large.elapsed <= 0.5 * LATENCY_FACTOR
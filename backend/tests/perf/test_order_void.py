@@ -0,0 +1,94 @@
+"""Voiding orders is a fixed set of UPDATEs, however many orders.
+
+delete_customer_order used to walk each order's items, invoices, payments
+and invoice items, saving every row. Then it loaded the warehouse and
+vehicle events of the items to flip them one by one. Voiding a mistaken
+trip loaded and dirty-tracked all of it. The cascade is now
+CustomerOrderRepository.void: one UPDATE per table, keyed on the uuids the
+previous one returned. This suite voids the orders of a SMALL and a LARGE
+seeded trip and requires:
+
+  * the same statement count for both, bar one snapshot DELETE per account
+    paid into;
+  * no row of those orders left live in any of the cascaded tables;
+  * no row loaded into the session.
+
+Timings are printed so `-s` doubles as the benchmark.
+"""
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+
+def _trips_by_order_count(uow, trip_uuids):
+    from sqlalchemy import func
+    from models.common import CustomerOrder, TripStop
+
+    counts = dict(
+        uow.session.query(TripStop.trip_uuid, func.count(CustomerOrder.uuid))
+        .join(CustomerOrder, CustomerOrder.trip_stop_uuid == TripStop.uuid)
+        .filter(TripStop.trip_uuid.in_(trip_uuids), CustomerOrder.is_deleted.isnot(True))
+        .group_by(TripStop.trip_uuid)
+    )
+    return sorted(counts, key=counts.get), counts
+
+
+def _live_rows(uow, order_uuids):
+    from models.common import (
+        CustomerOrder, CustomerOrderItem, InventoryEvent, Invoice, InvoiceItem, Payment,
+        VehicleInventoryEvent,
+    )
+
+    items = uow.session.query(CustomerOrderItem.uuid).filter(CustomerOrderItem.customer_order_uuid.in_(order_uuids))
+    invoices = uow.session.query(Invoice.uuid).filter(Invoice.customer_order_uuid.in_(order_uuids))
+    checks = {
+        "customer_order": (CustomerOrder, CustomerOrder.uuid.in_(order_uuids)),
+        "customer_order_item": (CustomerOrderItem, CustomerOrderItem.customer_order_uuid.in_(order_uuids)),
+        "invoice": (Invoice, Invoice.customer_order_uuid.in_(order_uuids)),
+        "invoice_item": (InvoiceItem, InvoiceItem.invoice_uuid.in_(invoices)),
+        "payment": (Payment, Payment.invoice_uuid.in_(invoices)),
+        "inventory_event": (InventoryEvent, InventoryEvent.customer_order_item_uuid.in_(items)),
+        "vehicle_inventory_event": (
+            VehicleInventoryEvent, VehicleInventoryEvent.customer_order_item_uuid.in_(items),
+        ),
+    }
+    return {
+        name: uow.session.query(model).filter(where, model.is_deleted.isnot(True)).count()
+        for name, (model, where) in checks.items()
+    }
+
+
+def test_void_cost_is_flat_with_order_count(perf_data, count_queries):
+    from sqlalchemy import event
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from app.domains.customer_order.domain import CustomerOrderDomain
+    from app.dto.customer_order import CustomerOrderBulkVoid
+
+    # never committed: the UoW rolls back on exit
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        ordered, counts = _trips_by_order_count(uow, perf_data.trip_uuids)
+        small_trip, large_trip = ordered[0], ordered[-1]
+        assert counts[large_trip] > counts[small_trip]
+        loaded = []
+        event.listen(uow.session, "loaded_as_persistent", lambda _s, obj: loaded.append(obj))
+
+        results = {}
+        for trip_uuid in (small_trip, large_trip):
+            uow.session.expunge_all()
+            loaded.clear()
+            with count_queries() as counter:
+                voided = CustomerOrderDomain.void_customer_orders(
+                    uow=uow, payload=CustomerOrderBulkVoid(trip_uuid=trip_uuid),
+                )
+            results[trip_uuid] = counter
+            print(f"\nvoid {len(voided.uuids)} orders: {counter.count} statements, "
+                  f"{counter.elapsed * 1000:.1f} ms")
+            assert len(voided.uuids) == counts[trip_uuid]
+            assert loaded == []
+            assert set(_live_rows(uow, voided.uuids).values()) == {0}
+
+    def updates_and_reads(counter):
+        # snapshot drops are one DELETE per financial account paid into
+        return sum(not s.lstrip().upper().startswith("DELETE") for s in counter.statements)
+
+    small, large = results[small_trip], results[large_trip]
+    assert updates_and_reads(large) == updates_and_reads(small), (small.statements, large.statements)
+    assert large.elapsed <= 0.5 * LATENCY_FACTOR
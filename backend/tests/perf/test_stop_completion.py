@@ -0,0 +1,72 @@
+"""Where completing a trip stop spends its time.
+
+complete_task_execution used to build a fresh OperatorEntryPoint and operator
+per call, and TripStopOperator read the task execution the domain had already
+loaded a second time. Operators now come from the per-process
+OperatorRegistry with the loaded execution passed in, and every call is timed
+and its statements counted in REGISTRY.metrics. This benchmark completes
+routed stops on a seeded trip and requires:
+
+  * the task execution is read once per completion, by the domain;
+  * the operator's share is recorded in the metrics, and is no more than the
+    whole completion.
+
+The split between the operator and the rest of the completion is printed so
+`-s` shows where stop-completion time goes.
+"""
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+STOPS = 5
+
+
+def test_stop_completion_breakdown(perf_data, count_queries):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from app.domains.task_execution.domain import TaskExecutionDomain
+    from app.domains.task_execution.workflow_operators.create_trip_operator import (
+        create_trip_stops_with_tasks,
+    )
+    from app.domains.task_execution.workflow_operators.operator_entry_point import REGISTRY
+    from app.dto.task_execution import OperatorType, TaskExecutionComplete
+
+    operator = OperatorType.TRIP_STOP_OPERATOR.value
+    # never committed: the UoW rolls back on exit
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        workflow_execution = uow.workflow_execution_repository.find_one(
+            uuid=perf_data.workflow_execution_uuids[0],
+        )
+        customers = uow.customer_repository.find_live_by_uuids(perf_data.customer_uuids[:STOPS])
+        created = create_trip_stops_with_tasks(
+            uow=uow,
+            workflow_execution=workflow_execution,
+            customers=[customers[c] for c in perf_data.customer_uuids[:STOPS]],
+            created_by_uuid=None,
+            depends_on=["trip"],
+            parent_task_execution_uuid=None,
+        )
+        created[0][1].status = "in_progress"
+        uow.session.flush()
+
+        REGISTRY.metrics.reset()
+        totals = []
+        for _, execution in created:
+            uow.session.expire_all()
+            with count_queries() as counter:
+                TaskExecutionDomain.complete_task_execution(uow=uow, payload=TaskExecutionComplete(
+                    uuid=execution.uuid, result={"outcome": "sale", "notes": "perf"},
+                ))
+            totals.append(counter)
+            # find_one(uuid=...) binds uuid_1; relationship loads bind pk_1
+            reads = [s for s in counter.statements
+                     if "FROM task_execution" in s and "task_execution.uuid = %(uuid_1)s" in s]
+            assert len(reads) == 1, reads
+
+        stats = REGISTRY.metrics.snapshot()[operator]
+        statements = sum(c.count for c in totals)
+        elapsed = sum(c.elapsed for c in totals)
+        print(f"\ncomplete {STOPS} stops: {statements / STOPS:.1f} statements, "
+              f"{elapsed / STOPS * 1000:.1f} ms each; operator {stats['statements_mean']:.1f} statements, "
+              f"{stats['seconds_mean'] * 1000:.1f} ms each")
+        assert stats["calls"] == STOPS and stats["errors"] == 0
+        assert stats["statements_total"] <= statements
+        assert stats["seconds_total"] <= elapsed
+        assert elapsed / STOPS <= 0.2 * LATENCY_FACTOR
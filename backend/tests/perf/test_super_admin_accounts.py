@@ -0,0 +1,30 @@
+"""The super-admin account list costs two summary statements per page.
+
+User counts and ledger balances used to be one COUNT and one SUM per account
+on the page; they are now one grouped query each for the whole page.
+"""
+from datetime import datetime
+
+
+def test_account_summaries_are_two_statements_per_page(perf_data, count_queries):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from app.entrypoint.routes.super_admin.routes import _account_reads
+    from models.common import Account
+
+    # never committed: the UoW rolls back on exit
+    with SqlAlchemyUnitOfWork(account_uuid=None) as uow:
+        for i in range(20):
+            uow.session.add(Account(company_name=f"Tenant {i}", created_at=datetime.utcnow(),
+                                    is_deleted=False, is_blocked=False, is_verified=False))
+        uow.session.flush()
+        accounts = uow.account_repository._find_all_by_filters(filters=[Account.is_deleted.is_(False)])
+        with count_queries() as counter:
+            reads = _account_reads(uow, accounts)
+
+    assert len(reads) == len(accounts) > 20
+    assert counter.count == 2, counter.statements
+    by_name = {r["company_name"]: r for r in reads}
+    assert by_name["Perf Co"]["user_count"] >= 1
+    # a tenant with no users and nothing billed yet
+    assert by_name["Tenant 0"]["user_count"] == 0
+    assert by_name["Tenant 0"]["balances"] == {}
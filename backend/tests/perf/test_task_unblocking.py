@@ -0,0 +1,103 @@
+"""Completing a task costs the same however big its workflow is.
+
+Unblocking used to map every execution in the workflow by name, rescan all of
+them, then load every COMPLETED one to decide whether the workflow was done.
+Over a trip with hundreds of stops that was quadratic. It now reads the
+finished task's direct dependants, the names they wait on, and one "anything
+left?" probe. This suite builds a linear chain of SMALL and LARGE executions.
+It completes a step in the middle of each and requires:
+
+  * the same statement count for both;
+  * the same number of task executions loaded, which is the one dependant;
+  * the next step, and only that step, is unblocked.
+
+Timings are printed so `-s` doubles as the benchmark.
+"""
+from datetime import datetime
+
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+SMALL, LARGE = 20, 800
+
+
+def _chain(uow, workflow_execution, size):
+    from models.common import Task, TaskExecution
+
+    tasks = [Task(name=f"step_{workflow_execution.uuid}_{i}", operator="noop_operator",
+                  depends_on=[f"step_{workflow_execution.uuid}_{i - 1}"] if i else [])
+             for i in range(size)]
+    uow.session.add_all(tasks)
+    uow.session.flush()
+    executions = [
+        TaskExecution(
+            account_uuid=workflow_execution.account_uuid,
+            workflow_execution_uuid=workflow_execution.uuid,
+            task_uuid=task.uuid,
+            depends_on=task.depends_on,
+            # the first half is done, the step after it is current
+            status=("completed" if i < size // 2
+                    else "in_progress" if i == size // 2 else "not_started"),
+            result={},
+        )
+        for i, task in enumerate(tasks)
+    ]
+    uow.session.add_all(executions)
+    uow.session.flush()
+    return executions
+
+
+def _complete(uow, count_queries, execution):
+    from sqlalchemy import event
+    from app.domains.task_execution.domain import TaskExecutionDomain
+    from models.common import TaskExecution
+
+    uow.session.expire_all()
+    execution.status = "completed"
+    execution.end_time = datetime.now()
+    loaded = []
+
+    def on_load(_session, instance):
+        if isinstance(instance, TaskExecution):
+            loaded.append(instance)
+
+    event.listen(uow.session, "loaded_as_persistent", on_load)
+    try:
+        with count_queries() as counter:
+            TaskExecutionDomain.unblock_dependent_task_executions(uow=uow, task_execution=execution)
+            done = uow.task_execution_repository.all_in_status(
+                workflow_execution_uuid=execution.workflow_execution_uuid, status="completed",
+            )
+    finally:
+        event.remove(uow.session, "loaded_as_persistent", on_load)
+    return counter, loaded, done
+
+
+def test_completion_cost_is_flat_with_workflow_size(perf_data, count_queries):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from models.common import WorkflowExecution
+
+    # never committed: the UoW rolls back on exit
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        template = uow.workflow_execution_repository.find_one(uuid=perf_data.workflow_execution_uuids[0])
+        results = {}
+        for size in (SMALL, LARGE):
+            workflow_execution = WorkflowExecution(
+                account_uuid=perf_data.account_uuid, workflow_uuid=template.workflow_uuid,
+                status="in_progress", parameters={}, result={},
+            )
+            uow.session.add(workflow_execution)
+            uow.session.flush()
+            chain = _chain(uow, workflow_execution, size)
+            current, following = chain[size // 2], chain[size // 2 + 1]
+            counter, loaded, done = _complete(uow, count_queries, current)
+            results[size] = counter
+            assert following.status == "in_progress"
+            assert [e.status for e in chain[size // 2 + 2:]] == ["not_started"] * (size - size // 2 - 2)
+            assert {e.uuid for e in loaded} <= {following.uuid, current.uuid}
+            assert not done
+            print(f"\ncomplete step {size // 2} of {size}: {counter.count} statements, "
+                  f"{counter.elapsed * 1000:.1f} ms")
+
+    small, large = results[SMALL], results[LARGE]
+    assert large.count == small.count, (small.statements, large.statements)
+    assert large.elapsed <= 0.05 * LATENCY_FACTOR
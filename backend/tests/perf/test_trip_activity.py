@@ -0,0 +1,51 @@
+"""GET /trip/<uuid>/activity costs a fixed number of statements.
+
+The view used to look up a task execution per stop and a material per name,
+then walk each stop's orders, sale events and payments lazily. It now loads in
+one SELECT per relationship level (TripStopRepository.find_for_activity), so a
+trip with four times the stops must cost exactly the same.
+"""
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+MAX_STATEMENTS = 25
+
+
+def test_activity_statements_do_not_grow_with_stops(perf_data, count_queries):
+    from app.adapters.repositories.material_repository import invalidate_materials
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from app.domains.trip.activity import trip_activity
+    from models.common import TripStop
+
+    trip_uuid, others = perf_data.trip_uuids[0], perf_data.trip_uuids[1:4]
+
+    def measure(uow):
+        uow.session.expire_all()
+        # both runs start with the material cache cold, or the second reads none
+        invalidate_materials()
+        uow.session.info.pop("material_refs", None)
+        trip = uow.trip_repository.find_one(uuid=trip_uuid)
+        with count_queries() as counter:
+            result = trip_activity(uow, trip)
+        return counter, result
+
+    # never committed: the UoW rolls back on exit
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        few, small = measure(uow)
+        # hand three more trips' stops — with their orders and payments — to this one
+        uow.session.query(TripStop).filter(TripStop.trip_uuid.in_(others)).update(
+            {TripStop.trip_uuid: trip_uuid}, synchronize_session=False
+        )
+        many, large = measure(uow)
+
+    assert len(large["stops"]) == 4 * len(small["stops"])
+    assert many.count == few.count, (few.statements, many.statements)
+    assert many.count <= MAX_STATEMENTS, many.statements
+
+
+def test_activity_endpoint_ceiling(client, auth_headers, count_queries, perf_data):
+    with count_queries() as counter:
+        response = client.get(f"/trip/{perf_data.trip_uuids[0]}/activity", headers=auth_headers)
+    assert response.status_code == 200, response.get_json()
+    assert len(response.get_json()["stops"]) == 15
+    assert counter.count <= MAX_STATEMENTS + 5, counter.statements
+    assert counter.elapsed <= 1.0 * LATENCY_FACTOR
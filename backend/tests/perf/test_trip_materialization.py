@@ -0,0 +1,95 @@
+"""Materializing a routed trip costs the same few statements at any length.
+
+CreateTripOperator used to build each stop through TripStopDomain, TaskDomain
+and TaskExecutionDomain. Each stop re-read the trip, the customer and the
+workflow, flushed four times, and serialized CustomerRead, which walked the
+customer's whole order/invoice graph. It now loads the customers once, primes
+their balances in one grouped query, and writes one batched INSERT per table
+(create_trip_stops_with_tasks). This suite materializes a SMALL and a LARGE
+chain against the seeded tenant and requires:
+
+  * the same statement count for both;
+  * a correctly linked chain: each stop points at its execution, the first
+    execution waits on the given name, and every later one on the stop before;
+  * balances in the task input that match the per-customer walk.
+
+Timings are printed so `-s` doubles as the benchmark.
+"""
+import pytest
+
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+SMALL, LARGE = 10, 150
+MAX_STATEMENTS = 8
+
+
+def _materialize(uow, count_queries, workflow_execution, customer_uuids):
+    from app.domains.task_execution.workflow_operators.create_trip_operator import (
+        create_trip_stops_with_tasks,
+    )
+
+    uow.session.expire_all()
+    with count_queries() as counter:
+        customers = uow.customer_repository.find_live_by_uuids(customer_uuids)
+        created = create_trip_stops_with_tasks(
+            uow=uow,
+            workflow_execution=workflow_execution,
+            customers=[customers[c] for c in customer_uuids],
+            created_by_uuid=None,
+            depends_on=["trip"],
+            parent_task_execution_uuid=None,
+        )
+    return counter, created
+
+
+def test_trip_materialization_is_flat_with_stop_count(perf_data, count_queries):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from models.common import Customer, TripStop
+
+    # never committed: the UoW rolls back on exit
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        workflow_execution = uow.workflow_execution_repository.find_one(
+            uuid=perf_data.workflow_execution_uuids[0],
+        )
+        assert workflow_execution.trips
+        results = {}
+        for size in (SMALL, LARGE):
+            # repeats are fine: a route can visit a customer twice
+            customer_uuids = (perf_data.customer_uuids * size)[:size]
+            counter, created = _materialize(uow, count_queries, workflow_execution, customer_uuids)
+            results[size] = counter
+            print(f"\nmaterialize {size} stops: {counter.count} statements, "
+                  f"{counter.elapsed * 1000:.1f} ms")
+
+            assert len(created) == size
+            tasks = [task for task, _ in created]
+            executions = [execution for _, execution in created]
+            assert executions[0].depends_on == ["trip"]
+            assert executions[0].status == "not_started"
+            assert [e.depends_on for e in executions[1:]] == [[t.name] for t in tasks[:-1]]
+            assert len({t.name for t in tasks}) == size
+
+            stops = {
+                s.task_execution_uuid: s for s in uow.session.query(TripStop)
+                .filter(TripStop.task_execution_uuid.in_([e.uuid for e in executions]))
+            }
+            for index, (task, execution) in enumerate(created):
+                stop = stops[execution.uuid]
+                assert stop.index == index
+                assert task.task_inputs["data"]["trip_stop_uuid"] == stop.uuid
+                assert task.task_inputs["data"]["customer"]["uuid"] == stop.customer_uuid
+
+        # a lean, versioned snapshot, not a CustomerRead dump
+        snapshot = created[0][0].task_inputs["data"]["customer"]
+        assert snapshot["v"] == 1
+        assert set(snapshot) <= {"v", "uuid", "company_name", "full_name", "phone_number",
+                                 "coordinates", "balance_per_currency"}
+        # the primed balances are the ones the per-customer walk gives
+        customer = uow.session.get(Customer, snapshot["uuid"])
+        customer.__dict__.pop("_primed_balance_per_currency", None)
+        assert snapshot["balance_per_currency"] == pytest.approx(customer.balance_per_currency)
+
+    small, large = results[SMALL], results[LARGE]
+    assert large.count == small.count, (small.statements, large.statements)
+    assert large.count <= MAX_STATEMENTS, large.statements
+    assert large.elapsed <= 1.0 * LATENCY_FACTOR
@@ -0,0 +1,70 @@
+"""The per-user trip stop analytics aggregate in SQL.
+
+/trip-stop/analytics/user-summary and /user-sales-over-time used to load every
+order in the window and read the order-level money hybrids off each one.
+Their money now comes from _money_by_currency, one grouped statement over the
+orders' live invoices. Pinned against the seeded tenant:
+
+  * PARITY: the grouped figures equal the walk over each order's live invoices.
+  * COST: one statement for the whole tenant, bucketed or not. Bucketing only
+    splits the same totals across periods.
+"""
+import pytest
+
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+
+def _orders(uow):
+    from models.common import CustomerOrder
+    return uow.session.query(CustomerOrder).filter(
+        CustomerOrder.account_uuid == uow.account_uuid,
+        CustomerOrder.is_deleted.is_(False),
+    )
+
+
+def _uow(perf_data):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    return SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid)
+
+
+def test_grouped_money_matches_the_invoice_walk(perf_data):
+    from app.entrypoint.routes.trip_stop.routes import _money_by_currency
+
+    with _uow(perf_data) as uow:
+        revenue, paid, unpaid = _money_by_currency(uow, _orders(uow))
+        walked_revenue, walked_paid = {}, {}
+        for order in _orders(uow).all():
+            for invoice in order.invoices:
+                if invoice.is_deleted or not invoice.currency:
+                    continue
+                c = invoice.currency
+                walked_revenue[c] = walked_revenue.get(c, 0.0) + float(invoice.total_adjusted_amount or 0)
+                walked_paid[c] = walked_paid.get(c, 0.0) + float(invoice.net_amount_paid or 0)
+
+    assert walked_revenue, "seed has no invoiced orders"
+    assert set(revenue) == set(walked_revenue)
+    for currency, amount in walked_revenue.items():
+        assert revenue[currency] == pytest.approx(amount, abs=0.01), currency
+        assert paid[currency] == pytest.approx(walked_paid[currency], abs=0.01), currency
+        assert unpaid[currency] == pytest.approx(amount - walked_paid[currency], abs=0.02), currency
+
+
+def test_money_is_one_statement_bucketed_or_not(perf_data, count_queries):
+    from app.entrypoint.routes.trip_stop.routes import _money_by_currency
+
+    with _uow(perf_data) as uow:
+        with count_queries() as flat:
+            revenue, _, _ = _money_by_currency(uow, _orders(uow))
+        with count_queries() as bucketed:
+            per_day = _money_by_currency(uow, _orders(uow), bucket="day")
+
+    assert flat.count == 1, flat.statements
+    assert bucketed.count == 1, bucketed.statements
+    assert flat.elapsed + bucketed.elapsed <= 1.0 * LATENCY_FACTOR
+
+    summed = {}
+    for day_revenue, _, _ in per_day.values():
+        for currency, amount in day_revenue.items():
+            summed[currency] = summed.get(currency, 0.0) + amount
+    for currency, amount in revenue.items():
+        assert summed[currency] == pytest.approx(amount, abs=0.01 * max(len(per_day), 1))
@@ -0,0 +1,163 @@
+"""The set-based trip summary (TripRepository.summary_figures).
+
+Pinned against the seeded trips. The seed is first given what a real week
+leaves behind: sale events at the stops and payouts on the trip expenses.
+It also gets the rows the walk has to skip: a deleted payment, an order
+soft-deleted before the void cascade existed (its payments and sale events
+still live), a deleted item, a reversed payout and a payout whose is_deleted
+is NULL.
+
+  * PARITY: the grouped queries give each trip the same collected cash,
+    expenses (booked, paid, unpaid) and sold stock as the model's walk, and
+    TripDomain.summarize gives the same summary either way.
+  * COST: summarizing every seeded trip takes the same statements as a handful
+    of them, within MAX_STATEMENTS.
+
+Timings are printed so `-s` doubles as the benchmark.
+"""
+import pytest
+
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+FEW = 6
+MAX_STATEMENTS = 8
+
+
+def _dress(uow, perf_data):
+    """Add the week's sales, payouts and snapshots, and the leftovers of
+    legacy voids, to the seeded trips. Flushed, never committed."""
+    from models.common import (
+        CustomerOrder, CustomerOrderItem, Expense, FinancialAccount, Payment, Payout,
+        Trip, TripStop, VehicleInventory, VehicleInventoryEvent,
+    )
+
+    account_uuid = perf_data.account_uuid
+    trips = {t.uuid: t for t in uow.session.query(Trip).filter(Trip.uuid.in_(perf_data.trip_uuids))}
+    stock = {
+        (vi.vehicle_uuid, vi.material_uuid): vi.uuid
+        for vi in uow.session.query(VehicleInventory).filter(VehicleInventory.account_uuid == account_uuid)
+    }
+    rows = (
+        uow.session.query(CustomerOrderItem, CustomerOrder.trip_stop_uuid, TripStop.trip_uuid)
+        .join(CustomerOrder, CustomerOrder.uuid == CustomerOrderItem.customer_order_uuid)
+        .join(TripStop, TripStop.uuid == CustomerOrder.trip_stop_uuid)
+        .filter(TripStop.trip_uuid.in_(perf_data.trip_uuids))
+        .all()
+    )
+    for item, stop_uuid, trip_uuid in rows:
+        uow.session.add(VehicleInventoryEvent(
+            account_uuid=account_uuid,
+            vehicle_inventory_uuid=stock[(trips[trip_uuid].vehicle_uuid, item.material_uuid)],
+            material_uuid=item.material_uuid, event_type="sale", quantity=-float(item.quantity),
+            customer_order_item_uuid=item.uuid, trip_stop_uuid=stop_uuid, is_deleted=False,
+        ))
+    for trip in trips.values():
+        sold = {}
+        for item, _stop, trip_uuid in rows:
+            if trip_uuid == trip.uuid:
+                sold[item.material_uuid] = sold.get(item.material_uuid, 0) + item.quantity
+        trip.start_inventory = {m: q + 5 for m, q in sold.items()}
+        # one trip never counted its stock back in
+        trip.end_inventory = {m: 5 for m in sold} if trip.uuid != perf_data.trip_uuids[1] else None
+
+    # what the walk must skip
+    orders = [item.customer_order_uuid for item, _stop, _trip in rows]
+    uow.session.get(CustomerOrder, orders[0]).is_deleted = True
+    rows[-1][0].is_deleted = True
+    stop_payment = uow.session.query(Payment).filter(
+        Payment.trip_stop_uuid.in_([stop for _item, stop, _trip in rows]),
+        Payment.invoice_uuid.isnot(None),
+    ).first()
+    stop_payment.is_deleted = True
+
+    cash = uow.session.query(FinancialAccount).filter(FinancialAccount.account_uuid == account_uuid).first()
+    expenses = uow.session.query(Expense).filter(Expense.trip_uuid.in_(perf_data.trip_uuids)).all()
+    for i, expense in enumerate(expenses):
+        # paid in full, in part, reversed, with a NULL is_deleted, or not at all
+        share, deleted = [(1.0, False), (0.5, False), (1.0, True), (0.25, None), (0, False)][i % 5]
+        if share:
+            uow.session.add(Payout(
+                account_uuid=account_uuid, expense_uuid=expense.uuid, amount=round(expense.amount * share, 2),
+                currency=expense.currency, financial_account_uuid=cash.uuid, is_deleted=deleted,
+            ))
+    uow.session.flush()
+    uow.session.expire_all()
+
+
+def _figures(trip):
+    return {
+        "collected": trip.expected_cash,
+        "expenses": trip.trip_expenses,
+        "expenses_paid": trip.trip_expenses_paid,
+        "expenses_unpaid": trip.trip_expenses_unpaid,
+        "sold": trip.sold_inventory_map,
+    }
+
+
+def _same(walked, grouped):
+    for key, values in walked.items():
+        assert set(grouped[key]) == set(values), key
+        for name, amount in values.items():
+            assert grouped[key][name] == pytest.approx(amount, abs=1e-6), (key, name)
+
+
+def test_grouped_figures_match_the_model_walk(perf_data):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from models.common import Trip
+
+    # never committed: the UoW rolls back on exit
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        _dress(uow, perf_data)
+        trips = uow.session.query(Trip).filter(Trip.uuid.in_(perf_data.trip_uuids)).all()
+        walked = {trip.uuid: _figures(trip) for trip in trips}
+        assert any(w["sold"] for w in walked.values()) and any(w["expenses_unpaid"] for w in walked.values())
+
+        grouped = uow.trip_repository.summary_figures([t.uuid for t in trips])
+        for trip in trips:
+            _same(walked[trip.uuid], grouped[trip.uuid])
+
+        uow.trip_repository.prime_summaries(trips)
+        for trip in trips:
+            _same(walked[trip.uuid], _figures(trip))
+
+
+def test_summary_is_the_same_primed_or_walked(perf_data):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from app.domains.trip.domain import TripDomain
+
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        _dress(uow, perf_data)
+        primed = TripDomain.summarize(uow=uow, trip_uuids=perf_data.trip_uuids).model_dump()
+        # the same trips again, this time walked
+        for obj in list(uow.session.identity_map.values()):
+            obj.__dict__.pop("_primed_summary", None)
+        uow.trip_repository.prime_summaries = lambda trips: None
+        walked = TripDomain.summarize(uow=uow, trip_uuids=perf_data.trip_uuids).model_dump()
+
+    for key in ("trip_count", "trip_uuids", "missing_uuids", "trips_without_end_inventory"):
+        assert primed[key] == walked[key], key
+    for field in ("cash", "materials"):
+        assert len(primed[field]) == len(walked[field]), field
+        for got, want in zip(primed[field], walked[field]):
+            assert got == pytest.approx(want), (field, want)
+
+
+def test_summary_statements_do_not_grow_with_trips(perf_data, count_queries):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from app.domains.trip.domain import TripDomain
+
+    results = {}
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        _dress(uow, perf_data)
+        for trip_uuids in (perf_data.trip_uuids[:FEW], perf_data.trip_uuids):
+            uow.session.expunge_all()
+            with count_queries() as counter:
+                TripDomain.summarize(uow=uow, trip_uuids=trip_uuids)
+            results[len(trip_uuids)] = counter
+            print(f"\nsummarize {len(trip_uuids)} trips: {counter.count} statements, "
+                  f"{counter.elapsed * 1000:.1f} ms")
+
+    few, many = results[FEW], results[len(perf_data.trip_uuids)]
+    assert many.count == few.count, (few.statements, many.statements)
+    assert many.count <= MAX_STATEMENTS, many.statements
+    assert many.elapsed <= 0.5 * LATENCY_FACTOR
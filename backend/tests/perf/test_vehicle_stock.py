@@ -0,0 +1,82 @@
+"""Vehicle stock is read without loading event history.
+
+VehicleInventory.current_quantity used to sum `self.events` in Python, so the
+stock list and the trip start/finish snapshot loaded every event each truck
+had ever recorded. The list now primes a page in one grouped sum
+(VehicleInventoryRepository.prime_quantities), and the snapshot selects the
+quantity as a column. Pinned against the seeded tenant:
+
+  * PARITY: both give the same figure as the walk over the events.
+  * COST: the statement count stays the same when every row's history grows
+    tenfold.
+"""
+import pytest
+
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+MAX_LIST_STATEMENTS = 6
+
+
+def _uow(perf_data):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    return SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid)
+
+
+def test_grouped_quantities_match_the_event_walk(perf_data):
+    from app.domains.vehicle_inventory.domain import VehicleInventoryDomain
+
+    vehicle_uuid = perf_data.vehicle_uuids[0]
+    with _uow(perf_data) as uow:
+        rows = uow.vehicle_inventory_repository.find_all(vehicle_uuid=vehicle_uuid, is_deleted=False)
+        walked = {r.material_uuid: r.current_quantity for r in rows}
+        grouped = uow.vehicle_inventory_repository.current_quantities([r.uuid for r in rows])
+        snapshot = VehicleInventoryDomain.balances_for_vehicle(uow=uow, vehicle_uuid=vehicle_uuid)
+
+    assert walked
+    assert snapshot == pytest.approx(walked)
+    assert {r.material_uuid: grouped[r.uuid] for r in rows} == pytest.approx(walked)
+
+
+def test_stock_list_does_not_grow_with_event_history(perf_data, count_queries):
+    from app.dto.vehicle_inventory import VehicleInventoryRead
+    from models.common import VehicleInventory, VehicleInventoryEvent
+
+    def measure(uow):
+        uow.session.expire_all()
+        with count_queries() as counter:
+            rows = uow.vehicle_inventory_repository.find_all(is_deleted=False)
+            uow.vehicle_inventory_repository.prime_quantities(rows)
+            dumped = [VehicleInventoryRead.from_orm(r).model_dump(mode="json") for r in rows]
+        return counter, dumped
+
+    # never committed: the UoW rolls back on exit
+    with _uow(perf_data) as uow:
+        few, before = measure(uow)
+        # ten more events per row — nine live ones netting -1, and a deleted
+        # one that must not count
+        rows = uow.session.query(VehicleInventory).all()
+        for row in rows:
+            for i in range(9):
+                uow.session.add(VehicleInventoryEvent(
+                    account_uuid=row.account_uuid,
+                    vehicle_inventory_uuid=row.uuid,
+                    material_uuid=row.material_uuid,
+                    event_type="adjustment",
+                    quantity=1.0 if i % 2 else -1.0,
+                ))
+            uow.session.add(VehicleInventoryEvent(
+                account_uuid=row.account_uuid,
+                vehicle_inventory_uuid=row.uuid,
+                material_uuid=row.material_uuid,
+                event_type="adjustment",
+                quantity=1.0,
+                is_deleted=True,
+            ))
+        uow.session.flush()
+        many, after = measure(uow)
+
+    expected = {r["uuid"]: r["current_quantity"] - 1.0 for r in before}
+    assert {r["uuid"]: r["current_quantity"] for r in after} == pytest.approx(expected)
+    assert many.count == few.count, (few.statements, many.statements)
+    assert many.count <= MAX_LIST_STATEMENTS, many.statements
+    assert many.elapsed <= 1.0 * LATENCY_FACTOR
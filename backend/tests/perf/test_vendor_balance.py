@@ -0,0 +1,129 @@
+"""The set-based vendor balance (VendorRepository.balances_per_currency).
+
+The counterpart of tests/perf/test_customer_balance.py. The seed has no
+purchasing, so each test first books some into a unit of work that is never
+committed: vendors with USD and SYP purchase orders, part-paid by payouts.
+Debit and credit notes are raised on the orders' items and on the vendors
+themselves, and settled in part by payments and payouts. It also adds what
+the walk must skip: a deleted order, item, note and payout, and a payout
+whose is_deleted is NULL (the walk counts it as live).
+
+  * PARITY: the grouped query gives the same per-currency balance as the
+    model's own walk over orders, notes and their settlements, vendor by
+    vendor.
+  * COST: a page of balances is ONE statement however many vendors it
+    covers.
+"""
+import random
+
+import pytest
+
+VENDORS = 40
+
+
+def _uow(perf_data):
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    return SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid)
+
+
+def _book_purchasing(uow, perf_data):
+    """Vendors with orders, notes and settlements in both currencies.
+    Returns their uuids; flushed, never committed."""
+    from models.common import (
+        CreditNoteItem, DebitNoteItem, FinancialAccount, Material, Payment, Payout,
+        PurchaseOrder, PurchaseOrderItem, Vendor,
+    )
+
+    rng = random.Random(32)
+    account_uuid = perf_data.account_uuid
+    cash = uow.session.query(FinancialAccount).filter(FinancialAccount.account_uuid == account_uuid).first()
+    material_uuids = [m for (m,) in uow.session.query(Material.uuid).filter(
+        Material.account_uuid == account_uuid)]
+    scoped = {"account_uuid": account_uuid}
+
+    def live():
+        # NULL is_deleted is live to the walk, and must be to the SQL
+        return rng.choice([False, False, False, None, True])
+
+    vendors = []
+    for i in range(VENDORS):
+        vendor = Vendor(**scoped, company_name=f"Vendor {i}", full_name=f"Vendor {i}",
+                        phone_number=f"+963{i:07d}", is_deleted=False)
+        uow.session.add(vendor)
+        uow.session.flush()
+        vendors.append(vendor.uuid)
+        for _ in range(rng.randint(0, 4)):
+            currency = rng.choice(["USD", "SYP"])
+            order = PurchaseOrder(**scoped, vendor_uuid=vendor.uuid, currency=currency,
+                                  is_deleted=rng.random() < 0.1)
+            uow.session.add(order)
+            uow.session.flush()
+            total = 0.0
+            for _ in range(rng.randint(1, 3)):
+                item = PurchaseOrderItem(
+                    **scoped, purchase_order_uuid=order.uuid, quantity=rng.randint(1, 20),
+                    price_per_unit=round(rng.uniform(1, 50), 2), currency=currency, unit="kg",
+                    material_uuid=rng.choice(material_uuids), quantity_received=0.0,
+                    is_deleted=rng.random() < 0.1,
+                )
+                uow.session.add(item)
+                uow.session.flush()
+                total += item.quantity * item.price_per_unit
+                if rng.random() < 0.4:
+                    uow.session.add(DebitNoteItem(**scoped, purchase_order_item_uuid=item.uuid,
+                                                  amount=round(rng.uniform(1, 30), 2),
+                                                  currency=currency, is_deleted=live()))
+                if rng.random() < 0.4:
+                    uow.session.add(CreditNoteItem(**scoped, purchase_order_item_uuid=item.uuid,
+                                                   amount=round(rng.uniform(1, 30), 2),
+                                                   currency=currency, is_deleted=live()))
+            for share in rng.sample([0.25, 0.5, 1.0], rng.randint(0, 2)):
+                uow.session.add(Payout(**scoped, purchase_order_uuid=order.uuid,
+                                       amount=round(total * share, 2), currency=currency,
+                                       financial_account_uuid=cash.uuid, is_deleted=live()))
+
+        # the vendor's own notes, part-settled
+        for _ in range(rng.randint(0, 2)):
+            currency = rng.choice(["USD", "SYP"])
+            debit = DebitNoteItem(**scoped, vendor_uuid=vendor.uuid, amount=round(rng.uniform(5, 80), 2),
+                                  currency=currency, is_deleted=live())
+            credit = CreditNoteItem(**scoped, vendor_uuid=vendor.uuid, amount=round(rng.uniform(5, 80), 2),
+                                    currency=currency, is_deleted=live())
+            uow.session.add_all([debit, credit])
+            uow.session.flush()
+            uow.session.add(Payment(**scoped, debit_note_item_uuid=debit.uuid,
+                                    amount=round(debit.amount / 2, 2), currency=currency,
+                                    payment_method="cash", financial_account_uuid=cash.uuid,
+                                    is_deleted=live()))
+            uow.session.add(Payout(**scoped, credit_note_item_uuid=credit.uuid,
+                                   amount=round(credit.amount / 3, 2), currency=currency,
+                                   financial_account_uuid=cash.uuid, is_deleted=live()))
+    uow.session.flush()
+    uow.session.expire_all()
+    return vendors
+
+
+def test_grouped_balances_match_the_model_walk(perf_data):
+    from models.common import Vendor
+
+    # never committed: the UoW rolls back on exit
+    with _uow(perf_data) as uow:
+        uuids = _book_purchasing(uow, perf_data)
+        grouped = uow.vendor_repository.balances_per_currency(uuids)
+        vendors = uow.vendor_repository._find_all_by_filters(filters=[Vendor.uuid.in_(uuids)])
+        assert len(vendors) == VENDORS
+        assert any(amount for v in vendors for amount in v.balance_per_currency.values())
+        for vendor in vendors:
+            walked = vendor.balance_per_currency
+            for currency, amount in walked.items():
+                assert grouped[vendor.uuid][currency] == pytest.approx(amount, abs=1e-6), (
+                    vendor.uuid, currency,
+                )
+
+
+def test_a_page_of_balances_is_one_statement(perf_data, count_queries):
+    with _uow(perf_data) as uow:
+        uuids = _book_purchasing(uow, perf_data)
+        with count_queries() as counter:
+            uow.vendor_repository.balances_per_currency(uuids)
+    assert counter.count == 1, counter.statements
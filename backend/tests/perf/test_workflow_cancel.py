@@ -0,0 +1,91 @@
+"""Cancelling workflow executions is a fixed set of UPDATEs, however many.
+
+cancel_workflow_execution used to call TripDomain.cancel_trip per trip, which
+loaded the trip's stops and saved them one by one. Then
+TaskExecutionDomain.cancel_task_executions loaded every task execution and
+its child_task_executions and saved each. An abandoned long trip made
+cancelling slow and held row locks for the whole walk. Now it is one UPDATE
+each for the executions, their trips, the trips' stops and the task
+executions, and one call can cancel many stale executions. This suite reopens
+a SMALL and a LARGE set of seeded executions with their trips and cancels
+each set, requiring:
+
+  * the same statement count for both;
+  * no unfinished execution, trip, stop or task execution left behind;
+  * no row loaded into the session.
+
+Timings are printed so `-s` doubles as the benchmark.
+"""
+from tests.perf.test_query_budgets import LATENCY_FACTOR
+
+SMALL, LARGE = 1, 30
+
+
+def _reopen(uow, workflow_execution_uuids):
+    """Put seeded (finished) executions back mid-trip."""
+    from sqlalchemy import update
+    from models.common import TaskExecution, Trip, TripStop, WorkflowExecution
+
+    uow.session.execute(update(WorkflowExecution).where(
+        WorkflowExecution.uuid.in_(workflow_execution_uuids)).values(status="in_progress", end_time=None))
+    uow.session.execute(update(TaskExecution).where(
+        TaskExecution.workflow_execution_uuid.in_(workflow_execution_uuids)).values(status="in_progress"))
+    trip_uuids = list(uow.session.execute(update(Trip).where(
+        Trip.workflow_execution_uuid.in_(workflow_execution_uuids)).values(status="in_progress")
+        .returning(Trip.uuid)).scalars())
+    uow.session.execute(update(TripStop).where(TripStop.trip_uuid.in_(trip_uuids)).values(status="planned"))
+    return trip_uuids
+
+
+def _open_rows(uow, workflow_execution_uuids, trip_uuids):
+    from models.common import TaskExecution, Trip, TripStop, WorkflowExecution
+
+    done = ("completed", "cancelled", "failed")
+    checks = {
+        "workflow_execution": (WorkflowExecution, WorkflowExecution.uuid.in_(workflow_execution_uuids)),
+        "task_execution": (TaskExecution, TaskExecution.workflow_execution_uuid.in_(workflow_execution_uuids)),
+        "trip": (Trip, Trip.uuid.in_(trip_uuids)),
+        "trip_stop": (TripStop, TripStop.trip_uuid.in_(trip_uuids)),
+    }
+    return {
+        name: uow.session.query(model).filter(where, model.status.notin_(done)).count()
+        for name, (model, where) in checks.items()
+    }
+
+
+def test_cancel_cost_is_flat_with_execution_count(perf_data, count_queries):
+    from sqlalchemy import event
+    from app.adapters.unit_of_work.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
+    from app.domains.workflow_execution.domain import WorkflowExecutionDomain
+    from app.dto.workflow_execution import WorkflowExecutionBulkCancel
+
+    # the first executions are the ones the seeded trips belong to
+    batches = {
+        SMALL: perf_data.workflow_execution_uuids[:SMALL],
+        LARGE: perf_data.workflow_execution_uuids[SMALL:SMALL + LARGE],
+    }
+    # never committed: the UoW rolls back on exit
+    with SqlAlchemyUnitOfWork(account_uuid=perf_data.account_uuid) as uow:
+        loaded = []
+        event.listen(uow.session, "loaded_as_persistent", lambda _s, obj: loaded.append(obj))
+
+        results = {}
+        for size, uuids in batches.items():
+            trip_uuids = _reopen(uow, uuids)
+            assert trip_uuids
+            uow.session.expunge_all()
+            loaded.clear()
+            with count_queries() as counter:
+                cancelled = WorkflowExecutionDomain.cancel_workflow_executions(
+                    uow=uow, payload=WorkflowExecutionBulkCancel(uuids=uuids),
+                )
+            results[size] = counter
+            print(f"\ncancel {size} executions ({len(trip_uuids)} trips): {counter.count} statements, "
+                  f"{counter.elapsed * 1000:.1f} ms")
+            assert cancelled.uuids == sorted(uuids)
+            assert loaded == []
+            assert set(_open_rows(uow, uuids, trip_uuids).values()) == {0}
+
+    small, large = results[SMALL], results[LARGE]
+    assert large.count == small.count, (small.statements, large.statements)
+    assert large.elapsed <= 0.5 * LATENCY_FACTOR